@@ -12,12 +12,13 @@ from fastapi import FastAPI, File, Form, HTTPException, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
-from src.napta_matrix import MATRIX_SCRIPTS
+from src.helpers.color_pipeline import COLOR_PIPELINE, NIGHT_MODE_SCHEDULE
+from src.napta_matrix import MATRIX_SCRIPTS, fade_out
 
-# Import scripts
+# Import scripts, but not the tests: they run at import
 THIS_DIR = Path(__file__).resolve().parent
 for file in sorted(THIS_DIR.glob("src/**/*.py")):
-    if file.stem != "__init__":
+    if file.stem != "__init__" and not file.stem.startswith("test_"):
         module_path = ".".join(file.relative_to(THIS_DIR).parts).removesuffix(".py")
         import_module(module_path)
 
@@ -83,8 +84,17 @@ async def lifespan(_app: FastAPI):
             script_manager.current_state.task.cancel()
 
 
+async def _after_fade_out(program: Coroutine[Any, Any, None]) -> None:
+    try:
+        await fade_out()
+    except asyncio.CancelledError:
+        program.close()  # Switched again before it started
+        raise
+    await program
+
+
 def switch_program(program: Coroutine[Any, Any, None], name: str) -> None:
-    task = asyncio.create_task(program, name=name)
+    task = asyncio.create_task(_after_fade_out(program), name=name)
     script_manager.current_state.task = task
 
 
@@ -172,3 +182,38 @@ async def undo_script():
             status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
             detail=f"Error processing request: {str(e)}",
         )
+
+
+class BrightnessResponse(BaseModel):
+    brightness: int
+    effective_brightness: int
+    gamma: float
+    night_mode: bool
+
+
+def _brightness_response() -> BrightnessResponse:
+    return BrightnessResponse(
+        brightness=COLOR_PIPELINE.brightness,
+        effective_brightness=COLOR_PIPELINE.effective_brightness,
+        gamma=COLOR_PIPELINE.gamma,
+        night_mode=bool(COLOR_PIPELINE.schedule),
+    )
+
+
+@app.get("/brightness", operation_id="get_brightness")
+async def get_brightness() -> BrightnessResponse:
+    return _brightness_response()
+
+
+@app.post("/brightness", operation_id="post_brightness")
+async def set_brightness(
+    brightness: int = Form(..., ge=0, le=100),
+    gamma: Union[float, None] = Form(None, gt=0),
+    night_mode: Union[bool, None] = Form(None),
+) -> BrightnessResponse:
+    COLOR_PIPELINE.brightness = brightness
+    if gamma is not None:
+        COLOR_PIPELINE.gamma = gamma
+    if night_mode is not None:
+        COLOR_PIPELINE.schedule = NIGHT_MODE_SCHEDULE if night_mode else None
+    return _brightness_response()
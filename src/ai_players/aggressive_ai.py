@@ -1,8 +1,8 @@
 import random
-from collections import deque
-from typing import Optional, Tuple, List
+from typing import Optional, Sequence, Tuple, List
 
 from .base_ai import BaseAI, GameState, Dir
+from .fields import UNREACHABLE
 
 
 class AggressiveAI(BaseAI):
@@ -39,12 +39,10 @@ class AggressiveAI(BaseAI):
                         return direction
         
         # If no good aggressive move, go for nearest apple
-        nearest_apple = self.find_nearest_apple(head, game_state.apples)
-        if nearest_apple:
-            direction = self.move_toward_position(head, nearest_apple, game_state)
-            if direction:
-                self.current_dir = direction
-                return direction
+        direction = self.move_toward_apple(head, game_state)
+        if direction:
+            self.current_dir = direction
+            return direction
         
         # Fall back to safe movement
         valid_dirs = self.get_valid_directions(game_state)
@@ -113,7 +111,7 @@ class AggressiveAI(BaseAI):
         return best_target
     
     def predict_intercept_position(self, target_head: Tuple[int, int], 
-                                 target_snake: deque[Tuple[int, int]], 
+                                 target_snake: Sequence[Tuple[int, int]], 
                                  game_state: GameState) -> Optional[Tuple[int, int]]:
         """Predict where to intercept the target snake."""
         # Simple prediction: assume target continues in current direction
@@ -158,10 +156,18 @@ class AggressiveAI(BaseAI):
         
         return best_dir
     
-    def find_nearest_apple(self, head: Tuple[int, int], apples: set[Tuple[int, int]]) -> Optional[Tuple[int, int]]:
-        """Find the nearest apple to the head."""
-        if not apples:
-            return None
+    def move_toward_apple(self, from_pos: Tuple[int, int], game_state: GameState) -> Optional[Dir]:
+        """Step to the safe neighbor fewest steps away from an apple, around the snakes."""
+        apple_distance = game_state.fields.apple_distance
+        best_dir = None
+        best_steps = float('inf')
         
-        nearest = min(apples, key=lambda apple: self.manhattan_distance(head, apple))
-        return nearest 
+        for direction, (x, y) in self.get_neighbors(from_pos, game_state.board_size).items():
+            if not game_state.is_position_safe((x, y)) or apple_distance[y, x] == UNREACHABLE:
+                continue
+            
+            if apple_distance[y, x] < best_steps:
+                best_steps = apple_distance[y, x]
+                best_dir = direction
+        
+        return best_dir
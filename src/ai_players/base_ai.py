@@ -1,7 +1,10 @@
 import enum
 from abc import ABC, abstractmethod
-from collections import deque
-from typing import Dict, Set, Tuple, Optional
+from typing import AbstractSet, Dict, FrozenSet, Iterable, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .fields import UNREACHABLE, Fields
 
 
 class Dir(enum.Enum):
@@ -11,34 +14,88 @@ class Dir(enum.Enum):
     LEFT = enum.auto()
 
 
+class Snapshot(NamedTuple):
+    """Read-only state of the game at a tick, built once and shared by every AI."""
+
+    board_size: int
+    snakes: Mapping[str, Sequence[Tuple[int, int]]]  # (x, y) points, from head to tail
+    apples: FrozenSet[Tuple[int, int]]
+    snake_positions: FrozenSet[Tuple[int, int]]
+    obstacles: np.ndarray  # (y, x) -> True on snake cells
+    names: Tuple[str, ...]  # Order of `heads` and `lengths`
+    heads: np.ndarray  # (snake, 2) x, y
+    lengths: np.ndarray  # (snake,)
+    apple_array: np.ndarray  # (apple, 2) x, y
+    fields: Fields  # Distances over the board, computed on first use
+
+    @classmethod
+    def build(
+        cls, snakes: Mapping[str, Sequence[Tuple[int, int]]], apples: Iterable[Tuple[int, int]], board_size: int
+    ) -> "Snapshot":
+        names = tuple(name for name, snake in snakes.items() if snake)
+        snake_positions = frozenset(point for snake in snakes.values() for point in snake)
+        obstacles = np.zeros((board_size, board_size), dtype=bool)
+        if snake_positions:
+            xs, ys = zip(*snake_positions)
+            obstacles[ys, xs] = True
+        apples = frozenset(apples)
+        apple_array = _read_only(np.array(sorted(apples), dtype=np.intp).reshape(-1, 2))
+        return cls(
+            board_size,
+            snakes,
+            apples,
+            snake_positions,
+            _read_only(obstacles),
+            names,
+            _read_only(np.array([snakes[name][0] for name in names], dtype=np.intp).reshape(-1, 2)),
+            _read_only(np.array([len(snakes[name]) for name in names], dtype=np.intp)),
+            apple_array,
+            Fields(obstacles, [snakes[name] for name in names], apple_array),
+        )
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.setflags(write=False)
+    return array
+
+
 class GameState:
-    """Represents the current state of the game."""
+    """Represents the current state of the game, as seen by one AI.
+
+    It is read-only: the snakes are sequences (tuples from the AI processes) and the apples a frozenset, so AIs
+    copy them into a deque or a set to change them.
+    """
     
     def __init__(
         self,
-        snakes: Dict[str, deque[Tuple[int, int]]],
-        apples: Set[Tuple[int, int]],
+        snakes: Mapping[str, Sequence[Tuple[int, int]]],
+        apples: AbstractSet[Tuple[int, int]],
         board_size: int,
-        my_name: str
+        my_name: str,
+        snapshot: Optional[Snapshot] = None,
     ):
         self.snakes = snakes
         self.apples = apples
         self.board_size = board_size
         self.my_name = my_name
-        self.my_snake = snakes.get(my_name, deque())
+        self.my_snake = snakes.get(my_name, ())
+        self.snapshot = snapshot or Snapshot.build(snakes, apples, board_size)
+        self.fields = self.snapshot.fields
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Snapshot, my_name: str) -> "GameState":
+        """State of one AI, sharing the snapshot of the tick with the other AIs."""
+        return cls(snapshot.snakes, snapshot.apples, snapshot.board_size, my_name, snapshot)
     
     def get_my_head(self) -> Optional[Tuple[int, int]]:
         """Get the position of my snake's head."""
         return self.my_snake[0] if self.my_snake else None
     
-    def get_all_snake_positions(self) -> Set[Tuple[int, int]]:
+    def get_all_snake_positions(self) -> FrozenSet[Tuple[int, int]]:
         """Get all positions occupied by any snake."""
-        positions: set[Tuple[int, int]] = set()
-        for snake in self.snakes.values():
-            positions.update(snake)
-        return positions
+        return self.snapshot.snake_positions
     
-    def get_other_snakes(self) -> Dict[str, deque[Tuple[int, int]]]:
+    def get_other_snakes(self) -> Dict[str, Sequence[Tuple[int, int]]]:
         """Get all snakes except mine."""
         return {name: snake for name, snake in self.snakes.items() if name != self.my_name}
     
@@ -51,8 +108,33 @@ class GameState:
             return False
         
         # Check collision with any snake
-        all_positions = self.get_all_snake_positions()
-        return pos not in all_positions
+        return not self.snapshot.obstacles[y, x]
+
+    def nearest_apple(self) -> Optional[Tuple[int, int]]:
+        """Apple my head gets to in the fewest steps around the snakes, if any can be reached.
+
+        Every cell at some steps from an apple is next to one a step closer: going down the apple distances from the
+        head ends on the nearest apple.
+        """
+        position = self.get_my_head()
+        steps = None
+        while position is not None and steps != 0:
+            x, y = position
+            neighbors = [
+                (int(self.fields.apple_distance[next_y, next_x]), (next_x, next_y))
+                for next_x, next_y in ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y))
+                if 0 <= next_x < self.board_size and 0 <= next_y < self.board_size
+                and self.fields.apple_distance[next_y, next_x] != UNREACHABLE
+            ]
+            steps, position = min(neighbors, default=(None, None))
+        return position
+
+    def distance_to_others(self, pos: Tuple[int, int]) -> int:
+        """Manhattan distance from a position to the nearest cell of the other snakes."""
+        x, y = pos
+        distances = self.fields.body_distance
+        others = (index for index, name in enumerate(self.snapshot.names) if name != self.my_name)
+        return min((int(distances[index, y, x]) for index in others), default=2 * self.board_size)
 
 
 class BaseAI(ABC):
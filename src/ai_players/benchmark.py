@@ -0,0 +1,99 @@
+# Compare the AIs' pathfinding with the A* they used before: python -m src.ai_players.benchmark
+
+import argparse
+import heapq
+import random
+import time
+from collections.abc import Callable
+from typing import Optional
+
+from src.ai_players.pathfinding import PathFinder, Point
+
+
+def path_copying_astar(
+    start: Point, goal: Point, obstacles: set[Point], size: int, wrap: bool
+) -> Optional[list[Point]]:
+    """A* as `GreedyAI` and `SnakeAI` did it: a copy of the path in each heap entry, and sets of points."""
+    heap = [(0, start, [start])]
+    visited = set[Point]()
+    while heap:
+        _, current, path = heapq.heappop(heap)
+        if current in visited:
+            continue
+        visited.add(current)
+        if current == goal:
+            return path
+
+        x, y = current
+        for neighbor in ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)):
+            if wrap:
+                neighbor = (neighbor[0] % size, neighbor[1] % size)
+            elif not (0 <= neighbor[0] < size and 0 <= neighbor[1] < size):
+                continue
+            if neighbor in visited or neighbor in obstacles:
+                continue
+            dx, dy = abs(neighbor[0] - goal[0]), abs(neighbor[1] - goal[1])
+            if wrap:
+                dx, dy = min(dx, size - dx), min(dy, size - dy)
+            heapq.heappush(heap, (len(path) + dx + dy, neighbor, path + [neighbor]))
+    return None
+
+
+def _searches_per_second(search: Callable[[Point, Point], object], pairs: list[tuple[Point, Point]]) -> float:
+    start = time.perf_counter()
+    for pair in pairs:
+        search(*pair)
+    return len(pairs) / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare pathfinding implementations")
+    parser.add_argument("--size", type=int, default=64)
+    parser.add_argument("--density", type=float, default=0.2, help="Share of blocked cells")
+    parser.add_argument("--searches", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    points = [(x, y) for y in range(args.size) for x in range(args.size)]
+    obstacles = {point for point in points if rng.random() < args.density}
+    free = [point for point in points if point not in obstacles]
+    pairs = [(rng.choice(free), rng.choice(free)) for _ in range(args.searches)]
+    costs = [1 + rng.random() for _ in points]
+
+    for wrap in (False, True):
+        finder = PathFinder(args.size, wrap)
+        blocked = finder.blocked(obstacles)
+
+        def lengths(search: Callable[[Point, Point], Optional[list[Point]]]) -> list[Optional[int]]:
+            return [len(path) if (path := search(*pair)) else None for pair in pairs]
+
+        # The searches bind the finder of this loop turn, not the last one
+        def finder_path(
+            start: Point, goal: Point, finder: PathFinder = finder, blocked: bytearray = blocked
+        ) -> Optional[list[Point]]:
+            found = finder.astar(finder.index(start), finder.index(goal), blocked)
+            return None if found is None else [finder.point(cell) for cell in finder.path_to(found)]
+
+        def copying_path(start: Point, goal: Point, wrap: bool = wrap) -> Optional[list[Point]]:
+            return path_copying_astar(start, goal, obstacles, args.size, wrap)
+
+        assert lengths(finder_path) == lengths(copying_path), "Paths of different lengths"
+
+        def bfs(start: Point, goal: Point, finder: PathFinder = finder, blocked: bytearray = blocked) -> Optional[int]:
+            return finder.bfs(finder.index(start), blocked, {finder.index(goal)})
+
+        def dijkstra(
+            start: Point, goal: Point, finder: PathFinder = finder, blocked: bytearray = blocked
+        ) -> Optional[int]:
+            return finder.dijkstra(finder.index(start), blocked, costs, {finder.index(goal)})
+
+        searches: dict[str, Callable[[Point, Point], object]] = {
+            "path copying A*": copying_path,
+            "PathFinder A*": finder_path,
+            "PathFinder BFS": bfs,
+            "PathFinder Dijkstra": dijkstra,
+        }
+        print(f"{args.size}x{args.size}, {'wrapping' if wrap else 'bounded'}:")
+        for name, search in searches.items():
+            print(f"{name:>22}: {_searches_per_second(search, pairs):>10,.0f} searches/s")
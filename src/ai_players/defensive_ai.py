@@ -1,7 +1,9 @@
-from collections import deque
 from typing import Optional, Tuple, Set
 
+import numpy as np
+
 from .base_ai import BaseAI, GameState, Dir
+from .fields import UNREACHABLE, bfs_distances
 
 
 class DefensiveAI(BaseAI):
@@ -61,24 +63,23 @@ class DefensiveAI(BaseAI):
         score += border_distance * 2  # Prefer staying away from borders
         
         # Penalty for being close to other snakes
-        for other_snake in game_state.get_other_snakes().values():
-            if not other_snake:
-                continue
-            
-            for snake_pos in other_snake:
-                distance = self.manhattan_distance(pos, snake_pos)
-                if distance <= 5:  # Close to snake
-                    score -= (6 - distance) * 10  # Bigger penalty for closer positions
+        distance = game_state.distance_to_others(pos)
+        if distance <= 5:  # Close to snake
+            score -= (6 - distance) * 10  # Bigger penalty for closer positions
         
         # Bonus for being near apples (but not primary concern)
-        if game_state.apples:
-            nearest_apple_dist = min(self.manhattan_distance(pos, apple) for apple in game_state.apples)
-            score += max(0, 10 - nearest_apple_dist)  # Small bonus for being near apples
+        apple_steps = game_state.fields.apple_distance[y, x]
+        if apple_steps != UNREACHABLE:
+            score += max(0, 10 - int(apple_steps))  # Small bonus for being near apples
         
         # Bonus for open space (how many positions are reachable)
         open_space_score = self.calculate_open_space(pos, game_state)
         score += open_space_score * 5
         
+        # Penalty for a trap: too little room left to fit in, over the whole board
+        if game_state.fields.area[y, x] < len(game_state.my_snake):
+            score -= 500  # Still better than a collision
+        
         return score
     
     def assess_danger_level(self, head: Tuple[int, int], game_state: GameState) -> float:
@@ -105,6 +106,11 @@ class DefensiveAI(BaseAI):
         elif len(valid_dirs) <= 2:
             danger += 0.2  # Limited options
         
+        # Check if boxed in (fewer cells to ourselves than our length)
+        index = game_state.snapshot.names.index(game_state.my_name)
+        if game_state.fields.territory_size[index] < len(game_state.my_snake):
+            danger += 0.3
+        
         # Check border proximity
         x, y = head
         border_distance = min(x, y, game_state.board_size - 1 - x, game_state.board_size - 1 - y)
@@ -113,33 +119,14 @@ class DefensiveAI(BaseAI):
         
         return min(1.0, danger)  # Cap at 1.0
     
-    def calculate_open_space(self, pos: Tuple[int, int], game_state: GameState) -> int:
+    def calculate_open_space(self, pos: Tuple[int, int], game_state: GameState, max_depth: int = 8) -> int:
         """Calculate how much open space is reachable from a position."""
-        visited: set[Tuple[int, int]] = set()
-        queue = deque([pos])
-        visited.add(pos)
-        
-        obstacles = game_state.get_all_snake_positions()
-        
-        # BFS to find reachable area (limited depth for performance)
-        depth = 0
-        max_depth = 8
-        
-        while queue and depth < max_depth:
-            current_level_size = len(queue)
-            
-            for _ in range(current_level_size):
-                current = queue.popleft()
-                neighbors = self.get_neighbors(current, game_state.board_size)
-                
-                for neighbor in neighbors.values():
-                    if (neighbor not in visited and 
-                        neighbor not in obstacles and
-                        0 <= neighbor[0] < game_state.board_size and
-                        0 <= neighbor[1] < game_state.board_size):
-                        visited.add(neighbor)
-                        queue.append(neighbor)
-            
-            depth += 1
+        # BFS to find reachable area (limited depth for performance), in the window of the cells it can get to
+        x, y = pos
+        top, left = max(0, y - max_depth), max(0, x - max_depth)
+        window = game_state.snapshot.obstacles[top : y + max_depth + 1, left : x + max_depth + 1]
+        start = np.zeros_like(window)
+        start[y - top, x - left] = True
         
-        return len(visited) 
+        distances = bfs_distances(start, ~window, limit=max_depth)
+        return int(np.count_nonzero(distances != UNREACHABLE))
@@ -0,0 +1,243 @@
+"""Distance and area fields of a slither tick, shared by every AI.
+
+Each field is computed over the whole board with NumPy on first use, then kept by the snapshot of the tick: the AIs read
+distances with a few array lookups instead of each searching the board.
+"""
+
+from collections.abc import Sequence
+from functools import cached_property
+from typing import Optional
+
+import numpy as np
+
+UNREACHABLE = -1
+CONTESTED = -2  # Cell of a territory reached first by several snakes at once
+
+
+def _flat(grids: np.ndarray) -> np.ndarray:
+    """Cells of each (..., y, x) grid in one row, with a cell left False after each row of the grid."""
+    *stack, height, width = grids.shape
+    flat = np.zeros((*stack, height, width + 1), dtype=bool)
+    flat[..., :width] = grids
+    return flat.reshape(*stack, height * (width + 1))
+
+
+def bfs_distances(sources: np.ndarray, passable: np.ndarray, limit: Optional[int] = None) -> np.ndarray:
+    """Steps from the nearest source moving through passable cells, `UNREACHABLE` where none gets within `limit`.
+
+    `sources` is a (..., y, x) stack of grids, all searched at once: every step grows the frontier of every grid by one
+    cell in the 4 directions, over the passable cells not reached yet. The cells are flat, a step along x or y is a
+    shift of 1 or of a row, and the cell never passable after each row keeps steps along x from going to the next row.
+    """
+    *stack, height, width = sources.shape
+    row = width + 1
+    frontier = _flat(sources)
+    unreached = _flat(passable) & ~frontier
+    distances = np.where(frontier, np.int16(0), np.int16(UNREACHABLE))
+    grown = np.empty_like(frontier)
+    distance = 0
+    while distance != limit:
+        distance += 1
+        grown[..., row:] = frontier[..., :-row]
+        grown[..., :row] = False
+        grown[..., :-row] |= frontier[..., row:]
+        grown[..., 1:] |= frontier[..., :-1]
+        grown[..., :-1] |= frontier[..., 1:]
+        np.logical_and(grown, unreached, out=frontier)
+        if not frontier.any():
+            break
+        unreached ^= frontier
+        distances[frontier] = distance
+    return distances.reshape(*stack, height, row)[..., :width]
+
+
+def manhattan_distances(sources: np.ndarray) -> np.ndarray:
+    """Manhattan distance to the nearest source of each (..., y, x) grid, whatever is in between.
+
+    The distance is separable: along x, then along y, each a running minimum of `distance - index` (sources before)
+    and `distance + index` (sources after). Grids without sources get `height + width`, farther than any cell.
+    """
+    height, width = sources.shape[-2:]
+    far = height + width
+    xs = np.arange(width, dtype=np.int16)
+    ys = np.arange(height, dtype=np.int16)[:, None]
+
+    distances = np.where(sources, np.int16(0), np.int16(far))
+    before = np.minimum.accumulate(distances - xs, axis=-1) + xs
+    after = np.flip(np.minimum.accumulate(np.flip(distances + xs, axis=-1), axis=-1), axis=-1) - xs
+    distances = np.minimum(before, after)
+    before = np.minimum.accumulate(distances - ys, axis=-2) + ys
+    after = np.flip(np.minimum.accumulate(np.flip(distances + ys, axis=-2), axis=-2), axis=-2) - ys
+    return np.minimum(np.minimum(before, after), far, dtype=np.int16)
+
+
+def _shifted(grid: np.ndarray, step: int, axis: int, wrap: bool, fill: int) -> np.ndarray:
+    """`grid` moved by `step` cells along `axis`: each cell gets the value of its neighbor `-step` away."""
+    if wrap:
+        return np.roll(grid, step, axis)
+    shifted = np.full_like(grid, fill)
+    target = [slice(None)] * grid.ndim
+    source = [slice(None)] * grid.ndim
+    target[axis] = slice(step, None) if step > 0 else slice(None, step)
+    source[axis] = slice(None, -step) if step > 0 else slice(-step, None)
+    shifted[tuple(target)] = grid[tuple(source)]
+    return shifted
+
+
+def label_components(passable: np.ndarray, wrap: bool = False) -> np.ndarray:
+    """Connected component of each passable (y, x) cell, as the flat index of its first cell, `UNREACHABLE` elsewhere.
+
+    Each round, every cell hooks the label of its component to the lowest label around it, then cells follow labels
+    to the labels of those (pointer jumping) until all point to a root: a few rounds, not one per cell across.
+    """
+    height, width = passable.shape
+    cells = height * width
+    outside = cells  # Label of the cells not passable, pointing to itself
+    labels = np.append(np.where(passable.ravel(), np.arange(cells), outside), outside)
+    while True:
+        grid = labels[:cells].reshape(height, width)
+        lowest = grid.copy()
+        for axis in (0, 1):
+            for step in (1, -1):
+                np.minimum(lowest, _shifted(grid, step, axis, wrap, outside), out=lowest)
+        lowest = np.append(np.where(passable, lowest, outside).ravel(), outside)
+
+        hooked = np.minimum(labels, lowest)
+        np.minimum.at(hooked, labels, lowest)
+        while not np.array_equal(jumped := hooked[hooked], hooked):
+            hooked = jumped
+        if np.array_equal(hooked, labels):
+            return np.where(passable, labels[:cells].reshape(height, width), UNREACHABLE)
+        labels = hooked
+
+
+def territories(sources: np.ndarray, passable: np.ndarray) -> np.ndarray:
+    """Index of the (grid, y, x) sources getting first to each passable cell, `CONTESTED` where several tie.
+
+    One search for all the grids at once: each cell holds the set of grids nearest to it as bits, the union of those of
+    the cells a step closer, grown from the sources one step at a time like `bfs_distances`.
+    """
+    count, height, width = sources.shape
+    if count > 64:
+        raise ValueError(f"At most 64 grids of sources, not {count}")
+    row = width + 1
+    bits = np.left_shift(np.uint64(1), np.arange(count, dtype=np.uint64))
+    owners = np.bitwise_or.reduce(np.where(_flat(sources), bits[:, None], np.uint64(0)), axis=0)
+    unreached = _flat(passable) & (owners == 0)
+    frontier = owners.copy()
+    grown = np.empty_like(frontier)
+    while True:
+        grown[row:] = frontier[:-row]
+        grown[:row] = 0
+        grown[:-row] |= frontier[row:]
+        grown[1:] |= frontier[:-1]
+        grown[:-1] |= frontier[1:]
+        grown *= unreached
+        reached = grown != 0
+        if not reached.any():
+            break
+        unreached ^= reached
+        owners |= grown
+        frontier, grown = grown, frontier
+
+    owners = owners.reshape(height, row)[:, :width]
+    indices = np.where((owners == 0) | ~passable, UNREACHABLE, CONTESTED).astype(np.int8)
+    for index, bit in enumerate(bits):
+        indices[(owners == bit) & passable] = index
+    return indices
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.setflags(write=False)
+    return array
+
+
+class Fields:
+    """Distance and area fields of a tick, (y, x) indexed. Snakes are in the order of the snapshot's names."""
+
+    def __init__(
+        self,
+        obstacles: np.ndarray,
+        snakes: Sequence[Sequence[tuple[int, int]]],
+        apples: np.ndarray,
+    ) -> None:
+        self.obstacles = obstacles
+        self.snakes = snakes
+        self.apples = apples  # (apple, 2) x, y
+
+    def _snake_grids(self, head_only: bool) -> np.ndarray:
+        grids = np.zeros((len(self.snakes), *self.obstacles.shape), dtype=bool)
+        for index, snake in enumerate(self.snakes):
+            xs, ys = zip(*snake[:1] if head_only else snake)
+            grids[index, ys, xs] = True
+        return grids
+
+    @cached_property
+    def apple_distance(self) -> np.ndarray:
+        """Steps to the nearest apple around the snakes."""
+        sources = np.zeros(self.obstacles.shape, dtype=bool)
+        sources[self.apples[:, 1], self.apples[:, 0]] = True
+        return _read_only(bfs_distances(sources, ~self.obstacles))
+
+    @cached_property
+    def head_reach(self) -> np.ndarray:
+        """(snake, y, x) steps for the head of each snake to get to each cell, around the snakes."""
+        return _read_only(bfs_distances(self._snake_grids(head_only=True), ~self.obstacles))
+
+    @cached_property
+    def body_distance(self) -> np.ndarray:
+        """(snake, y, x) Manhattan distance to the nearest cell of each snake."""
+        return _read_only(manhattan_distances(self._snake_grids(head_only=False)))
+
+    @cached_property
+    def wall_distance(self) -> np.ndarray:
+        """Steps to get off the board."""
+        height, width = self.obstacles.shape
+        ys, xs = np.ogrid[:height, :width]
+        return _read_only(np.minimum(np.minimum(xs, width - 1 - xs), np.minimum(ys, height - 1 - ys)) + 1)
+
+    @cached_property
+    def clearance(self) -> np.ndarray:
+        """Distance to the nearest snake cell or wall."""
+        clearance = self.wall_distance
+        if len(self.snakes):
+            clearance = np.minimum(clearance, self.body_distance.min(axis=0))
+        return _read_only(clearance)
+
+    @cached_property
+    def components(self) -> np.ndarray:
+        """Connected component of each cell around the snakes, `UNREACHABLE` on snake cells."""
+        return _read_only(label_components(~self.obstacles))
+
+    @cached_property
+    def area(self) -> np.ndarray:
+        """Cells reachable from each cell around the snakes, its own included: the size of its component."""
+        components = self.components
+        sizes = np.bincount(components[components != UNREACHABLE], minlength=components.size)
+        return _read_only(np.where(components != UNREACHABLE, sizes[components], 0))
+
+    @cached_property
+    def reachable_area(self) -> np.ndarray:
+        """(snake,) cells the head of each snake can get to."""
+        height, width = self.obstacles.shape
+        areas = []
+        for (x, y), *_ in self.snakes:
+            around = {
+                self.components[next_y, next_x]: self.area[next_y, next_x]
+                for next_x, next_y in ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y))
+                if 0 <= next_x < width and 0 <= next_y < height
+            }
+            around.pop(UNREACHABLE, None)
+            areas.append(sum(around.values()))
+        return _read_only(np.array(areas, dtype=np.intp))
+
+    @cached_property
+    def territory(self) -> np.ndarray:
+        """Index of the snake whose head gets first to each cell around the snakes, `CONTESTED` where heads tie."""
+        return _read_only(territories(self._snake_grids(head_only=True), ~self.obstacles))
+
+    @cached_property
+    def territory_size(self) -> np.ndarray:
+        """(snake,) cells each snake gets to first."""
+        territory = self.territory
+        return _read_only(np.bincount(territory[territory >= 0], minlength=len(self.snakes)))
@@ -1,30 +1,37 @@
-import heapq
-from collections import deque
-from typing import Optional, List, Set, Tuple
+from typing import Optional, Tuple
+
+import numpy as np
 
 from .base_ai import BaseAI, GameState, Dir
+from .pathfinding import TrackedPath, shared_path_finder
 
 
 class GreedyAI(BaseAI):
     """AI that always moves toward the nearest apple using A* pathfinding."""
     
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.target: Optional[Tuple[int, int]] = None
+        self.path: Optional[TrackedPath] = None
+        self.obstacles: Optional[np.ndarray] = None  # Of the last tick, to find the cells blocked since
+    
     def get_next_move(self, game_state: GameState) -> Dir:
         """Move toward the nearest apple."""
         head = game_state.get_my_head()
         if not head:
             return Dir.RIGHT
         
-        # Find nearest apple
-        nearest_apple = self.find_nearest_apple(head, game_state.apples)
-        if not nearest_apple:
+        # Keep going for the same apple while it is there, else find nearest apple
+        if self.target not in game_state.apples:
+            self.target = game_state.nearest_apple()
+        if not self.target:
             # No apples, just move safely
             valid_dirs = self.get_valid_directions(game_state)
             return valid_dirs[0] if valid_dirs else self.current_dir
         
-        # Try to find path to nearest apple
-        path = self.find_path_astar(head, nearest_apple, game_state)
-        if path and len(path) >= 2:
-            next_pos = path[1]
+        # Try to follow a path to the apple
+        next_pos = self.follow_path(head, self.target, game_state)
+        if next_pos:
             direction = self.pos_to_direction(head, next_pos)
             self.current_dir = direction
             return direction
@@ -53,46 +60,20 @@ class GreedyAI(BaseAI):
         
         return False
     
-    def find_nearest_apple(self, head: Tuple[int, int], apples: Set[Tuple[int, int]]) -> Optional[Tuple[int, int]]:
-        """Find the nearest apple to the head."""
-        if not apples:
-            return None
-        
-        nearest = min(apples, key=lambda apple: self.manhattan_distance(head, apple))
-        return nearest
-    
-    def find_path_astar(self, start: Tuple[int, int], goal: Tuple[int, int], 
-                       game_state: GameState) -> Optional[List[Tuple[int, int]]]:
-        """Find shortest path using A* algorithm."""
-        heap = [(0, start, [start])]
-        visited: set[Tuple[int, int]] = set()
-        obstacles = game_state.get_all_snake_positions()
-        
-        while heap:
-            f_score, current, path = heapq.heappop(heap)
-            
-            if current in visited:
-                continue
-            visited.add(current)
-            
-            if current == goal:
-                return path
-            
-            neighbors = self.get_neighbors(current, game_state.board_size)
-            for direction, neighbor in neighbors.items():
-                if (neighbor in visited or 
-                    neighbor in obstacles or 
-                    not game_state.is_position_safe(neighbor)):
-                    continue
-                
-                new_path = path + [neighbor]
-                g_score = len(new_path) - 1
-                h_score = self.manhattan_distance(neighbor, goal)
-                f_score = g_score + h_score
-                
-                heapq.heappush(heap, (f_score, neighbor, new_path))
-        
-        return None
+    def follow_path(self, head: Tuple[int, int], goal: Tuple[int, int], 
+                    game_state: GameState) -> Optional[Tuple[int, int]]:
+        """Next position on a shortest path to the goal, kept from the last tick while snakes do not cut it."""
+        finder = shared_path_finder(game_state.board_size)
+        if self.path is None or self.path.finder is not finder:
+            self.path = TrackedPath(finder)
+        obstacles = game_state.snapshot.obstacles
+        new_blocked = None
+        if self.obstacles is not None and self.obstacles.shape == obstacles.shape:
+            new_blocked = np.flatnonzero(obstacles > self.obstacles).tolist()  # Heads of the snakes, mostly
+        self.obstacles = obstacles
+        blocked = obstacles.tobytes()  # One byte per cell, in the order of the finder's
+        cell = self.path.next_cell(finder.index(head), finder.index(goal), blocked, new_blocked)
+        return None if cell is None else finder.point(cell)
     
     def pos_to_direction(self, from_pos: Tuple[int, int], to_pos: Tuple[int, int]) -> Dir:
         """Convert position difference to direction."""
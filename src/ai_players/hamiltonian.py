@@ -0,0 +1,49 @@
+"""Hamiltonian cycle of a wrapping square board, for a snake filling it without ever trapping itself.
+
+The cycle goes along the rows, one way then the other, and the last row wraps down to the first: `order[y][x]` is the
+position of each cell on it. A snake moving forward on the cycle has its body behind its head, from the tail, and only
+free cells ahead of it up to its tail. It can skip ahead on the cycle (a shortcut) to a neighbor still behind its tail,
+if it leaves a free cell between them for each cell it has yet to grow by. Move after move, this is a few lookups.
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
+
+from src.ai_players.pathfinding import Point
+
+_STEPS = ((0, -1), (0, 1), (-1, 0), (1, 0))  # Up, down, left, right
+
+
+class HamiltonianCycle:
+    def __init__(self, size: int) -> None:
+        if size % 2:
+            raise ValueError(f"Rows only close in a cycle on boards of even size, not {size}")
+        self.size = size
+        self.cells = size * size
+        ys, xs = np.indices((size, size))
+        self.order: list[list[int]] = (ys * size + np.where(ys % 2, size - 1 - xs, xs)).tolist()
+
+    def ahead(self, start: Point, point: Point) -> int:
+        """Steps along the cycle from `start` to `point`."""
+        return (self.order[point[1]][point[0]] - self.order[start[1]][start[0]]) % self.cells
+
+    def next_point(self, snake: Sequence[Point], apple: Point, growing: int = 0) -> Point:
+        """Neighbor of the head furthest along the cycle without going past the apple, else the next on the cycle.
+
+        `snake` goes from head to tail, and will grow by `growing` cells. Shortcuts are only taken while the snake is
+        at most half the board: the longer it is, the more cells a shortcut leaves behind it to go around later.
+        """
+        head = snake[0]
+        to_tail = self.ahead(head, snake[-1]) or self.cells
+        to_apple = self.ahead(head, apple)
+        shortcuts = 2 * (len(snake) + growing) <= self.cells
+        best, best_steps = head, 0
+        for step_x, step_y in _STEPS:
+            point = ((head[0] + step_x) % self.size, (head[1] + step_y) % self.size)
+            steps = self.ahead(head, point)
+            # Free cells left between the new head and the tail, one per cell of growth to come
+            room = to_tail - steps - 1 - growing - (point == apple)
+            if (steps == 1 or (shortcuts and steps <= to_apple and room >= 0)) and steps > best_steps:
+                best, best_steps = point, steps
+        return best
@@ -0,0 +1,36 @@
+import importlib
+import random
+from typing import Any, Dict
+
+from .base_ai import BaseAI, Dir, GameState
+
+
+class AILoader:
+    """Loads AI implementations dynamically from modules."""
+
+    @staticmethod
+    def load_ai(config: Dict[str, Any]) -> BaseAI:
+        """Load an AI from the given configuration."""
+        try:
+            module = importlib.import_module(config["module"])
+            ai_class = getattr(module, config["class"])
+            return ai_class(config["name"])
+        except (ImportError, AttributeError) as e:
+            print(f"Failed to load AI {config['name']}: {e}")
+            # Fallback to a simple random AI
+            return RandomAI(config["name"])
+
+
+class RandomAI(BaseAI):
+    """Simple fallback AI that moves randomly but safely."""
+
+    def get_next_move(self, game_state: GameState) -> Dir:
+        """Move randomly but safely."""
+        valid_dirs = self.get_valid_directions(game_state)
+        if valid_dirs:
+            self.current_dir = random.choice(valid_dirs)
+        return self.current_dir
+
+    def should_boost(self, game_state: GameState) -> bool:
+        """Randomly boost sometimes."""
+        return len(game_state.my_snake) > 15 and random.random() < 0.1
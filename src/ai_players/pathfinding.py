@@ -0,0 +1,241 @@
+"""Shortest paths on square grids, shared by the snake and slither AIs.
+
+Cells are flat indices, `y * size + x`, and the neighbors of every cell are computed once, wrapping around the edges
+(snake) or not (slither). The parent and distance of each cell live in lists allocated once per `PathFinder` and
+reused by every search: instead of clearing them, each search has a number, and a cell only counts as reached if it is
+stamped with the number of the last search.
+"""
+
+import heapq
+from collections import deque
+from collections.abc import Container, Iterable, Sequence
+from functools import cache
+from typing import Optional
+
+Point = tuple[int, int]
+
+_STEPS = ((0, -1), (0, 1), (-1, 0), (1, 0))  # Up, down, left, right
+
+
+class PathFinder:
+    def __init__(self, size: int, wrap: bool = False) -> None:
+        self.size = size
+        self.wrap = wrap
+        cells = size * size
+        self.xs = [cell % size for cell in range(cells)]
+        self.ys = [cell // size for cell in range(cells)]
+        self.neighbors = [self._neighbors(cell) for cell in range(cells)]
+        self.reached_count = 0  # Cells reached by the last search
+
+        self._search = 0
+        self._reached = [0] * cells  # Number of the last search that reached the cell
+        self._closed = [0] * cells
+        self._distances: list[float] = [0] * cells
+        self._parents = [-1] * cells
+
+    def _neighbors(self, cell: int) -> tuple[int, ...]:
+        x, y = self.xs[cell], self.ys[cell]
+        neighbors = []
+        for step_x, step_y in _STEPS:
+            next_x, next_y = x + step_x, y + step_y
+            if self.wrap:
+                next_x, next_y = next_x % self.size, next_y % self.size
+            elif not (0 <= next_x < self.size and 0 <= next_y < self.size):
+                continue
+            neighbors.append(next_y * self.size + next_x)
+        return tuple(neighbors)
+
+    def index(self, point: Point) -> int:
+        return point[1] * self.size + point[0]
+
+    def point(self, cell: int) -> Point:
+        return (self.xs[cell], self.ys[cell])
+
+    def blocked(self, points: Iterable[Point]) -> bytearray:
+        """Cells to avoid, from their points."""
+        blocked = bytearray(self.size * self.size)
+        for x, y in points:
+            blocked[y * self.size + x] = 1
+        return blocked
+
+    def heuristic(self, cell: int, goal: int) -> int:
+        """Manhattan distance, around the edges if they wrap."""
+        dx, dy = abs(self.xs[cell] - self.xs[goal]), abs(self.ys[cell] - self.ys[goal])
+        if self.wrap:
+            dx, dy = min(dx, self.size - dx), min(dy, self.size - dy)
+        return dx + dy
+
+    def _start(self, start: int) -> int:
+        self._search += 1
+        self._reached[start] = self._search
+        self._distances[start] = 0
+        self._parents[start] = -1
+        self.reached_count = 1
+        return self._search
+
+    def astar(self, start: int, goal: int, blocked: Sequence[int]) -> Optional[int]:
+        """Shortest path to `goal` through cells not `blocked` (the start may be), returning the goal if found."""
+        search = self._start(start)
+        reached, closed, distances, parents = self._reached, self._closed, self._distances, self._parents
+        neighbors, heuristic = self.neighbors, self.heuristic
+        heap = [(heuristic(start, goal), 0, start)]
+        while heap:
+            _, negative_distance, cell = heapq.heappop(heap)
+            if cell == goal:
+                return goal
+            if closed[cell] == search:
+                continue
+            closed[cell] = search
+
+            distance = 1 - negative_distance
+            for neighbor in neighbors[cell]:
+                if blocked[neighbor] or (reached[neighbor] == search and distances[neighbor] <= distance):
+                    continue
+                if reached[neighbor] != search:
+                    self.reached_count += 1
+                reached[neighbor] = search
+                distances[neighbor] = distance
+                parents[neighbor] = cell
+                # Deepest first among equal estimates: fewer cells expanded on open boards
+                heapq.heappush(heap, (distance + heuristic(neighbor, goal), -distance, neighbor))
+        return None
+
+    def bfs(
+        self,
+        start: int,
+        blocked: Sequence[int],
+        goals: Optional[Container[int]] = None,
+        limit: Optional[int] = None,
+    ) -> Optional[int]:
+        """Nearest of `goals` in steps, or None once every cell reachable (or `limit` cells) is reached."""
+        search = self._start(start)
+        reached, distances, parents, neighbors = self._reached, self._distances, self._parents, self.neighbors
+        if goals is not None and start in goals:
+            return start
+        queue = deque([start])
+        while queue:
+            cell = queue.popleft()
+            distance = distances[cell] + 1
+            for neighbor in neighbors[cell]:
+                if blocked[neighbor] or reached[neighbor] == search:
+                    continue
+                reached[neighbor] = search
+                distances[neighbor] = distance
+                parents[neighbor] = cell
+                self.reached_count += 1
+                if goals is not None and neighbor in goals:
+                    return neighbor
+                if self.reached_count == limit:
+                    return None
+                queue.append(neighbor)
+        return None
+
+    def dijkstra(
+        self,
+        start: int,
+        blocked: Sequence[int],
+        costs: Sequence[float],
+        goals: Optional[Container[int]] = None,
+    ) -> Optional[int]:
+        """Cheapest of `goals` to get to, entering each cell for its cost, or None once every cell reachable is."""
+        search = self._start(start)
+        reached, closed, distances, parents = self._reached, self._closed, self._distances, self._parents
+        neighbors = self.neighbors
+        heap: list[tuple[float, int]] = [(0, start)]
+        while heap:
+            distance, cell = heapq.heappop(heap)
+            if closed[cell] == search:
+                continue
+            closed[cell] = search
+            if goals is not None and cell in goals:
+                return cell
+
+            for neighbor in neighbors[cell]:
+                if blocked[neighbor] or closed[neighbor] == search:
+                    continue
+                neighbor_distance = distance + costs[neighbor]
+                if reached[neighbor] == search and distances[neighbor] <= neighbor_distance:
+                    continue
+                if reached[neighbor] != search:
+                    self.reached_count += 1
+                reached[neighbor] = search
+                distances[neighbor] = neighbor_distance
+                parents[neighbor] = cell
+                heapq.heappush(heap, (neighbor_distance, neighbor))
+        return None
+
+    def distance(self, cell: int) -> Optional[float]:
+        """Distance from the start of the last search, if it reached the cell (final for goals found, BFS cells)."""
+        return self._distances[cell] if self._reached[cell] == self._search else None
+
+    def path_to(self, cell: int) -> list[int]:
+        """Cells from the start of the last search to `cell`, which it reached."""
+        path = []
+        while cell != -1:
+            path.append(cell)
+            cell = self._parents[cell]
+        path.reverse()
+        return path
+
+
+class TrackedPath:
+    """Path to a goal kept from one tick to the next, for an AI following it one cell per tick.
+
+    The path is only planned again when the goal changes or the head leaves it. Where cells blocked since the last tick
+    cut it, only the part up to the last of them is searched again: a BFS from the head to the rest of the path.
+    """
+
+    def __init__(self, finder: PathFinder) -> None:
+        self.finder = finder
+        self.goal: Optional[int] = None
+        self.plans = 0
+        self.repairs = 0
+        self._cells = list[int]()
+        self._indices = dict[int, int]()  # Cell -> index in `_cells`
+
+    def _set(self, cells: list[int], goal: Optional[int]) -> None:
+        self._cells = cells
+        self._indices = {cell: index for index, cell in enumerate(cells)}
+        self.goal = goal
+
+    def _plan(self, head: int, goal: int, blocked: Sequence[int]) -> None:
+        self.plans += 1
+        found = self.finder.astar(head, goal, blocked)
+        self._set([] if found is None else self.finder.path_to(found), None if found is None else goal)
+
+    def _repair(self, head: int, position: int, blocked: Sequence[int]) -> None:
+        self.repairs += 1
+        rest = {cell for index, cell in enumerate(self._cells) if index > position}
+        found = self.finder.bfs(head, blocked, rest)
+        if found is None:
+            self._set([], None)
+        else:
+            self._set(self.finder.path_to(found) + self._cells[self._indices[found] + 1 :], self.goal)
+
+    def next_cell(
+        self, head: int, goal: int, blocked: Sequence[int], new_blocked: Optional[Iterable[int]] = None
+    ) -> Optional[int]:
+        """Next cell toward `goal`, if it can be reached.
+
+        `new_blocked` are the cells blocked since the last call. Without them, every cell left on the path is checked.
+        """
+        position = self._indices.get(head)
+        if goal != self.goal or position is None:
+            self._plan(head, goal, blocked)
+            position = 0
+        else:
+            if new_blocked is None:
+                cut = [index for index in range(position + 1, len(self._cells)) if blocked[self._cells[index]]]
+            else:
+                cut = [index for cell in new_blocked if (index := self._indices.get(cell, -1)) > position]
+            if cut:
+                self._repair(head, max(cut), blocked)
+                position = 0
+
+        return self._cells[position + 1] if position + 1 < len(self._cells) else None
+
+
+@cache
+def shared_path_finder(size: int, wrap: bool = False) -> PathFinder:
+    """Path finder shared by the AIs of a process, which search one at a time."""
+    return PathFinder(size, wrap)
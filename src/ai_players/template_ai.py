@@ -15,8 +15,8 @@ class TemplateAI(BaseAI):
     
     This AI has access to:
     - game_state.snakes: Dict of all snakes (including yours)
-    - game_state.apples: Set of apple positions  
-    - game_state.my_snake: Your snake (deque of positions)
+    - game_state.apples: Frozenset of apple positions
+    - game_state.my_snake: Your snake (read-only sequence of positions, head first)
     - game_state.board_size: Size of the game board
     
     Useful methods from BaseAI:
@@ -0,0 +1,107 @@
+import random
+
+import numpy as np
+
+from src.ai_players.base_ai import GameState, Snapshot
+from src.ai_players.fields import (
+    CONTESTED,
+    UNREACHABLE,
+    bfs_distances,
+    label_components,
+    manhattan_distances,
+    territories,
+)
+from src.ai_players.pathfinding import PathFinder
+
+rng = random.Random(0)
+SIZE = 16
+finder = PathFinder(SIZE)
+
+
+def _searched_distances(sources: list[tuple[int, int]], passable: np.ndarray) -> np.ndarray:
+    """Steps from the nearest source, a BFS of the finder from each."""
+    blocked = (~passable).astype(np.uint8).tobytes()
+    distances = np.full((SIZE, SIZE), UNREACHABLE)
+    for source in sources:
+        finder.bfs(finder.index(source), blocked)
+        for cell in range(SIZE * SIZE):
+            distance = finder.distance(cell)
+            x, y = finder.point(cell)
+            if distance is not None and (distances[y, x] == UNREACHABLE or distance < distances[y, x]):
+                distances[y, x] = distance
+    return distances
+
+
+# Distances of the whole grids are those of searches from each source
+for _ in range(10):
+    passable = np.array([[rng.random() > 0.3 for _ in range(SIZE)] for _ in range(SIZE)])
+    sources = [[(rng.randrange(SIZE), rng.randrange(SIZE)) for _ in range(rng.randint(0, 3))] for _ in range(3)]
+    grids = np.zeros((len(sources), SIZE, SIZE), dtype=bool)
+    for grid, points in zip(grids, sources):
+        for x, y in points:
+            grid[y, x] = True
+
+    found = bfs_distances(grids, passable)
+    assert (bfs_distances(grids, passable, limit=3) == np.where(found <= 3, found, UNREACHABLE)).all()
+    manhattan = manhattan_distances(grids)
+    for grid, points in enumerate(sources):
+        assert (found[grid] == _searched_distances(points, passable)).all()
+        expected = np.full((SIZE, SIZE), 2 * SIZE)
+        for x, y in points:
+            ys, xs = np.ogrid[:SIZE, :SIZE]
+            expected = np.minimum(expected, abs(xs - x) + abs(ys - y))
+        assert (manhattan[grid] == expected).all()
+
+# Components are the cells searches from each cell reach, labelled by their first cell, around the edges with wrap
+for wrap in (False, True):
+    wrap_finder = PathFinder(SIZE, wrap)
+    for _ in range(5):
+        passable = np.array([[rng.random() > 0.4 for _ in range(SIZE)] for _ in range(SIZE)])
+        blocked = (~passable).astype(np.uint8).tobytes()
+        components = label_components(passable, wrap)
+        assert (components[~passable] == UNREACHABLE).all()
+        for cell in np.flatnonzero(passable).tolist()[::7]:
+            wrap_finder.bfs(cell, blocked)
+            component = [other for other in range(SIZE * SIZE) if wrap_finder.distance(other) is not None]
+            labels = components.ravel()[component]
+            assert (labels == component[0]).all() and (components == component[0]).sum() == len(component)
+
+# Territories go to the grid of sources nearest in steps, to none on ties
+for _ in range(10):
+    passable = np.array([[rng.random() > 0.3 for _ in range(SIZE)] for _ in range(SIZE)])
+    grids = np.zeros((4, SIZE, SIZE), dtype=bool)
+    for grid in grids:
+        grid[rng.randrange(SIZE), rng.randrange(SIZE)] = True
+    distances = bfs_distances(grids, passable).astype(int)
+    distances[distances == UNREACHABLE] = SIZE * SIZE
+    nearest = distances.min(axis=0)
+    expected = np.where((distances == nearest).sum(axis=0) == 1, distances.argmin(axis=0), CONTESTED)
+    expected[(nearest == SIZE * SIZE) | ~passable] = UNREACHABLE
+    assert (territories(grids, passable) == expected).all()
+
+# The fields of a snapshot are read-only, and the AIs read them through the game state
+snapshot = Snapshot.build({"A": ((2, 1), (1, 1), (0, 1)), "B": ((4, 4), (4, 5))}, {(0, 0), (2, 4), (7, 7)}, 8)
+fields = snapshot.fields
+assert fields.apple_distance[1, 3] == 4 and fields.apple_distance[1, 1] == UNREACHABLE
+assert fields.head_reach[0, 0, 0] == 3 and fields.head_reach[1, 4, 2] == 2
+assert fields.body_distance[1, 1, 3] == 4 and fields.wall_distance[0, 5] == 1 and fields.clearance[3, 3] == 2
+assert not fields.apple_distance.flags.writeable and fields.head_reach is fields.head_reach  # Computed once
+game_state = GameState.from_snapshot(snapshot, "A")
+assert game_state.nearest_apple() == (0, 0) and GameState.from_snapshot(snapshot, "B").nearest_apple() == (2, 4)
+assert game_state.distance_to_others((2, 4)) == 2
+
+# Walled off apples are not the nearest
+snakes = {"A": ((0, 0),), "B": ((1, 0), (1, 1), (0, 1)), "C": ((5, 3),), "D": ((6, 0), (6, 1), (7, 1))}
+snapshot = Snapshot.build(snakes, {(7, 0), (0, 7)}, 8)
+assert snapshot.fields.apple_distance[2, 7] == 12  # From (0, 7), D walls (7, 0) off
+assert GameState.from_snapshot(snapshot, "C").nearest_apple() == (0, 7)
+assert GameState.from_snapshot(snapshot, "D").nearest_apple() == (7, 0)
+assert GameState.from_snapshot(snapshot, "A").nearest_apple() is None
+
+# Snakes cut the board in areas and territories
+snapshot = Snapshot.build({"A": ((3, 1), (3, 0)), "B": ((3, 2), (3, 3), (3, 4), (3, 5), (3, 6), (3, 7))}, (), 8)
+fields = snapshot.fields
+assert fields.area[0, 0] == 24 and fields.area[0, 7] == 32 and fields.area[0, 3] == 0
+assert list(fields.reachable_area) == [56, 56]
+assert fields.territory[1, 0] == 0 and fields.territory[7, 0] == 1 and fields.territory[4, 1] == 1
+assert list(fields.territory_size) == [(fields.territory == 0).sum(), (fields.territory == 1).sum()]
@@ -0,0 +1,51 @@
+import random
+from collections import deque
+from typing import Optional
+
+from src.ai_players.hamiltonian import HamiltonianCycle
+
+rng = random.Random(0)
+SIZE = 8
+cycle = HamiltonianCycle(SIZE)
+
+# The cycle goes through every cell once, each a step from the previous one around the edges
+points = sorted(((cycle.order[y][x], (x, y)) for y in range(SIZE) for x in range(SIZE)))
+assert [order for order, _ in points] == list(range(SIZE * SIZE))
+for (_, (x, y)), (_, (next_x, next_y)) in zip(points, points[1:] + points[:1]):
+    assert min(abs(next_x - x), SIZE - abs(next_x - x)) + min(abs(next_y - y), SIZE - abs(next_y - y)) == 1
+
+try:
+    HamiltonianCycle(7)
+    raise AssertionError("Odd boards have no cycle along the rows")
+except ValueError:
+    pass
+
+# A short snake takes shortcuts to the apple, a long one follows the cycle (only its head, tail and length matter)
+assert cycle.next_point([(0, 0), (0, 7)], (0, 5)) == (0, 1)
+assert cycle.next_point([(0, 0), (0, 7)], (1, 0)) == (1, 0)
+long_snake = [(0, 0), *((x, 7) for x in range(SIZE)), *((x, 6) for x in range(SIZE - 1, -1, -1))]
+assert cycle.next_point(long_snake, (0, 5), growing=SIZE * SIZE // 2) == (1, 0)
+# Shortcuts stop short of the tail, with room for the growth to come
+assert cycle.next_point([(0, 0), (0, 1)], (0, 5)) == (7, 0)
+assert cycle.next_point([(0, 0), (0, 2)], (0, 5)) == (0, 1)
+assert cycle.next_point([(0, 0), (0, 2)], (0, 5), growing=1) == (7, 0)
+
+# The snake fills the board without running into itself
+for _ in range(20):
+    snake = deque((x, 0) for x in range(3, -1, -1))
+    body, eating_apples = set(snake), set[tuple[int, int]]()
+    apple: Optional[tuple[int, int]] = (5, 5)
+    while apple is not None:
+        next_point = cycle.next_point(snake, apple, len(eating_apples))
+        if snake[-1] in eating_apples:
+            eating_apples.remove(snake[-1])
+        else:
+            body.remove(snake.pop())
+        assert next_point not in body
+        snake.appendleft(next_point)
+        body.add(next_point)
+        if next_point == apple:
+            eating_apples.add(apple)
+            free = [(x, y) for x in range(SIZE) for y in range(SIZE) if (x, y) not in body]
+            apple = rng.choice(free) if free else None
+    assert len(body) == SIZE * SIZE
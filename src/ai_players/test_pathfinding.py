@@ -0,0 +1,76 @@
+import random
+from typing import Optional
+
+from src.ai_players.benchmark import path_copying_astar
+from src.ai_players.pathfinding import PathFinder, TrackedPath
+
+rng = random.Random(0)
+SIZE = 16
+obstacles = {(x, y) for y in range(SIZE) for x in range(SIZE) if rng.random() < 0.25}
+free = [(x, y) for y in range(SIZE) for x in range(SIZE) if (x, y) not in obstacles]
+
+# A*, BFS and Dijkstra with unit costs find shortest paths, whichever search came before
+for wrap in (False, True):
+    finder = PathFinder(SIZE, wrap)
+    blocked = finder.blocked(obstacles)
+    for _ in range(100):
+        start, goal = rng.choice(free), rng.choice(free)
+        expected = path_copying_astar(start, goal, obstacles, SIZE, wrap)
+        start_cell, goal_cell = finder.index(start), finder.index(goal)
+        lengths = list[Optional[int]]()
+        for found in (
+            finder.astar(start_cell, goal_cell, blocked),
+            finder.bfs(start_cell, blocked, {goal_cell}),
+            finder.dijkstra(start_cell, blocked, [1] * SIZE * SIZE, {goal_cell}),
+        ):
+            if found is None:
+                lengths.append(None)
+                continue
+            path = finder.path_to(found)
+            assert path[0] == start_cell and path[-1] == goal_cell and finder.distance(goal_cell) == len(path) - 1
+            assert all(next_cell in finder.neighbors[cell] for cell, next_cell in zip(path, path[1:]))
+            assert not any(blocked[cell] for cell in path[1:])
+            lengths.append(len(path))
+        assert lengths == [len(expected) if expected else None] * 3
+
+# Edges only wrap around with wrap
+bounded, wrapping = PathFinder(8), PathFinder(8, wrap=True)
+assert bounded.neighbors[0] == (8, 1) and set(wrapping.neighbors[0]) == {56, 8, 7, 1}
+assert bounded.heuristic(0, 7) == 7 and wrapping.heuristic(0, 7) == 1
+
+# Walled off cells are not reached, and floods stop at their limit
+walls = bounded.blocked([(3, y) for y in range(8)])
+assert bounded.astar(0, 7, walls) is None and bounded.distance(7) is None
+assert bounded.bfs(0, walls) is None and bounded.reached_count == 24
+assert bounded.bfs(0, walls, limit=10) is None and bounded.reached_count == 10
+
+# Dijkstra goes around expensive cells
+costs = [1] * 64
+costs[1] = 10
+assert bounded.dijkstra(0, bytes(64), costs, {2}) == 2 and bounded.path_to(2) == [0, 8, 9, 10, 2]
+
+# Tracked paths are planned once, followed, and repaired where they get cut
+finder = PathFinder(8)
+open_board = bytearray(64)
+tracked = TrackedPath(finder)
+target = 63
+assert tracked.next_cell(0, target, open_board, new_blocked=()) is not None
+planned = finder.path_to(target)  # Read back from the search the path was planned with
+assert len(planned) == 15 and tracked.next_cell(0, target, open_board, new_blocked=()) == planned[1]
+for step in range(1, 5):
+    assert tracked.next_cell(planned[step], target, open_board, new_blocked=()) == planned[step + 1]
+assert tracked.plans == 1 and tracked.repairs == 0
+
+cut = planned[7]
+open_board[cut] = 1
+walked, new_blocked = [planned[5]], [cut]
+while (next_cell := tracked.next_cell(walked[-1], target, open_board, new_blocked)) is not None:
+    walked.append(next_cell)
+    new_blocked = []
+assert tracked.plans == 1 and tracked.repairs == 1
+assert walked[-1] == target and cut not in walked
+assert all(b in finder.neighbors[a] for a, b in zip(walked, walked[1:]))
+
+assert tracked.next_cell(target, 0, open_board) is not None and tracked.plans == 2  # New goal
+open_board[0] = 1
+assert tracked.next_cell(target, 0, open_board) is None  # Goal taken: checked without new_blocked
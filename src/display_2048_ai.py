@@ -0,0 +1,68 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from src.helpers.frame_scheduler import play_frames, show_frame
+from src.helpers.fullscreen_message import fullscreen_message
+from src.helpers.transitions import play_transition
+from src.napta_matrix import RGBMatrix, matrix_script
+from src.play_2048.algorithm import Board, GameOver, compute_move, new_game
+from src.play_2048.animation import MOVE_DURATION, MOVE_FPS, animate_moves, board_frame
+from src.play_2048.bitboard import to_bitboard
+from src.play_2048.expectimax import MOVE_BUDGET_S, best_move, warm_up
+
+GAME_OVER_DISPLAY_S = 5
+
+
+def _max_tile(board: Board) -> int:
+    return max(max(row) for row in board._data)
+
+
+@matrix_script
+async def display_2048_ai(matrix: RGBMatrix, move_budget: float = MOVE_BUDGET_S) -> None:
+    loop = asyncio.get_running_loop()
+    # The search runs in another process, so it can think about the next move while the current one is animated
+    search_pool = ProcessPoolExecutor(
+        max_workers=1, mp_context=multiprocessing.get_context("spawn"), initializer=warm_up
+    )
+    try:
+        displayed_frame = await fullscreen_message(matrix, ["AI 2048", "Starting...", "Watch the AI", "play 2048!"])
+
+        while True:
+            board = new_game()
+            score = 0
+            search = loop.run_in_executor(search_pool, best_move, to_bitboard(board), move_budget)
+            await play_transition(matrix, displayed_frame, board_frame(board))
+            displayed_frame = board_frame(board)
+
+            while (dir := await search) is not None:
+                try:
+                    updates = compute_move(dir, board)
+                except GameOver as game_over:  # Board filled up and stuck, the move still scores
+                    score += sum(move.dest_tile for move in game_over.moves if move.is_fusion)
+                    displayed_frame = board_frame(board)
+                    show_frame(matrix, displayed_frame)
+                    break
+                if updates is None:  # The search only picks legal moves, but never loop on one that isn't
+                    break
+
+                moves, _new_tile = updates
+                score += sum(move.dest_tile for move in moves if move.is_fusion)
+
+                search = loop.run_in_executor(search_pool, best_move, to_bitboard(board), move_budget)
+                await play_frames(matrix, animate_moves(displayed_frame, moves, duration=MOVE_DURATION), fps=MOVE_FPS)
+                displayed_frame = board_frame(board)
+                show_frame(matrix, displayed_frame)
+
+            displayed_frame = await fullscreen_message(
+                matrix,
+                ["Game Over!", f"Score: {score}", f"Max: {_max_tile(board)}", "Restarting..."],
+                transition_from=displayed_frame,
+            )
+            await asyncio.sleep(GAME_OVER_DISPLAY_S)
+    finally:
+        search_pool.shutdown(wait=False, cancel_futures=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(display_2048_ai())
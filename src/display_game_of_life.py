@@ -1,42 +1,43 @@
 import asyncio
 import time
-from PIL import Image
+from typing import Literal
 import numpy as np
 
+from src.game_of_life.cycles import CycleDetector, inject_patterns
+from src.game_of_life.render import FrameRenderer
+from src.game_of_life.rules import ALIVE, DEAD, parse_rule
+from src.game_of_life.world import Camera, DenseWorld, TiledWorld, World
 from src.napta_matrix import RGBMatrix, matrix_script
 
+SEEDED_AREA = 256
 
-def game_of_life_step(matrix_: np.ndarray) -> np.ndarray:
-    """
-    Apply one step of Conway's Game of Life to a 64x64 boolean matrix.
-    
-    :param matrix: np.ndarray of shape (64, 64) with boolean values (False or True)
-    :return: np.ndarray of shape (64, 64) with the updated state
-    """
-    rows, cols = matrix_.shape
-
-    # Create a padded version of the matrix to simplify neighbor calculations
-    padded = np.pad(matrix_, pad_width=1, mode='constant', constant_values=False).astype(int)
-
-    # Compute the number of live neighbors
-    neighbors_count = (
-        padded[:-2, :-2] + padded[:-2, 1:-1] + padded[:-2, 2:] +
-        padded[1:-1, :-2] +                    padded[1:-1, 2:] +
-        padded[2:, :-2] + padded[2:, 1:-1] + padded[2:, 2:]
-    )
 
-    # Apply the Game of Life rules
-    new_matrix = ((neighbors_count == 3) | (matrix_ & (neighbors_count == 2))).astype(bool)
+def random_board(rng: np.random.Generator, shape: tuple[int, int] = (64, 64)) -> np.ndarray:
+    return (rng.random(shape) < 0.2).view(np.uint8)
 
-    return new_matrix
-
-def draw_point(matrix: RGBMatrix, pix: tuple[int, int], color: tuple[int, int, int]) -> None:
-    matrix.SetPixel(*pix, *color)
+def seed_world(world: World, rng: np.random.Generator) -> None:
+    """Random cells over the whole world, or over its centre if larger than the panel."""
+    height, width = min(world.height, SEEDED_AREA), min(world.width, SEEDED_AREA)
+    world.set_cells((world.height - height) // 2, (world.width - width) // 2, random_board(rng, (height, width)))
 
 @matrix_script
-async def display_game_of_life(matrix: RGBMatrix) -> None:
-    state = np.random.choice([False, True], size=(64, 64), p=[0.8, 0.2])
-    lifespan_matrix = state.astype(int)
+async def display_game_of_life(
+    matrix: RGBMatrix,
+    wrap: bool = False,
+    reseed: Literal["full", "inject"] = "inject",
+    rule: str = "life",
+    world_size: int = 64,
+) -> None:
+    life_rule = parse_rule(rule)
+    if world_size > 64:
+        world: World = TiledWorld(world_size, world_size, life_rule, wrap=wrap)
+    else:
+        world = DenseWorld(64, 64, life_rule, wrap=wrap)
+    camera = Camera(world, 64)
+    rng = np.random.default_rng()
+    seed_world(world, rng)
+    cycle_detector = CycleDetector()
+    renderer = FrameRenderer(life_rule.states)
     
     # Initialize two buffers to avoid flickering
     offscreen_canvas1 = matrix.CreateFrameCanvas()
@@ -45,23 +46,10 @@ async def display_game_of_life(matrix: RGBMatrix) -> None:
     
     while True:
         start = time.time()
-        
-        # Create an RGB array for the entire grid at once
-        rgb_array = np.zeros((64, 64, 3), dtype=np.uint8)
-        
-        # Set colors for live cells based on lifespan
-        mask = state
-        r = np.maximum(255 - lifespan_matrix, 9) * mask
-        g = np.maximum(255 - lifespan_matrix, 203) * mask
-        b = np.maximum(255 - lifespan_matrix, 156) * mask
-        
-        # Assign colors to the RGB array
-        rgb_array[..., 0] = r
-        rgb_array[..., 1] = g
-        rgb_array[..., 2] = b
-        
-        # Convert the numpy array to an image
-        image = Image.fromarray(rgb_array.astype('uint8'), 'RGB')
+
+        # Only the visible window is rendered, in place in the renderer's buffers
+        cells, ages = camera.view()
+        image = renderer.render(cells, ages)
         
         # Swap to the inactive canvas
         next_canvas = offscreen_canvas2 if current_canvas == offscreen_canvas1 else offscreen_canvas1
@@ -72,9 +60,19 @@ async def display_game_of_life(matrix: RGBMatrix) -> None:
         # Swap immediately to minimize flicker
         current_canvas = matrix.SwapOnVSync(next_canvas)
         
-        # Calculate next state
-        state = game_of_life_step(state)
-        lifespan_matrix = np.where(state, lifespan_matrix + 1, 0)
+        # Calculate next state, follow the activity
+        world.step()
+        camera.follow(world.densest_window(64, 64))
+        if cycle_detector.push_hash(world.state_hash()) is not None:  # Stagnating: bring the board back to life
+            cells, _ = camera.view()
+            occupied = cells != DEAD
+            injected = inject_patterns(occupied, rng) if reseed == "inject" else occupied
+            if np.array_equal(injected, occupied):
+                world.clear()
+                seed_world(world, rng)
+            else:  # In the visible window
+                world.set_cells(round(camera.y), round(camera.x), np.where(injected & ~occupied, ALIVE, cells))
+            cycle_detector.reset()
         
         elapsed = time.time() - start
         await asyncio.sleep(max(0, 0.3 - elapsed))
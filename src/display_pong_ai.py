@@ -4,10 +4,11 @@ import random
 import time
 from typing import Literal
 
-from src.helpers.digits import DIGIT_PATTERNS
-from src.helpers.draw import pattern_to_points
+from src.helpers.compositor import Compositor, Layer
 from src.helpers.fullscreen_message import fullscreen_message
 from src.helpers.napta_colors import NaptaColor
+from src.helpers.scoreboard import FOUR_PLAYER_LAYOUT, TWO_PLAYER_LAYOUT, Scoreboard
+from src.helpers.transitions import play_transition, slide
 from src.napta_matrix import RGBMatrix, matrix_script
 
 BOARD_SIZE = 64
@@ -191,32 +192,27 @@ def _paddle_points(z: int, p: Literal[1, 2, 3, 4], boost: int) -> set[tuple[int,
     return {(xp, yp) if p <= 2 else (yp, xp) for yp in range(z, z + paddle_size) for xp in (x, x + 1)}
 
 
-def _score_points(score: int, player: Literal[1, 2, 3, 4]) -> set[tuple[int, int]]:
-    origin_x = (BOARD_SIZE * (3 if player % 2 == 0 else 1)) // 4 - 3 * len(str(score))
-    origin_y = 6 if player <= 2 else 50
-    return {
-        point
-        for i, digit in enumerate(x for x in str(score))
-        for point in pattern_to_points(DIGIT_PATTERNS[digit], origin_x=origin_x + (6 * i), origin_y=origin_y)
-    }
+PLAYER_COLORS = {
+    1: NaptaColor.BITTERSWEET,
+    2: NaptaColor.INDIGO,
+    3: NaptaColor.SPRAY,
+    4: NaptaColor.GORSE,
+}
 
 
 @matrix_script
 async def display_pong_ai(matrix: RGBMatrix) -> None:
-    def draw_point(pix: tuple[int, int], color: NaptaColor) -> None:
-        matrix.SetPixel(*pix, *color.value)
-
     y1 = y2 = (BOARD_SIZE - PADDLE_SIZE) // 2
     x3 = x4 = (BOARD_SIZE - PADDLE_SIZE) // 2
     y1_points = y2_points = x3_points = x4_points = set[tuple[int, int]]()
-    border_points = set[tuple[int, int]]()
     n_players = random.choice([2, 4])
     n_bounces = 0
     last_touch: Literal[0, 1, 2, 3, 4] = 0
     boost1 = boost2 = boost3 = boost4 = 0
 
-    score1 = score2 = score3 = score4 = -1
-    score1_points = score2_points = score3_points = score4_points = set[tuple[int, int]]()
+    scores = {player: -1 for player in PLAYER_COLORS}
+    compositor = Compositor()
+    scoreboard = Scoreboard(compositor, PLAYER_COLORS, FOUR_PLAYER_LAYOUT if n_players == 4 else TWO_PLAYER_LAYOUT)
 
     # Initialize AI players
     ai_player1 = AIPlayer(1)
@@ -249,17 +245,16 @@ async def display_pong_ai(matrix: RGBMatrix) -> None:
     middle_line = {(pt[0], y) for y in range(BOARD_SIZE + 1) if 0 < y % 4 < 3}
 
     def draw_middle_line(off: bool = False) -> None:
-        for dot in middle_line:
-            draw_point(dot, NaptaColor.OFF if off else NaptaColor.CORN_FIELD)
+        if off:
+            compositor.erase_points(Layer.BACKGROUND, middle_line)
+        else:
+            compositor.draw_points(Layer.BACKGROUND, middle_line, NaptaColor.CORN_FIELD)
 
     def draw_border() -> None:
-        nonlocal border_points
         border_points = {
             (x, y) for x in range(BORDER_LEFT - 1, BORDER_RIGHT + 2) for y in (BORDER_TOP - 1, BORDER_BOTTOM + 1)
         } | {(x, y) for y in range(BORDER_TOP - 1, BORDER_BOTTOM + 2) for x in (BORDER_LEFT - 1, BORDER_RIGHT + 1)}
-
-        for dot in border_points:
-            draw_point(dot, NaptaColor.BLUE)
+        compositor.draw_points(Layer.BACKGROUND, border_points, NaptaColor.BLUE)
 
     def update_paddles() -> None:
         nonlocal y1, y2, x3, x4, y1_points, y2_points, x3_points, x4_points
@@ -268,25 +263,14 @@ async def display_pong_ai(matrix: RGBMatrix) -> None:
         new_x3_points = _paddle_points(x3, 3, boost3) if n_players >= 3 else set()
         new_x4_points = _paddle_points(x4, 4, boost4) if n_players >= 4 else set()
 
-        for point in y1_points - new_y1_points:
-            draw_point(point, NaptaColor.BLUE if point in border_points else NaptaColor.OFF)
-        for point in new_y1_points - y1_points:
-            draw_point(point, NaptaColor.BITTERSWEET)
-
-        for point in y2_points - new_y2_points:
-            draw_point(point, NaptaColor.BLUE if point in border_points else NaptaColor.OFF)
-        for point in new_y2_points - y2_points:
-            draw_point(point, NaptaColor.INDIGO)
-
-        for point in x3_points - new_x3_points:
-            draw_point(point, NaptaColor.BLUE if point in border_points else NaptaColor.OFF)
-        for point in new_x3_points - x3_points:
-            draw_point(point, NaptaColor.SPRAY)
-
-        for point in x4_points - new_x4_points:
-            draw_point(point, NaptaColor.BLUE if point in border_points else NaptaColor.OFF)
-        for point in new_x4_points - x4_points:
-            draw_point(point, NaptaColor.GORSE)
+        for points, new_points, color in (
+            (y1_points, new_y1_points, NaptaColor.BITTERSWEET),
+            (y2_points, new_y2_points, NaptaColor.INDIGO),
+            (x3_points, new_x3_points, NaptaColor.SPRAY),
+            (x4_points, new_x4_points, NaptaColor.GORSE),
+        ):
+            compositor.erase_points(Layer.PLAYFIELD, points - new_points)
+            compositor.draw_points(Layer.PLAYFIELD, new_points - points, color)
 
         y1_points, y2_points, x3_points, x4_points = (
             new_y1_points,
@@ -295,21 +279,6 @@ async def display_pong_ai(matrix: RGBMatrix) -> None:
             new_x4_points,
         )
 
-    def _off_color(point: tuple[int, int]) -> NaptaColor:
-        if point in middle_line:
-            return NaptaColor.CORN_FIELD
-        if point in y1_points or point in score1_points:
-            return NaptaColor.BITTERSWEET
-        if point in y2_points or point in score2_points:
-            return NaptaColor.INDIGO
-        if point in x3_points or point in score3_points:
-            return NaptaColor.SPRAY
-        if point in x4_points or point in score4_points:
-            return NaptaColor.GORSE
-        if point in border_points:
-            return NaptaColor.BLUE
-        return NaptaColor.OFF
-
     def update_ball() -> None:
         nonlocal y1, y2, x3, x4, y1_points, y2_points, x3_points, x4_points, xb, yb, dx, dy, pt, n_bounces, last_touch
 
@@ -364,65 +333,22 @@ async def display_pong_ai(matrix: RGBMatrix) -> None:
                 new_xb, new_yb, dx, dy, new_pt = place_ball()
 
         if new_pt != pt:
-            draw_point(pt, _off_color(pt))
-            draw_point(new_pt, NaptaColor.GREEN)
+            compositor.erase_points(Layer.SPRITES, [pt])
+            compositor.draw_points(Layer.SPRITES, [new_pt], NaptaColor.GREEN)
 
         xb, yb, pt = new_xb, new_yb, new_pt
 
     def goal(player: Literal[0, 1, 2, 3, 4], player_looser: Literal[0, 1, 2, 3, 4]) -> None:
-        nonlocal score1, score2, score3, score4, score1_points, score2_points, score3_points, score4_points
-
-        if player == 1:
-            score1 += 2
-        elif player == 2:
-            score2 += 2
-        elif player == 3:
-            score3 += 2
-        elif player == 4:
-            score4 += 2
-
-        if player_looser == 1:
-            score1 -= 1
-        elif player_looser == 2:
-            score2 -= 1
-        elif player_looser == 3:
-            score3 -= 1
-        elif player_looser == 4:
-            score4 -= 1
-
-        if player == 1 or player_looser == 1:
-            new_points = _score_points(score1, 1)
-            for point in score1_points - new_points:
-                draw_point(point, NaptaColor.OFF)
-            for point in new_points - score1_points:
-                draw_point(point, NaptaColor.BITTERSWEET)
-            score1_points = new_points
-        if player == 2 or player_looser == 2:
-            new_points = _score_points(score2, 2)
-            for point in score2_points - new_points:
-                draw_point(point, NaptaColor.OFF)
-            for point in new_points - score2_points:
-                draw_point(point, NaptaColor.INDIGO)
-            score2_points = new_points
-        if player == 3 or player_looser == 3:
-            new_points = _score_points(score3, 3)
-            for point in score3_points - new_points:
-                draw_point(point, NaptaColor.OFF)
-            for point in new_points - score3_points:
-                draw_point(point, NaptaColor.SPRAY)
-            score3_points = new_points
-        if player == 4 or player_looser == 4:
-            new_points = _score_points(score4, 4)
-            for point in score4_points - new_points:
-                draw_point(point, NaptaColor.OFF)
-            for point in new_points - score4_points:
-                draw_point(point, NaptaColor.GORSE)
-            score4_points = new_points
-
-    await fullscreen_message(matrix, ["Starting", "AI Pong", "game..."])
+        if player:
+            scores[player] += 2
+            scoreboard.set_score(player, scores[player])
+        if player_looser:
+            scores[player_looser] -= 1
+            scoreboard.set_score(player_looser, scores[player_looser])
+
+    start_frame = await fullscreen_message(matrix, ["Starting", "AI Pong", "game..."])
     await asyncio.sleep(2)
 
-    matrix.Clear()
     draw_middle_line()
     update_paddles()
     update_ball()
@@ -432,6 +358,7 @@ async def display_pong_ai(matrix: RGBMatrix) -> None:
         goal(3, 0)
     if n_players >= 4:
         goal(4, 0)
+    await play_transition(matrix, start_frame, compositor.composite(), transition=slide)
     timeout = 1 / FPS
 
     while True:
@@ -454,6 +381,7 @@ async def display_pong_ai(matrix: RGBMatrix) -> None:
 
         update_paddles()
         update_ball()
+        compositor.render(matrix)
         await asyncio.sleep(max(0, timeout - (time.time() - t_start)))
 
 
@@ -1,10 +1,6 @@
 import asyncio
-import enum
-import random
 import time
-from collections import deque
-from collections.abc import Collection
-from random import choice, randrange
+from random import choice
 
 from PIL import Image
 
@@ -12,29 +8,10 @@ from src.helpers.control import control_server
 from src.helpers.fullscreen_message import fullscreen_message
 from src.helpers.napta_colors import NaptaColor
 from src.napta_matrix import RGBMatrix, matrix_script
-
-BOARD_SIZE = 64
-INITIAL_SNAKE_LEN = 4
-SPAWN_SAFE_ZONE = 5
-APPLES_COUNT = 30
-DEAD_TO_APPLE_RATE = 0.5
-BOOST_TIME = 10
-BOOST_RATIO = 3
+from src.slither.engine import APPLE, BOARD_SIZE, EMPTY, Dir, SlitherEngine
 
 FPS = 20
 
-BORDER_TOP = 0
-BORDER_BOTTOM = BOARD_SIZE - 1
-BORDER_LEFT = 0
-BORDER_RIGHT = BOARD_SIZE - 1
-
-
-class Dir(enum.Enum):
-    UP = enum.auto()
-    DOWN = enum.auto()
-    RIGHT = enum.auto()
-    LEFT = enum.auto()
-
 
 def get_dir(current_dir: Dir, input: bytes) -> Dir:
     last_press = input[-3:]
@@ -62,116 +39,18 @@ SNAKES = {
 
 @matrix_script
 async def display_slither(matrix: RGBMatrix) -> None:
-    snakes = dict[str, deque[tuple[int, int]]]()
-    boosts = dict[str, int]()
-    apples = set[tuple[int, int]]()
-    eating_apples = set[tuple[int, int]]()
-
-    dirs = dict[str, Dir]()
-
     image = Image.new("RGB", (BOARD_SIZE, BOARD_SIZE))
 
-    def draw_point(pix: tuple[int, int], color: tuple[int, int, int]) -> None:
+    def draw_cell(pix: tuple[int, int], content: int) -> None:
+        if content == EMPTY:
+            color = NaptaColor.OFF
+        elif content == APPLE:
+            color = choice(list(SNAKES.values()))
+        else:
+            color = SNAKES[engine.names[content]]
         matrix.SetPixel(*pix, *color)
 
-    def spawn_new_apple():
-        def _maybe_apple():
-            return (randrange(BOARD_SIZE), randrange(BOARD_SIZE))
-
-        unsuitable_points = set().union(*snakes.values(), apples)
-        maybe_apple = _maybe_apple()
-        while maybe_apple in unsuitable_points:
-            maybe_apple = _maybe_apple()
-
-        apples.add(maybe_apple)
-        draw_point(maybe_apple, choice(list(SNAKES.values())))
-
-    def spawn_snake(name: str) -> None:
-        def _maybe_new_snake():
-            x = randrange(BORDER_LEFT, BORDER_RIGHT - (INITIAL_SNAKE_LEN + SPAWN_SAFE_ZONE))
-            y = randrange(BORDER_TOP, BORDER_BOTTOM)
-            return {(x + i, y) for i in range(INITIAL_SNAKE_LEN + SPAWN_SAFE_ZONE)}
-
-        unsuitable_points = set().union(*snakes.values())
-        maybe_new_snake = _maybe_new_snake()
-        while maybe_new_snake & unsuitable_points:
-            maybe_new_snake = _maybe_new_snake()
-
-        new_snake_points = sorted(maybe_new_snake, key=lambda pt: -pt[0])  # Head to queue
-        snakes[name] = deque(new_snake_points[:-SPAWN_SAFE_ZONE])
-        dirs[name] = Dir.RIGHT
-        for point in snakes[name]:
-            draw_point(point, SNAKES[name])
-
-        apples.difference_update(maybe_new_snake)
-
-    def pop_tails(snake_names: Collection[str]) -> None:
-        # Pop tails
-        for name in snake_names:
-            snake = snakes.get(name)
-            if not snake:
-                continue
-
-            if snake[-1] in eating_apples:
-                eating_apples.remove(snake[-1])
-            else:
-                poped = snake.pop()
-                draw_point(poped, NaptaColor.OFF)
-
-    def compute_heads(snake_names: Collection[str]) -> None:
-        dead_snakes = set[str]()
-
-        # Compute new heads
-        for name in snake_names:
-            snake = snakes.get(name)
-            if not snake:
-                continue
-
-            head_x, head_y = snake[0]
-            dir = dirs[name]
-            if dir == Dir.UP:
-                if head_y == BORDER_TOP:
-                    dead_snakes.add(name)
-                    continue
-                new_head = head_x, (head_y - 1)
-            elif dir == Dir.DOWN:
-                if head_y == BORDER_BOTTOM:
-                    dead_snakes.add(name)
-                    continue
-                new_head = head_x, (head_y + 1)
-            elif dir == Dir.RIGHT:
-                if head_x == BORDER_RIGHT:
-                    dead_snakes.add(name)
-                    continue
-                new_head = (head_x + 1), head_y
-            else:
-                if head_x == BORDER_LEFT:
-                    dead_snakes.add(name)
-                    continue
-                new_head = (head_x - 1), head_y
-
-            if new_head in apples:
-                apples.remove(new_head)
-                eating_apples.add(new_head)
-
-            if any(new_head in other_snake for other_snake in snakes.values()):
-                dead_snakes.add(name)
-                continue
-
-            draw_point(new_head, SNAKES[name])
-            snake.appendleft(new_head)
-
-        # Remove dead snakes
-        for dead_snake in dead_snakes:
-            for point in snakes[dead_snake]:
-                if random.random() < DEAD_TO_APPLE_RATE:
-                    apples.add(point)
-                    draw_point(point, choice(list(SNAKES.values())))
-                else:
-                    draw_point(point, NaptaColor.OFF)
-
-            del snakes[dead_snake]
-            del dirs[dead_snake]
+    engine = SlitherEngine(draw_cell)
 
     await fullscreen_message(matrix, ["Starting", "Slither game", "server..."])
     on_started = fullscreen_message(
@@ -192,27 +71,15 @@ async def display_slither(matrix: RGBMatrix) -> None:
             for task in done:
                 if input := task.result():
                     name = task.get_name()
-                    if name not in snakes:
-                        spawn_snake(name)
-                    dirs[name] = get_dir(dirs[name], input)
-                    if b" " in input and name not in boosts and len(snakes[name]) > BOOST_TIME + INITIAL_SNAKE_LEN:
-                        boosts[name] = BOOST_TIME
+                    if name not in engine.snakes:
+                        engine.spawn_snake(name)
+                    engine.dirs[name] = get_dir(engine.dirs[name], input)
+                    if b" " in input:
+                        engine.boost(name)
             for task in pending:
                 task.cancel()
 
-            pop_tails(snakes.keys())
-            compute_heads(snakes.keys())
-
-            # Boost: pop 1 for tail than heads 1 time on 2
-            if boosts:
-                for _ in range(BOOST_RATIO - 1):
-                    pop_tails(boosts.keys())
-                    compute_heads(boosts.keys())
-                pop_tails([name for name, boost in boosts.items() if boost % 2])
-                boosts = {name: boost - 1 for name, boost in boosts.items() if boost > 1}
-
-            for _ in range(APPLES_COUNT - len(apples)):
-                spawn_new_apple()
+            engine.step()
 
             await asyncio.sleep(frame_duration - (time.time() - t_start))
 
@@ -2,19 +2,28 @@ import asyncio
 import enum
 import time
 from collections import deque
+from collections.abc import Sequence
 from random import randrange
 from typing import Optional
-import heapq
 
+import numpy as np
 from PIL import Image, ImageDraw
 
+from src.ai_players.fields import label_components
+from src.ai_players.hamiltonian import HamiltonianCycle
+from src.ai_players.pathfinding import PathFinder, TrackedPath
 from src.helpers.fullscreen_message import fullscreen_message
 from src.helpers.napta_colors import NaptaColor
+from src.helpers.transitions import play_transition, wipe
 from src.napta_matrix import RGBMatrix, matrix_script
 
 BOARD_SIZE = 64
 INITIAL_SNAKE_LEN = 4
 FPS = 10  # Slower for AI to be more visible
+HAMILTONIAN_FPS = 60
+# Filling the board takes about 2 million moves: one more move per frame for each of these many cells of snake, for
+# about 7 minutes in all
+HAMILTONIAN_CELLS_PER_MOVE = 16
 
 
 class Dir(enum.Enum):
@@ -25,10 +34,13 @@ class Dir(enum.Enum):
 
 
 class SnakeAI:
-    """AI player for the snake game using A* pathfinding."""
+    """AI player for the snake game using A* pathfinding, or following a Hamiltonian cycle of the board."""
     
-    def __init__(self, board_size: int):
+    def __init__(self, board_size: int, hamiltonian: bool = False):
         self.board_size = board_size
+        self.finder = PathFinder(board_size, wrap=True)
+        self.path = TrackedPath(self.finder)
+        self.cycle = HamiltonianCycle(board_size) if hamiltonian else None
     
     def get_neighbors(self, pos: tuple[int, int]) -> list[tuple[int, int]]:
         """Get valid neighboring positions."""
@@ -40,67 +52,23 @@ class SnakeAI:
             neighbors.append((new_x, new_y))
         return neighbors
     
-    def manhattan_distance(self, pos1: tuple[int, int], pos2: tuple[int, int]) -> int:
-        """Calculate Manhattan distance between two positions."""
-        x1, y1 = pos1
-        x2, y2 = pos2
-        # Handle wrapping around the board
-        dx = min(abs(x2 - x1), self.board_size - abs(x2 - x1))
-        dy = min(abs(y2 - y1), self.board_size - abs(y2 - y1))
-        return dx + dy
-    
-    def find_path_astar(self, start: tuple[int, int], goal: tuple[int, int], 
-                       obstacles: set[tuple[int, int]]) -> Optional[list[tuple[int, int]]]:
-        """Find shortest path using A* algorithm."""
-        heap = [(0, start, [start])]
-        visited = set()
-        
-        while heap:
-            f_score, current, path = heapq.heappop(heap)
-            
-            if current in visited:
-                continue
-            visited.add(current)
-            
-            if current == goal:
-                return path
-            
-            for neighbor in self.get_neighbors(current):
-                if neighbor in visited or neighbor in obstacles:
-                    continue
-                
-                new_path = path + [neighbor]
-                g_score = len(new_path) - 1
-                h_score = self.manhattan_distance(neighbor, goal)
-                f_score = g_score + h_score
-                
-                heapq.heappush(heap, (f_score, neighbor, new_path))
-        
-        return None
-    
     def find_longest_path(self, start: tuple[int, int], 
-                         obstacles: set[tuple[int, int]]) -> Optional[tuple[int, int]]:
-        """Find direction that leads to the longest available path (survival mode)."""
+                         blocked: Sequence[int]) -> Optional[tuple[int, int]]:
+        """Find direction that leads to the largest area left (survival mode)."""
         best_direction = None
         max_length = 0
         
+        # Area reachable from each cell: the size of its connected component, over the whole board
+        free = np.asarray(blocked, dtype=np.uint8).reshape(self.board_size, self.board_size) == 0
+        components = label_components(free, wrap=True)
+        areas = np.bincount(components[free], minlength=components.size)
+        
         for neighbor in self.get_neighbors(start):
-            if neighbor in obstacles:
+            x, y = neighbor
+            if blocked[self.finder.index(neighbor)]:
                 continue
             
-            # Use BFS to find reachable area size
-            queue = deque([neighbor])
-            visited = {neighbor}
-            length = 0
-            
-            while queue and length < 100:  # Limit search depth
-                current = queue.popleft()
-                length += 1
-                
-                for next_pos in self.get_neighbors(current):
-                    if next_pos not in visited and next_pos not in obstacles:
-                        visited.add(next_pos)
-                        queue.append(next_pos)
+            length = areas[components[y, x]]
             
             if length > max_length:
                 max_length = length
@@ -108,19 +76,24 @@ class SnakeAI:
         
         return best_direction
     
-    def get_next_move(self, snake: deque, apple: tuple[int, int]) -> Dir:
-        """Determine the next move for the snake."""
+    def get_next_move(self, snake: deque, apple: tuple[int, int], growing: int = 0) -> Dir:
+        """Determine the next move for the snake, which will grow by `growing` cells."""
         head = snake[0]
+        if self.cycle is not None:
+            # A few lookups along the cycle, no search: the snake fills the board without trapping itself
+            return self.direction(head, self.cycle.next_point(snake, apple, growing))
+
         snake_body = set(snake)
+        blocked = self.finder.blocked(snake_body)
         
-        # Try to find path to apple
-        path = self.find_path_astar(head, apple, snake_body)
+        # Try to follow a path to apple, kept from the last move: only the head, moving along it, takes new cells
+        next_cell = self.path.next_cell(self.finder.index(head), self.finder.index(apple), blocked, new_blocked=())
         
-        if path and len(path) >= 2:
-            next_pos = path[1]  # Next position in path
+        if next_cell is not None:
+            next_pos = self.finder.point(next_cell)  # Next position in path
         else:
             # If no path to apple, try survival mode
-            next_pos = self.find_longest_path(head, snake_body)
+            next_pos = self.find_longest_path(head, blocked)
             if not next_pos:
                 # Last resort: just pick any safe direction
                 for neighbor in self.get_neighbors(head):
@@ -132,7 +105,10 @@ class SnakeAI:
             # No safe move found, game over is imminent
             return Dir.RIGHT  # Default direction
         
-        # Convert position to direction
+        return self.direction(head, next_pos)
+    
+    def direction(self, head: tuple[int, int], next_pos: tuple[int, int]) -> Dir:
+        """Convert position to direction."""
         head_x, head_y = head
         next_x, next_y = next_pos
         
@@ -162,18 +138,34 @@ class SnakeAI:
 
 
 @matrix_script
-async def display_snake_ai(matrix: RGBMatrix) -> None:
-    """AI-controlled snake game."""
-    snake = deque(((20 + i) % BOARD_SIZE, 40) for i in range(INITIAL_SNAKE_LEN, 0, -1))  # Head to queue
-    ai = SnakeAI(BOARD_SIZE)
+async def display_snake_ai(matrix: RGBMatrix, hamiltonian: bool = False) -> None:
+    """AI-controlled snake game, following A* paths to the apples, or a Hamiltonian cycle with shortcuts."""
+    await _play_snake_ai(matrix, hamiltonian)
+
+
+@matrix_script
+async def display_snake_ai_hamiltonian(matrix: RGBMatrix) -> None:
+    """AI-controlled snake filling the whole board, along a Hamiltonian cycle with shortcuts."""
+    await _play_snake_ai(matrix, hamiltonian=True)
+
+
+async def _play_snake_ai(matrix: RGBMatrix, hamiltonian: bool) -> None:
+    # Head to queue, on a row the cycle goes along to the right
+    snake = deque(((20 + i) % BOARD_SIZE, 40) for i in range(INITIAL_SNAKE_LEN, 0, -1))
+    body = set(snake)
+    ai = SnakeAI(BOARD_SIZE, hamiltonian)
+    fps = HAMILTONIAN_FPS if hamiltonian else FPS
     score = 0
 
-    def get_next_apple() -> tuple[int, int]:
-        while (maybe_apple := (randrange(BOARD_SIZE), randrange(BOARD_SIZE))) in snake:
+    def get_next_apple() -> Optional[tuple[int, int]]:
+        if len(body) == BOARD_SIZE * BOARD_SIZE:
+            return None  # The snake fills the board
+        while (maybe_apple := (randrange(BOARD_SIZE), randrange(BOARD_SIZE))) in body:
             continue
         return maybe_apple
 
     apple = get_next_apple()
+    assert apple is not None  # The board starts nearly empty
     eating_apples = set[tuple[int, int]]()
     dir = Dir.RIGHT
 
@@ -181,9 +173,11 @@ async def display_snake_ai(matrix: RGBMatrix) -> None:
     draw = ImageDraw.Draw(image)
     draw.point(snake, NaptaColor.BITTERSWEET.value)
     draw.point(apple, NaptaColor.GREEN.value)
+    board_frame = np.array(image)  # What is drawn, to transition to and from it
 
     def draw_point(pix: tuple[int, int], color: tuple[int, int, int]) -> None:
         matrix.SetPixel(*pix, *color)
+        board_frame[pix[1], pix[0]] = color
 
     def update_game() -> bool:
         """Update game state. Returns False if game over."""
@@ -194,6 +188,7 @@ async def display_snake_ai(matrix: RGBMatrix) -> None:
             score += 1
         else:
             poped = snake.pop()
+            body.remove(poped)
             draw_point(poped, NaptaColor.OFF.value)
 
         head_x, head_y = snake[0]
@@ -206,53 +201,64 @@ async def display_snake_ai(matrix: RGBMatrix) -> None:
         else:
             new_head = (head_x - 1) % BOARD_SIZE, head_y
 
-        if new_head == apple:
-            eating_apples.add(apple)
-            apple = get_next_apple()
-            draw_point(apple, NaptaColor.GREEN.value)
-
-        for eating_apple in eating_apples:
-            draw_point(eating_apple, NaptaColor.GORSE.value)
-
-        if new_head in snake:
+        if new_head in body:
             return False  # Game over
 
+        if snake[0] in eating_apples:  # Eaten last move, now in the body
+            draw_point(snake[0], NaptaColor.GORSE.value)
         draw_point(new_head, NaptaColor.BITTERSWEET.value)
         snake.appendleft(new_head)
+        body.add(new_head)
+
+        if new_head == apple:
+            eating_apples.add(apple)
+            apple = get_next_apple()
+            if apple is not None:
+                draw_point(apple, NaptaColor.GREEN.value)
         return True
 
-    await fullscreen_message(matrix, ["AI Snake", "Starting...", f"Watch the AI", "play Snake!"])
+    start_frame = await fullscreen_message(matrix, ["AI Snake", "Starting...", "Watch the AI", "play Snake!"])
     
-    matrix.SetImage(image, 0, 0)
+    await play_transition(matrix, start_frame, board_frame, transition=wipe)
     
     try:
         while True:
             t_start = time.time()
             
-            # AI makes decision
-            dir = ai.get_next_move(snake, apple)
-            
-            # Update game
-            if not update_game():
-                await fullscreen_message(matrix, ["Game Over!", f"AI Score: {score}", "Restarting..."])
-                await asyncio.sleep(3)
-                # Reset game
-                snake = deque(((20 + i) % BOARD_SIZE, 40) for i in range(INITIAL_SNAKE_LEN, 0, -1))
-                apple = get_next_apple()
-                eating_apples = set()
-                dir = Dir.RIGHT
-                score = 0
-                
-                # Redraw initial state
-                image = Image.new("RGB", (BOARD_SIZE, BOARD_SIZE))
-                draw = ImageDraw.Draw(image)
-                draw.point(snake, NaptaColor.BITTERSWEET.value)
-                draw.point(apple, NaptaColor.GREEN.value)
-                matrix.SetImage(image, 0, 0)
+            # Along the cycle, the longer the snake the more moves per frame, for a full game to be watched
+            moves = max(1, len(snake) // HAMILTONIAN_CELLS_PER_MOVE) if hamiltonian else 1
+            for _ in range(moves):
+                # AI makes decision
+                dir = ai.get_next_move(snake, apple, len(eating_apples))
+
+                # Update game
+                if not update_game() or apple is None:
+                    title = "Game Over!" if apple is not None else "Board full!"
+                    game_over_frame = await fullscreen_message(
+                        matrix, [title, f"AI Score: {score}", "Restarting..."], transition_from=board_frame
+                    )
+                    await asyncio.sleep(3)
+                    # Reset game
+                    snake = deque(((20 + i) % BOARD_SIZE, 40) for i in range(INITIAL_SNAKE_LEN, 0, -1))
+                    body = set(snake)
+                    apple = get_next_apple()
+                    assert apple is not None
+                    eating_apples = set()
+                    dir = Dir.RIGHT
+                    score = 0
+
+                    # Redraw initial state
+                    image = Image.new("RGB", (BOARD_SIZE, BOARD_SIZE))
+                    draw = ImageDraw.Draw(image)
+                    draw.point(snake, NaptaColor.BITTERSWEET.value)
+                    draw.point(apple, NaptaColor.GREEN.value)
+                    board_frame[:] = np.asarray(image)
+                    await play_transition(matrix, game_over_frame, board_frame, transition=wipe)
+                    break
             
             # Control game speed
             elapsed = time.time() - t_start
-            sleep_time = max(0, 1 / FPS - elapsed)
+            sleep_time = max(0, 1 / fps - elapsed)
             await asyncio.sleep(sleep_time)
             
     except KeyboardInterrupt:
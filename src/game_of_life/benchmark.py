@@ -0,0 +1,37 @@
+# Compare Game of Life engines: python -m src.game_of_life.benchmark
+
+import argparse
+import time
+from collections.abc import Callable
+
+import numpy as np
+
+from src.game_of_life.bitboard import bitboard_step, pack
+from src.game_of_life.rules import CONWAY, RuleEngine
+
+
+def _generations_per_second(step: Callable[[np.ndarray], np.ndarray], state: np.ndarray, duration: float) -> float:
+    generations = 0
+    start = time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < duration:
+        for _ in range(100):
+            state = step(state)
+        generations += 100
+    return generations / elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare Game of Life engines")
+    parser.add_argument("--height", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=2, help="Seconds per engine")
+    args = parser.parse_args()
+
+    board = np.random.default_rng(0).random((args.height, 64)) < 0.2
+    table_engine = RuleEngine(CONWAY, args.height, 64, use_bitboard=False)
+    engines: dict[str, tuple[Callable[[np.ndarray], np.ndarray], np.ndarray]] = {
+        "RuleEngine (lookup table)": (table_engine.step, board.view(np.uint8)),
+        "bitboard_step (bounded)": (bitboard_step, pack(board)),
+        "bitboard_step (toroidal)": (lambda rows: bitboard_step(rows, wrap=True), pack(board)),
+    }
+    for name, (step, state) in engines.items():
+        print(f"{name:>26}: {_generations_per_second(step, state, args.duration):>10,.0f} generations/s")
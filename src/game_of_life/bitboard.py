@@ -0,0 +1,84 @@
+"""Game of Life on bitboards: one uint64 per row, bit x of a row being the cell of column x.
+
+Neighbour counts are never materialised: the 8 neighbour bitplanes are summed with bit-parallel adders, so a step is a
+few dozen NumPy operations on `height` integers whatever the number of live cells.
+"""
+
+import numpy as np
+
+MAX_WIDTH = 64
+
+
+def pack(board: np.ndarray) -> np.ndarray:
+    """(height, width <= 64) bool board -> uint64[height] rows."""
+    height, width = board.shape
+    assert width <= MAX_WIDTH, f"Bitboard rows hold at most {MAX_WIDTH} cells"
+    padded = np.zeros((height, MAX_WIDTH), dtype=bool)
+    padded[:, :width] = board
+    return np.packbits(padded, axis=1, bitorder="little").view("<u8").reshape(height).astype(np.uint64)
+
+
+def unpack(rows: np.ndarray, width: int = MAX_WIDTH) -> np.ndarray:
+    """uint64[height] rows -> (height, width) bool board."""
+    bytes_ = rows.astype("<u8").view(np.uint8).reshape(len(rows), 8)
+    return np.unpackbits(bytes_, axis=1, count=width, bitorder="little").view(bool)
+
+
+def _width_mask(width: int) -> np.uint64:
+    return np.uint64((1 << width) - 1)
+
+
+_ONE = np.uint64(1)
+
+
+def _horizontal_neighbours(rows: np.ndarray, width: int, wrap: bool) -> tuple[np.ndarray, np.ndarray]:
+    """Rows of the west and east neighbours of each cell."""
+    mask = _width_mask(width)
+    west = rows << _ONE
+    east = rows >> _ONE
+    if wrap:
+        west |= rows >> np.uint64(width - 1)
+        east |= (rows & _ONE) << np.uint64(width - 1)
+    return west & mask, east
+
+
+def _extend(rows: np.ndarray, wrap: bool) -> np.ndarray:
+    """Rows with one more row on each side: the opposite edge if wrapping, else dead cells."""
+    extended = np.empty(len(rows) + 2, dtype=np.uint64)
+    extended[1:-1] = rows
+    if wrap:
+        extended[0], extended[-1] = rows[-1], rows[0]
+    else:
+        extended[0] = extended[-1] = 0
+    return extended
+
+
+def _add3(a: np.ndarray, b: np.ndarray, c: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Full adder: (sum bit, carry bit) of a + b + c, bitwise."""
+    a_xor_b = a ^ b
+    return a_xor_b ^ c, (a & b) | (c & a_xor_b)
+
+
+def bitboard_step(rows: np.ndarray, width: int = MAX_WIDTH, wrap: bool = False) -> np.ndarray:
+    """One generation of Conway's Game of Life (B3/S23).
+
+    :param rows: uint64[height] rows, see `pack`
+    :param width: number of columns (bits used in each row)
+    :param wrap: toroidal board if True, else cells beyond the edges are dead
+    """
+    extended = _extend(rows, wrap)
+    west, east = _horizontal_neighbours(extended, width, wrap)
+
+    # Per row, sum of each cell's west and east neighbours, and of the 3 cells centred on it: 2-bit numbers
+    ones_2, twos_2 = west ^ east, west & east
+    ones_3, twos_3 = ones_2 ^ extended, twos_2 | (ones_2 & extended)
+
+    # Count = ones + 2 * twos_sum, with the 3-cell sums of the rows above and below and the 2-cell sum of the row
+    ones, carry = _add3(ones_3[:-2], ones_2[1:-1], ones_3[2:])
+    twos_n, twos_m, twos_s = twos_3[:-2], twos_2[1:-1], twos_3[2:]
+
+    # Count is 2 or 3 iff exactly one of the 4 twos is set
+    pair_1, pair_2 = twos_n ^ twos_m, twos_s ^ carry
+    exactly_one_two = (pair_1 ^ pair_2) & ~((twos_n & twos_m) | (twos_s & carry))
+
+    return exactly_one_two & (ones | rows)
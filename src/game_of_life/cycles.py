@@ -0,0 +1,62 @@
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+MAX_PERIOD = 16  # Still lifes (period 1), blinkers (2), pulsars (3)... up to this period are detected
+INJECTION_TILE = 8
+INJECTION_DENSITY = 0.35
+
+
+class CycleDetector:
+    """Detect that a board came back to a state it had at most `max_period` generations ago.
+
+    Hashes of the last states are kept in a ring, with a dict hash -> generation for O(1) lookups.
+    """
+
+    def __init__(self, max_period: int = MAX_PERIOD) -> None:
+        self.max_period = max_period
+        self._ring = deque[int](maxlen=max_period)
+        self._generation_by_hash = dict[int, int]()
+        self._generation = 0
+
+    def reset(self) -> None:
+        self._ring.clear()
+        self._generation_by_hash.clear()
+
+    def push(self, state: np.ndarray) -> Optional[int]:
+        """Record the state of the next generation, return the period of the cycle it closes (None if no cycle)."""
+        return self.push_hash(hash(state.tobytes()))
+
+    def push_hash(self, state_hash: int) -> Optional[int]:
+        self._generation += 1
+        seen_at = self._generation_by_hash.get(state_hash)
+
+        if len(self._ring) == self.max_period:  # Forget the oldest state, unless seen again since
+            oldest = self._ring[0]
+            if self._generation_by_hash.get(oldest) == self._generation - self.max_period:
+                del self._generation_by_hash[oldest]
+        self._ring.append(state_hash)
+        self._generation_by_hash[state_hash] = self._generation
+
+        return None if seen_at is None else self._generation - seen_at
+
+
+def inject_patterns(
+    board: np.ndarray,
+    rng: np.random.Generator,
+    max_tiles: int = 8,
+    tile_size: int = INJECTION_TILE,
+    density: float = INJECTION_DENSITY,
+) -> np.ndarray:
+    """Fill up to `max_tiles` empty (tile_size x tile_size) tiles of the board with random cells."""
+    height, width = board.shape
+    tiles = board[: height - height % tile_size, : width - width % tile_size]
+    tiles = tiles.reshape(height // tile_size, tile_size, width // tile_size, tile_size)
+    empty_tiles = np.argwhere(~tiles.any(axis=(1, 3)))
+
+    board = board.copy()
+    chosen = rng.permutation(len(empty_tiles))[:max_tiles]
+    for tile_y, tile_x in empty_tiles[chosen] * tile_size:
+        board[tile_y : tile_y + tile_size, tile_x : tile_x + tile_size] = rng.random((tile_size, tile_size)) < density
+    return board
@@ -0,0 +1,39 @@
+import numpy as np
+from PIL import Image
+
+from src.game_of_life.rules import ALIVE, DEAD
+
+CELL_COLOR = (9, 203, 156)  # Old cells, young ones being whiter
+MAX_AGE = 255
+
+
+def build_palette(states: int) -> np.ndarray:
+    """(state * 256 + age) -> colour, uint8[states * 256, 3].
+
+    Alive cells fade from white to the cell colour with age, dying cells of Generations rules fade out to black.
+    """
+    palette = np.zeros((states, MAX_AGE + 1, 3), dtype=np.uint8)
+    ages = np.arange(MAX_AGE + 1)
+    palette[ALIVE] = np.maximum(255 - ages[:, None], CELL_COLOR)
+    for state in range(ALIVE + 1, states):
+        palette[state] = (np.array(CELL_COLOR) * (states - state) / states).astype(np.uint8)
+    palette[DEAD] = 0
+    return palette.reshape(states * (MAX_AGE + 1), 3)
+
+
+class FrameRenderer:
+    """Cells and ages to an image, through buffers allocated once: rendering a frame allocates no array or image."""
+
+    def __init__(self, states: int, height: int = 64, width: int = 64) -> None:
+        self.palette = build_palette(states)
+        self.frame = np.zeros((height, width, 3), dtype=np.uint8)
+        self.image = Image.new("RGB", (width, height))
+        self._indices = np.zeros((height, width), dtype=np.intp)
+
+    def render(self, cells: np.ndarray, ages: np.ndarray) -> Image.Image:
+        """The returned image is overwritten by the next call."""
+        np.multiply(cells, MAX_AGE + 1, out=self._indices)
+        np.add(self._indices, ages, out=self._indices)
+        np.take(self.palette, self._indices, axis=0, out=self.frame, mode="clip")  # "clip" does not buffer `out`
+        self.image.frombytes(self.frame)  # Decoded into the existing image
+        return self.image
@@ -0,0 +1,116 @@
+"""Life-like cellular automata from their rulestring, e.g. "B3/S23" (Conway), "B36/S23" (HighLife).
+
+Generations rules add decay states: "B2/S/C3" (Brian's Brain) has cells 0 (dead), 1 (alive) and 2 (dying). A cell that
+stops surviving goes through every dying state before being dead, and only alive cells count as neighbours.
+"""
+
+import re
+from typing import NamedTuple
+
+import numpy as np
+
+from src.game_of_life.bitboard import MAX_WIDTH, bitboard_step, pack, unpack
+
+DEAD = 0
+ALIVE = 1
+
+
+class Rule(NamedTuple):
+    birth: frozenset[int]
+    survival: frozenset[int]
+    states: int = 2  # > 2 for Generations rules
+
+    def __str__(self) -> str:
+        rulestring = f"B{''.join(map(str, sorted(self.birth)))}/S{''.join(map(str, sorted(self.survival)))}"
+        return rulestring if self.states == 2 else f"{rulestring}/C{self.states}"
+
+
+_BS_RULE = re.compile(r"B(?P<birth>[0-8]*)/S(?P<survival>[0-8]*)(?:/C?(?P<states>\d+))?", re.IGNORECASE)
+_SB_RULE = re.compile(r"(?P<survival>[0-8]*)/(?P<birth>[0-8]*)(?:/(?P<states>\d+))?")  # Classic S/B(/C) notation
+
+
+def parse_rule(rulestring: str) -> Rule:
+    """Parse a rule in B/S(/C) or S/B(/C) notation, or one of the `RULES` names."""
+    if rulestring.lower() in RULES:
+        return RULES[rulestring.lower()]
+
+    match = _BS_RULE.fullmatch(rulestring.strip()) or _SB_RULE.fullmatch(rulestring.strip())
+    if not match:
+        raise ValueError(f"Invalid rule {rulestring!r}, expected e.g. 'B3/S23' or 'B2/S/C3'")
+    states = int(match["states"] or 2)
+    if states < 2:
+        raise ValueError(f"Invalid rule {rulestring!r}: a rule has at least 2 states")
+    return Rule(frozenset(map(int, match["birth"])), frozenset(map(int, match["survival"])), states)
+
+
+def _rule(birth: str, survival: str, states: int = 2) -> Rule:
+    return Rule(frozenset(map(int, birth)), frozenset(map(int, survival)), states)
+
+
+CONWAY = _rule("3", "23")
+RULES = {
+    "life": CONWAY,
+    "highlife": _rule("36", "23"),
+    "day_and_night": _rule("3678", "34678"),
+    "seeds": _rule("2", ""),
+    "life_without_death": _rule("3", "012345678"),
+    "maze": _rule("3", "12345"),
+    "replicator": _rule("1357", "1357"),
+    "brians_brain": _rule("2", "", 3),
+    "star_wars": _rule("2", "345", 4),
+}
+
+
+def rule_table(rule: Rule) -> np.ndarray:
+    """(state, alive neighbours) -> next state, uint8[states, 9]."""
+    table = np.zeros((rule.states, 9), dtype=np.uint8)
+    for count in range(9):
+        table[DEAD, count] = ALIVE if count in rule.birth else DEAD
+        table[ALIVE, count] = ALIVE if count in rule.survival else (ALIVE + 1) % rule.states
+    for state in range(ALIVE + 1, rule.states):
+        table[state] = (state + 1) % rule.states
+    return table
+
+
+def sum_neighbours(padded: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """Sum of the 8 neighbours of each inner cell of a (height + 2, width + 2) uint8 array.
+
+    The sums go into `out`, (height, width).
+    """
+    height, width = out.shape
+    np.add(padded[:-2, :-2], padded[:-2, 1:-1], out=out)
+    for dy, dx in ((0, 2), (1, 0), (1, 2), (2, 0), (2, 1), (2, 2)):
+        out += padded[dy : dy + height, dx : dx + width]
+    return out
+
+
+class RuleEngine:
+    """Step a (height, width) uint8 board of cell states with a rule, on a bounded or wrapped board.
+
+    Neighbour counts are computed once per step into preallocated buffers, the rule is then applied with a single
+    lookup in its table. Conway's rule uses the bitboard engine when the board fits, unless `use_bitboard` is False.
+    """
+
+    def __init__(self, rule: Rule, height: int, width: int, wrap: bool = False, use_bitboard: bool = True) -> None:
+        self.rule = rule
+        self.wrap = wrap
+        self.table = rule_table(rule)
+        self._use_bitboard = use_bitboard and rule == CONWAY and width <= MAX_WIDTH
+        self._padded = np.zeros((height + 2, width + 2), dtype=np.uint8)
+        self._counts = np.zeros((height, width), dtype=np.uint8)
+
+    def neighbour_counts(self, cells: np.ndarray) -> np.ndarray:
+        """Alive neighbours of each cell. The returned array is reused by the next call."""
+        padded = self._padded
+        np.equal(cells, ALIVE, out=padded[1:-1, 1:-1], casting="unsafe")
+        if self.wrap:
+            padded[0, 1:-1], padded[-1, 1:-1] = padded[-2, 1:-1], padded[1, 1:-1]
+            padded[:, 0], padded[:, -1] = padded[:, -2], padded[:, 1]
+
+        return sum_neighbours(padded, out=self._counts)
+
+    def step(self, cells: np.ndarray) -> np.ndarray:
+        if self._use_bitboard:
+            width = cells.shape[1]
+            return unpack(bitboard_step(pack(cells == ALIVE), width, self.wrap), width).view(np.uint8)
+        return self.table[cells, self.neighbour_counts(cells)]
@@ -0,0 +1,50 @@
+import numpy as np
+
+from src.game_of_life.bitboard import bitboard_step, pack, unpack
+
+
+def _reference_step(board: np.ndarray) -> np.ndarray:
+    """Conway's step of a bounded boolean board, from the neighbour counts of a padded copy."""
+    padded = np.pad(board, pad_width=1, mode="constant", constant_values=False).astype(int)
+    neighbors_count = (
+        padded[:-2, :-2]
+        + padded[:-2, 1:-1]
+        + padded[:-2, 2:]
+        + padded[1:-1, :-2]
+        + padded[1:-1, 2:]
+        + padded[2:, :-2]
+        + padded[2:, 1:-1]
+        + padded[2:, 2:]
+    )
+    return (neighbors_count == 3) | (board & (neighbors_count == 2))
+
+
+def _wrapped_step(board: np.ndarray) -> np.ndarray:
+    neighbors_count = sum(
+        np.roll(board, (dy, dx), axis=(0, 1)).astype(int) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dy or dx
+    )
+    return (neighbors_count == 3) | (board & (neighbors_count == 2))
+
+
+def _test_steps(board: np.ndarray, wrap: bool, generations: int = 20) -> None:
+    height, width = board.shape
+    rows = pack(board)
+    assert np.array_equal(unpack(rows, width), board), "pack/unpack round trip failed"
+    for generation in range(generations):
+        board = _wrapped_step(board) if wrap else _reference_step(board)
+        rows = bitboard_step(rows, width, wrap=wrap)
+        assert np.array_equal(unpack(rows, width), board), f"{board.shape} {wrap=}: diverged at generation {generation}"
+
+
+_rng = np.random.default_rng(0)
+for _shape in [(64, 64), (64, 37), (10, 64), (3, 3), (1, 64)]:
+    for _wrap in (False, True):
+        _test_steps(_rng.random(_shape) < 0.3, _wrap)
+
+# Glider crossing the edges of a toroidal board comes back where it started
+_glider = np.zeros((64, 64), dtype=bool)
+_glider[[0, 1, 2, 2, 2], [1, 2, 0, 1, 2]] = True
+_rows = pack(_glider)
+for _ in range(4 * 64):
+    _rows = bitboard_step(_rows, wrap=True)
+assert np.array_equal(unpack(_rows), _glider), "glider did not wrap around"
@@ -0,0 +1,38 @@
+import numpy as np
+
+from src.game_of_life.bitboard import bitboard_step, pack
+from src.game_of_life.cycles import CycleDetector, inject_patterns
+
+
+def _first_cycle(board: np.ndarray, generations: int, max_period: int = 16) -> tuple[int, int]:
+    """(generation, period) of the first detected cycle, (-1, -1) if none."""
+    detector = CycleDetector(max_period)
+    rows = pack(board)
+    for generation in range(generations):
+        rows = bitboard_step(rows, wrap=True)
+        if (period := detector.push(rows)) is not None:
+            return generation, period
+    return -1, -1
+
+
+_board = np.zeros((64, 64), dtype=bool)
+_board[10, 10:13] = True  # Blinker
+assert _first_cycle(_board, 10) == (2, 2)
+
+_board[30:32, 30:32] = True  # + block: still period 2
+assert _first_cycle(_board, 10) == (2, 2)
+
+_board = np.zeros((64, 64), dtype=bool)
+_board[10:12, 40:42] = True  # Block alone: still life
+assert _first_cycle(_board, 10) == (1, 1)
+
+_board[[0, 1, 2, 2, 2], [1, 2, 0, 1, 2]] = True  # + glider: cycles every 256 generations on a 64x64 torus
+assert _first_cycle(_board, 300) == (-1, -1)
+assert _first_cycle(_board, 300, max_period=256) == (256, 256)
+
+# Injection only fills empty tiles
+_board = np.zeros((64, 64), dtype=bool)
+_board[:8, :] = True
+_injected = inject_patterns(_board, np.random.default_rng(0), max_tiles=100)
+assert _injected[:8].all() and _injected[8:].any()
+assert np.array_equal(inject_patterns(np.ones((64, 64), dtype=bool), np.random.default_rng(0)), np.ones((64, 64)))
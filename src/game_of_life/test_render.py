@@ -0,0 +1,24 @@
+import numpy as np
+
+from src.game_of_life.render import FrameRenderer
+
+
+def _reference_frame(cells: np.ndarray, lifespan: np.ndarray, states: int) -> np.ndarray:
+    """Colours as computed before the palette: fading from white with age, dying states fading out."""
+    rgb = np.zeros((*cells.shape, 3), dtype=np.uint8)
+    for channel, base in enumerate((9, 203, 156)):
+        rgb[..., channel] = np.maximum(255 - lifespan.astype(int), base) * (cells == 1)
+    dying = cells > 1
+    rgb[dying] = (np.array([9, 203, 156]) * ((states - cells[dying, None].astype(int)) / states)).astype(np.uint8)
+    return rgb
+
+
+_rng = np.random.default_rng(0)
+for _states in (2, 3, 8):
+    _renderer = FrameRenderer(_states)
+    for _ in range(3):
+        _cells = _rng.integers(0, _states, (64, 64)).astype(np.uint8)
+        _ages = (_rng.integers(0, 256, (64, 64)) * (_cells == 1)).astype(np.uint8)
+        _image = _renderer.render(_cells, _ages)
+        assert np.array_equal(np.asarray(_image), _reference_frame(_cells, _ages, _states))
+    assert _renderer.render(_cells, _ages) is _image  # Rendered in place
@@ -0,0 +1,41 @@
+import numpy as np
+
+from src.game_of_life.rules import CONWAY, RULES, Rule, RuleEngine, parse_rule, rule_table
+
+assert parse_rule("B3/S23") == parse_rule("23/3") == parse_rule("life") == CONWAY
+assert parse_rule("b36/s23") == RULES["highlife"]
+assert parse_rule("B2/S/C3") == parse_rule("/2/3") == RULES["brians_brain"]
+assert parse_rule("B2/S345/4") == RULES["star_wars"]
+assert str(RULES["star_wars"]) == "B2/S345/C4"
+for _invalid in ("B9/S23", "S23", "B3/S23/C1", "conway"):
+    try:
+        parse_rule(_invalid)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError(f"{_invalid!r} should not parse")
+
+# Lookup table engine matches the bitboard engine (itself checked against a reference step), bounded and wrapped
+_rng = np.random.default_rng(0)
+for _wrap in (False, True):
+    _table_engine = RuleEngine(CONWAY, 64, 64, wrap=_wrap, use_bitboard=False)
+    _bitboard_engine = RuleEngine(CONWAY, 64, 64, wrap=_wrap)
+    _cells = (_rng.random((64, 64)) < 0.3).astype(np.uint8)
+    for _ in range(20):
+        _next = _table_engine.step(_cells)
+        assert np.array_equal(_next, _bitboard_engine.step(_cells))
+        _cells = _next
+
+# Generations: alive cells not surviving go through the dying states
+assert rule_table(RULES["star_wars"])[1].tolist() == [2, 2, 2, 1, 1, 1, 2, 2, 2]
+assert rule_table(RULES["star_wars"])[2:, 0].tolist() == [3, 0]
+_cells = np.zeros((5, 5), dtype=np.uint8)
+_cells[2, 1:3] = 1
+_engine = RuleEngine(RULES["brians_brain"], 5, 5)
+_cells = _engine.step(_cells)
+assert _cells[2, 1:3].tolist() == [2, 2] and _cells[1, 1:3].tolist() == [1, 1] and _cells[3, 1:3].tolist() == [1, 1]
+assert _engine.step(_cells)[2, 1:3].tolist() == [0, 0]
+
+# Rule on a board wider than a bitboard
+_cells = (_rng.random((8, 100)) < 0.3).astype(np.uint8)
+assert RuleEngine(Rule(frozenset({3}), frozenset({2, 3})), 8, 100).step(_cells).shape == (8, 100)
@@ -0,0 +1,54 @@
+import numpy as np
+
+from src.game_of_life.rules import ALIVE, CONWAY, RULES, RuleEngine
+from src.game_of_life.world import DenseWorld, TiledWorld
+
+# Tiled world matches the dense engine, bounded and wrapped, across tile borders
+_rng = np.random.default_rng(0)
+for _rule in (CONWAY, RULES["star_wars"]):
+    for _wrap in (False, True):
+        _world = TiledWorld(128, 192, _rule, wrap=_wrap)
+        _engine = RuleEngine(_rule, 128, 192, wrap=_wrap)
+        _cells = np.zeros((128, 192), dtype=np.uint8)
+        _cells[40:90, 50:150] = _rng.random((50, 100)) < 0.3
+        _world.set_cells(0, 0, _cells)
+        for _generation in range(30):
+            _cells = _engine.step(_cells)
+            _world.step()
+            assert np.array_equal(_world.window(0, 0, 128, 192)[0], _cells), f"{_rule} {_wrap=}: diverged"
+        assert _world.population == np.count_nonzero(_cells == ALIVE)
+
+# Empty tiles are not stored
+_world = TiledWorld(1024, 1024, CONWAY)
+_world.set_cells(500, 500, np.ones((1, 3), dtype=np.uint8))  # Blinker
+_world.step()
+assert set(_world.tiles) == {(7, 7)} and _world.population == 3
+assert _world.window(499, 501, 3, 1)[0].ravel().tolist() == [1, 1, 1]
+_world.step()
+assert _world.window(500, 500, 1, 3)[1].ravel().tolist() == [1, 2, 1]  # Ages
+
+# Densest window
+_world.set_cells(100, 900, np.ones((20, 20), dtype=np.uint8))
+assert _world.densest_window(64, 64) in {(y, x) for y in (48, 64, 80, 96) for x in (848, 864, 880, 896)}
+_world = TiledWorld(256, 256, CONWAY, wrap=True)
+_world.set_cells(250, 250, np.ones((12, 12), dtype=np.uint8))
+assert _world.densest_window(64, 64) in {(y, x) for y in (192, 208, 224, 240) for x in (192, 208, 224, 240)}
+
+try:
+    TiledWorld(128, 128, RULES["replicator"]._replace(birth=frozenset({0, 1})))
+except ValueError:
+    pass
+else:
+    raise AssertionError("B0 rules should be rejected")
+
+# Dense world matches the tiled one
+for _wrap in (False, True):
+    _dense, _tiled = DenseWorld(64, 64, CONWAY, wrap=_wrap), TiledWorld(64, 64, CONWAY, wrap=_wrap)
+    _seed = (_rng.random((40, 40)) < 0.3).astype(np.uint8)
+    _dense.set_cells(40, 40, _seed)  # Clipped or wrapped around
+    _tiled.set_cells(40, 40, _seed)
+    for _ in range(10):
+        _dense.step()
+        _tiled.step()
+        for _window in ((0, 0, 64, 64), (-10, 50, 64, 64)):
+            assert all(np.array_equal(a, b) for a, b in zip(_dense.window(*_window), _tiled.window(*_window)))
@@ -0,0 +1,273 @@
+"""Life-like worlds: dense for the panel size, or much larger than the panel and stored as a sparse set of tiles.
+
+In a tiled world, only tiles holding cells are stored, and only those and their neighbours are stepped: memory and CPU
+scale with the live area rather than the world size.
+"""
+
+from collections.abc import Iterator
+from typing import Optional, Union
+
+import numpy as np
+
+from src.game_of_life.rules import ALIVE, Rule, RuleEngine, rule_table, sum_neighbours
+
+TILE_SIZE = 64
+DENSITY_BLOCK = 16  # Resolution of the live cells density map, in cells
+
+TileKey = tuple[int, int]  # tile_y, tile_x
+Slices = tuple[slice, slice]  # Rows, columns
+
+_NEIGHBOUR_OFFSETS = [(dy, dx) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dy or dx]
+# Offset of the neighbour tile -> its cells bordering the tile, and where they go in the padded tile
+_BORDER_SOURCE = {-1: slice(-1, None), 0: slice(None), 1: slice(0, 1)}
+_BORDER_DEST = {-1: slice(0, 1), 0: slice(1, -1), 1: slice(-1, None)}
+
+
+def _next_ages(ages: np.ndarray, cells: np.ndarray) -> np.ndarray:
+    """Ages of the cells of the next generation, saturating at 255."""
+    return (np.minimum(ages, 254) + 1) * (cells == ALIVE)
+
+
+class DenseWorld:
+    """(height, width) world in a single array, stepped by a `RuleEngine` (with bitboards for Conway's rule)."""
+
+    def __init__(self, height: int, width: int, rule: Rule, wrap: bool = False) -> None:
+        self.height = height
+        self.width = width
+        self.rule = rule
+        self.wrap = wrap
+        self.engine = RuleEngine(rule, height, width, wrap=wrap)
+        self.cells = np.zeros((height, width), dtype=np.uint8)
+        self.ages = np.zeros((height, width), dtype=np.uint8)
+
+    @property
+    def population(self) -> int:
+        return int(np.count_nonzero(self.cells == ALIVE))
+
+    def state_hash(self) -> int:
+        return hash(self.cells.tobytes())
+
+    def clear(self) -> None:
+        self.cells[:] = 0
+        self.ages[:] = 0
+
+    def _wrapped_indices(self, y: int, x: int, height: int, width: int) -> tuple[np.ndarray, ...]:
+        return np.ix_(np.arange(y, y + height) % self.height, np.arange(x, x + width) % self.width)
+
+    def _clipped_slices(self, y: int, x: int, height: int, width: int) -> Optional[tuple[Slices, Slices]]:
+        """Part of a window inside the world: (rows, columns) in the world, (rows, columns) in the window."""
+        y0, y1 = max(y, 0), min(y + height, self.height)
+        x0, x1 = max(x, 0), min(x + width, self.width)
+        if y0 >= y1 or x0 >= x1:
+            return None
+        return (slice(y0, y1), slice(x0, x1)), (slice(y0 - y, y1 - y), slice(x0 - x, x1 - x))
+
+    def set_cells(self, y: int, x: int, cells: np.ndarray) -> None:
+        """Write a block of cell states at (y, x), new alive cells having age 0."""
+        in_world: Union[tuple[np.ndarray, ...], Slices]
+        in_block: Slices
+        if self.wrap:
+            in_world, in_block = self._wrapped_indices(y, x, *cells.shape), (slice(None), slice(None))
+        elif slices := self._clipped_slices(y, x, *cells.shape):
+            in_world, in_block = slices
+        else:
+            return
+        self.cells[in_world] = cells[in_block]
+        self.ages[in_world] *= cells[in_block] == ALIVE
+
+    def window(self, y: int, x: int, height: int, width: int) -> tuple[np.ndarray, np.ndarray]:
+        """Cell states and ages of a (height, width) window at (y, x)."""
+        if (y, x, height, width) == (0, 0, self.height, self.width):
+            return self.cells, self.ages
+        if self.wrap:
+            indices = self._wrapped_indices(y, x, height, width)
+            return self.cells[indices], self.ages[indices]
+
+        cells = np.zeros((height, width), dtype=np.uint8)
+        ages = np.zeros((height, width), dtype=np.uint8)
+        if slices := self._clipped_slices(y, x, height, width):
+            in_world, in_window = slices
+            cells[in_window] = self.cells[in_world]
+            ages[in_window] = self.ages[in_world]
+        return cells, ages
+
+    def step(self) -> None:
+        self.cells = self.engine.step(self.cells)
+        self.ages = _next_ages(self.ages, self.cells)
+
+    def densest_window(self, height: int, width: int) -> Optional[tuple[int, int]]:
+        return None  # The panel shows most of it anyway
+
+
+class TiledWorld:
+    """(height, width) world of uint8 cell states stepped with a rule, by (TILE_SIZE, TILE_SIZE) tiles.
+
+    Each tile is stepped with the rule table like `RuleEngine`, its neighbour counts computed with a one cell border
+    taken from the neighbour tiles. The age of alive cells is kept along the cells, saturating at 255.
+    """
+
+    def __init__(self, height: int, width: int, rule: Rule, wrap: bool = False, tile_size: int = TILE_SIZE) -> None:
+        if 0 in rule.birth:
+            raise ValueError(f"{rule} turns empty space alive: it cannot be simulated on a sparse world")
+        if height % tile_size or width % tile_size:
+            raise ValueError(f"World size must be a multiple of {tile_size}")
+        self.height = height
+        self.width = width
+        self.rule = rule
+        self.wrap = wrap
+        self.tile_size = tile_size
+        self.tiles_y = height // tile_size
+        self.tiles_x = width // tile_size
+        self.table = rule_table(rule)
+        self.tiles = dict[TileKey, np.ndarray]()
+        self.ages = dict[TileKey, np.ndarray]()
+        self._empty_tile = np.zeros((tile_size, tile_size), dtype=np.uint8)
+        self._padded = np.zeros((tile_size + 2, tile_size + 2), dtype=np.uint8)
+        self._counts = np.zeros((tile_size, tile_size), dtype=np.uint8)
+
+    def _key(self, tile_y: int, tile_x: int) -> Optional[TileKey]:
+        if self.wrap:
+            return tile_y % self.tiles_y, tile_x % self.tiles_x
+        if 0 <= tile_y < self.tiles_y and 0 <= tile_x < self.tiles_x:
+            return tile_y, tile_x
+        return None
+
+    def _overlapping_tiles(self, y: int, x: int, height: int, width: int) -> Iterator[tuple[TileKey, Slices, Slices]]:
+        """Tiles overlapping a window of the world: key, (rows, columns) in the tile, (rows, columns) in the window."""
+        size = self.tile_size
+        for tile_y in range(y // size, (y + height - 1) // size + 1):
+            for tile_x in range(x // size, (x + width - 1) // size + 1):
+                if (key := self._key(tile_y, tile_x)) is None:
+                    continue
+                y0, y1 = max(y, tile_y * size), min(y + height, (tile_y + 1) * size)
+                x0, x1 = max(x, tile_x * size), min(x + width, (tile_x + 1) * size)
+                in_tile = slice(y0 - tile_y * size, y1 - tile_y * size), slice(x0 - tile_x * size, x1 - tile_x * size)
+                in_window = slice(y0 - y, y1 - y), slice(x0 - x, x1 - x)
+                yield key, in_tile, in_window
+
+    @property
+    def population(self) -> int:
+        return sum(int(np.count_nonzero(tile == ALIVE)) for tile in self.tiles.values())
+
+    def state_hash(self) -> int:
+        return hash(tuple(sorted((key, tile.tobytes()) for key, tile in self.tiles.items())))
+
+    def clear(self) -> None:
+        self.tiles.clear()
+        self.ages.clear()
+
+    def set_cells(self, y: int, x: int, cells: np.ndarray) -> None:
+        """Write a block of cell states at (y, x), new alive cells having age 0."""
+        for key, in_tile, in_window in self._overlapping_tiles(y, x, *cells.shape):
+            tile = self.tiles.setdefault(key, np.zeros_like(self._empty_tile))
+            ages = self.ages.setdefault(key, np.zeros_like(self._empty_tile))
+            tile[in_tile] = cells[in_window]
+            ages[in_tile] *= tile[in_tile] == ALIVE
+
+    def window(self, y: int, x: int, height: int, width: int) -> tuple[np.ndarray, np.ndarray]:
+        """Cell states and ages of a (height, width) window at (y, x): only the tiles it overlaps are read."""
+        cells = np.zeros((height, width), dtype=np.uint8)
+        ages = np.zeros((height, width), dtype=np.uint8)
+        for key, in_tile, in_window in self._overlapping_tiles(y, x, height, width):
+            if key in self.tiles:
+                cells[in_window] = self.tiles[key][in_tile]
+                ages[in_window] = self.ages[key][in_tile]
+        return cells, ages
+
+    def _pad(self, key: TileKey) -> np.ndarray:
+        """Alive cells of the tile, with a one cell border from its neighbours."""
+        padded = self._padded
+        tile_y, tile_x = key
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                neighbour = self._key(tile_y + dy, tile_x + dx)
+                dest = padded[_BORDER_DEST[dy], _BORDER_DEST[dx]]
+                if neighbour in self.tiles:
+                    border = self.tiles[neighbour][_BORDER_SOURCE[dy], _BORDER_SOURCE[dx]]
+                    np.equal(border, ALIVE, out=dest, casting="unsafe")
+                else:
+                    dest[:] = 0
+        return padded
+
+    def step(self) -> None:
+        candidates = set(self.tiles)
+        for tile_y, tile_x in self.tiles:
+            candidates.update(filter(None, (self._key(tile_y + dy, tile_x + dx) for dy, dx in _NEIGHBOUR_OFFSETS)))
+
+        tiles = dict[TileKey, np.ndarray]()
+        ages = dict[TileKey, np.ndarray]()
+        for key in candidates:
+            padded = self._pad(key)
+            tile = self.tiles.get(key)
+            if tile is None:
+                if not padded.any():  # Nothing alive around: stays empty
+                    continue
+                tile = self._empty_tile
+
+            new_tile = self.table[tile, sum_neighbours(padded, out=self._counts)]
+            if not new_tile.any():
+                continue
+            tiles[key] = new_tile
+            ages[key] = _next_ages(self.ages.get(key, self._empty_tile), new_tile)
+
+        self.tiles = tiles
+        self.ages = ages
+
+    def densest_window(self, height: int, width: int, block: int = DENSITY_BLOCK) -> Optional[tuple[int, int]]:
+        """Top-left (y, x) of the (height, width) window with the most alive cells, to `block` cells precision."""
+        if not self.tiles:
+            return None
+
+        # Alive cells per (block, block) block of the world
+        blocks_per_tile = self.tile_size // block
+        density = np.zeros((self.height // block, self.width // block), dtype=np.int32)
+        for (tile_y, tile_x), tile in self.tiles.items():
+            alive = (tile == ALIVE).reshape(blocks_per_tile, block, blocks_per_tile, block).sum(axis=(1, 3))
+            density[
+                tile_y * blocks_per_tile : (tile_y + 1) * blocks_per_tile,
+                tile_x * blocks_per_tile : (tile_x + 1) * blocks_per_tile,
+            ] = alive
+
+        # Sums over every window position from the summed-area table
+        window_h, window_w = height // block, width // block
+        if self.wrap:
+            density = np.pad(density, ((0, window_h - 1), (0, window_w - 1)), mode="wrap")
+        table = np.pad(density.cumsum(axis=0).cumsum(axis=1), ((1, 0), (1, 0)))
+        sums = table[window_h:, window_w:] - table[:-window_h, window_w:] - table[window_h:, :-window_w]
+        sums += table[:-window_h, :-window_w]
+        block_y, block_x = np.unravel_index(np.argmax(sums), sums.shape)
+        return int(block_y) * block, int(block_x) * block
+
+
+World = Union[DenseWorld, TiledWorld]
+
+
+class Camera:
+    """Viewport position over a world, panning smoothly toward a target."""
+
+    def __init__(self, world: World, size: int, speed: float = 0.1, max_step: float = 2) -> None:
+        self.world = world
+        self.size = size
+        self.speed = speed
+        self.max_step = max_step
+        self.y = (world.height - size) / 2
+        self.x = (world.width - size) / 2
+
+    def _move_axis(self, position: float, target: float, world_size: int) -> float:
+        delta = target - position
+        if self.world.wrap:  # Shortest way around
+            delta = (delta + world_size / 2) % world_size - world_size / 2
+        position += float(np.clip(delta * self.speed, -self.max_step, self.max_step))
+        if self.world.wrap:
+            return position % world_size
+        return min(max(position, 0), world_size - self.size)
+
+    def follow(self, target: Optional[tuple[int, int]]) -> None:
+        if target is None:
+            return
+        self.y = self._move_axis(self.y, target[0], self.world.height)
+        self.x = self._move_axis(self.x, target[1], self.world.width)
+
+    def view(self) -> tuple[np.ndarray, np.ndarray]:
+        """Cell states and ages under the viewport."""
+        return self.world.window(round(self.y), round(self.x), self.size, self.size)
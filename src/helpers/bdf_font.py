@@ -0,0 +1,73 @@
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+FONTS_DIR = Path(__file__).parent.parent.parent / "fonts"
+
+
+class Glyph(NamedTuple):
+    advance: int
+    x_offset: int
+    y_offset: int
+    bitmap: np.ndarray  # (height, width) bool
+
+
+class BdfFont(NamedTuple):
+    glyphs: dict[str, Glyph]
+    x_offset: int  # Of the FONTBOUNDINGBOX, where the graphics start drawing each line
+    y_offset: int
+
+
+def _parse_glyph(lines: list[str]) -> tuple[int, Glyph]:
+    fields = {line.split(" ", 1)[0]: line.split()[1:] for line in lines}
+    width, height, x_offset, y_offset = map(int, fields["BBX"])
+    bitmap_start = lines.index("BITMAP") + 1
+    rows = [int(row, 16) for row in lines[bitmap_start : bitmap_start + height]]
+    n_bits = 8 * ((width + 7) // 8)
+    bits = (np.array(rows, dtype=np.uint32)[:, None] >> np.arange(n_bits - 1, -1, -1)) & 1
+    glyph = Glyph(int(fields["DWIDTH"][0]), x_offset, y_offset, bits[:, :width].astype(bool))
+    return int(fields["ENCODING"][0]), glyph
+
+
+@lru_cache
+def load_font(name: str = "5x7.bdf") -> BdfFont:
+    """BDF font from the fonts directory or a path to the file."""
+    path = Path(name) if Path(name).is_file() else FONTS_DIR / name
+    glyphs = dict[str, Glyph]()
+    char_lines = list[str]()
+    x_offset = y_offset = 0
+    for line in path.read_text().splitlines():
+        if line.startswith("FONTBOUNDINGBOX"):
+            x_offset, y_offset = map(int, line.split()[3:5])
+        elif line.startswith("STARTCHAR"):
+            char_lines = []
+        elif line == "ENDCHAR":
+            encoding, glyph = _parse_glyph(char_lines)
+            if encoding >= 0:
+                glyphs[chr(encoding)] = glyph
+        else:
+            char_lines.append(line)
+    return BdfFont(glyphs, x_offset, y_offset)
+
+
+def draw_text(frame: np.ndarray, font: BdfFont, x: int, y: int, color: tuple[int, int, int], text: str) -> int:
+    """Draw text on a (height, width, 3) frame like `graphics.DrawText` (y is the baseline), return its width.
+
+    Like the graphics, `x` is the left of the font's bounding box, not the origin of the glyphs: these are shifted by
+    the box's x offset. Vertically, it cancels out and only the glyphs' own offsets place them.
+    """
+    frame_height, frame_width = frame.shape[:2]
+    start_x = x
+    for char in text:
+        if (glyph := font.glyphs.get(char)) is None:
+            continue
+        height, width = glyph.bitmap.shape
+        top, left = y - height - glyph.y_offset, x + glyph.x_offset - font.x_offset
+        y0, x0 = max(top, 0), max(left, 0)
+        y1, x1 = min(top + height, frame_height), min(left + width, frame_width)
+        if y0 < y1 and x0 < x1:
+            frame[y0:y1, x0:x1][glyph.bitmap[y0 - top : y1 - top, x0 - left : x1 - left]] = color
+        x += glyph.advance
+    return x - start_x
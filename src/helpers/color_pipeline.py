@@ -0,0 +1,116 @@
+import datetime
+import os
+import time
+from typing import Optional
+
+import numpy as np
+
+_CHANNELS = np.arange(3)
+SCHEDULE_REFRESH_S = 30
+
+# Time of day -> max brightness from that time on
+NIGHT_MODE_SCHEDULE = {
+    datetime.time(7): 100,
+    datetime.time(22): 20,
+}
+
+
+class ColorPipeline:
+    """Colour correction applied between scripts and the panel.
+
+    Gamma, brightness and the time-of-day schedule are folded into a single 256-entry LUT per channel, rebuilt only
+    when a setting changes: correcting a frame is always one NumPy indexing, whatever the brightness. `version` changes
+    with the LUT, so frames already shown can be corrected again.
+    """
+
+    def __init__(
+        self,
+        gamma: float = 1.0,
+        brightness: int = 100,
+        schedule: Optional[dict[datetime.time, int]] = None,
+    ) -> None:
+        self._gamma = gamma
+        self._brightness = brightness
+        self._schedule = schedule or {}
+        self._effective_brightness = -1
+        self._checked_at = float(-SCHEDULE_REFRESH_S)
+        self.lut = np.empty((256, 3), dtype=np.uint8)
+        self._version = 0
+        self.is_identity = True
+        self._refresh(force=True)
+
+    @property
+    def gamma(self) -> float:
+        return self._gamma
+
+    @gamma.setter
+    def gamma(self, value: float) -> None:
+        self._gamma = value
+        self._refresh(force=True)
+
+    @property
+    def brightness(self) -> int:
+        return self._brightness
+
+    @brightness.setter
+    def brightness(self, value: int) -> None:
+        self._brightness = max(0, min(100, value))
+        self._refresh(force=True)
+
+    @property
+    def schedule(self) -> dict[datetime.time, int]:
+        return self._schedule
+
+    @schedule.setter
+    def schedule(self, value: Optional[dict[datetime.time, int]]) -> None:
+        self._schedule = value or {}
+        self._refresh(force=True)
+
+    @property
+    def effective_brightness(self) -> int:
+        self._refresh()
+        return self._effective_brightness
+
+    @property
+    def version(self) -> int:
+        self._refresh()
+        return self._version
+
+    def _scheduled_brightness(self) -> int:
+        if not self._schedule:
+            return 100
+        now = datetime.datetime.now().time()
+        # Last schedule entry started before now, or the last one of the day (still running since yesterday)
+        starts = sorted(self._schedule)
+        current = max((start for start in starts if start <= now), default=starts[-1])
+        return self._schedule[current]
+
+    def _refresh(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._checked_at < SCHEDULE_REFRESH_S:
+            return
+        self._checked_at = now
+
+        brightness = min(self._brightness, self._scheduled_brightness())
+        if not force and brightness == self._effective_brightness:
+            return
+        self._effective_brightness = brightness
+
+        values = np.arange(256) / 255
+        table = np.round(255 * values**self._gamma * brightness / 100).astype(np.uint8)
+        self.lut[:] = table[:, None]
+        self._version += 1
+        self.is_identity = self._gamma == 1.0 and brightness == 100
+
+    def apply(self, frame: np.ndarray) -> np.ndarray:
+        """Correct a (height, width, 3) uint8 frame."""
+        self._refresh()
+        if self.is_identity:
+            return frame
+        return self.lut[frame, _CHANNELS]
+
+
+COLOR_PIPELINE = ColorPipeline(
+    gamma=float(os.getenv("GAMMA", "1.0")),
+    schedule=NIGHT_MODE_SCHEDULE if os.getenv("NIGHT_MODE", "0") == "1" else None,
+)
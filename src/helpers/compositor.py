@@ -0,0 +1,99 @@
+import enum
+from collections.abc import Iterable
+from typing import Optional, Union
+
+import numpy as np
+from PIL import Image
+
+from src.helpers.napta_colors import NaptaColor
+from src.napta_matrix import MATRIX_SIZE
+
+
+class Layer(enum.IntEnum):
+    BACKGROUND = 0
+    PLAYFIELD = enum.auto()
+    SPRITES = enum.auto()
+    HUD = enum.auto()
+
+
+Rect = tuple[int, int, int, int]  # x0, y0, x1, y1 (end excluded)
+Color = Union[NaptaColor, tuple[int, int, int]]
+
+
+class Compositor:
+    """Ordered layers composited into the output frame, only over the regions that changed.
+
+    Each layer is a uint8 colour array with a mask, the visible colour of a pixel being the one of the top-most layer
+    masking it: what lies under a moving sprite is read from the arrays instead of being tracked by each script.
+    """
+
+    def __init__(self, width: int = MATRIX_SIZE, height: int = MATRIX_SIZE) -> None:
+        self.width = width
+        self.height = height
+        self.colors = np.zeros((len(Layer), height, width, 3), dtype=np.uint8)
+        self.masks = np.zeros((len(Layer), height, width), dtype=bool)
+        self.frame = np.zeros((height, width, 3), dtype=np.uint8)
+        self._dirty = list[Rect]()
+
+    def _mark_dirty(self, rect: Rect) -> None:
+        x0, y0, x1, y1 = rect
+        for i, (dx0, dy0, dx1, dy1) in enumerate(self._dirty):
+            if x0 <= dx1 and dx0 <= x1 and y0 <= dy1 and dy0 <= y1:  # Touching: merge both
+                self._dirty.pop(i)
+                self._mark_dirty((min(x0, dx0), min(y0, dy0), max(x1, dx1), max(y1, dy1)))
+                return
+        self._dirty.append(rect)
+
+    def _points_to_indices(self, points: Iterable[tuple[int, int]]) -> Optional[tuple[np.ndarray, np.ndarray]]:
+        coords = np.array(list(points), dtype=np.intp).reshape(-1, 2)
+        xs, ys = coords[:, 0], coords[:, 1]
+        inside = (0 <= xs) & (xs < self.width) & (0 <= ys) & (ys < self.height)  # Ignore the others, like `SetPixel`
+        if not inside.any():
+            return None
+        xs, ys = xs[inside], ys[inside]
+        self._mark_dirty((int(xs.min()), int(ys.min()), int(xs.max()) + 1, int(ys.max()) + 1))
+        return ys, xs
+
+    def draw_points(self, layer: Layer, points: Iterable[tuple[int, int]], color: Color) -> None:
+        if indices := self._points_to_indices(points):
+            self.colors[layer][indices] = color
+            self.masks[layer][indices] = True
+
+    def erase_points(self, layer: Layer, points: Iterable[tuple[int, int]]) -> None:
+        if indices := self._points_to_indices(points):
+            self.masks[layer][indices] = False
+
+    def draw_array(self, layer: Layer, x: int, y: int, colors: np.ndarray, mask: np.ndarray) -> None:
+        """Replace a (height, width) block of the layer, pixels outside `mask` becoming transparent."""
+        height, width = mask.shape
+        self.colors[layer, y : y + height, x : x + width] = colors
+        self.masks[layer, y : y + height, x : x + width] = mask
+        self._mark_dirty((x, y, x + width, y + height))
+
+    def clear(self, layer: Layer) -> None:
+        self.masks[layer] = False
+        self._mark_dirty((0, 0, self.width, self.height))
+
+    def _composite(self, rect: Rect) -> None:
+        x0, y0, x1, y1 = rect
+        masks = self.masks[:, y0:y1, x0:x1]
+        top = len(Layer) - 1 - np.argmax(masks[::-1], axis=0)
+        colors = np.take_along_axis(self.colors[:, y0:y1, x0:x1], top[None, ..., None], axis=0)[0]
+        self.frame[y0:y1, x0:x1] = np.where(masks.any(axis=0)[..., None], colors, 0)
+
+    def _composite_dirty(self) -> list[Rect]:
+        dirty = self._dirty
+        self._dirty = []
+        for rect in dirty:
+            self._composite(rect)
+        return dirty
+
+    def composite(self) -> np.ndarray:
+        """Composite the dirty regions without drawing them, return the full frame (e.g. to transition to it)."""
+        self._composite_dirty()
+        return self.frame
+
+    def render(self, canvas) -> None:
+        """Composite the dirty regions and write each of them to the canvas as a single image."""
+        for x0, y0, x1, y1 in self._composite_dirty():
+            canvas.SetImage(Image.fromarray(self.frame[y0:y1, x0:x1], "RGB"), x0, y0)
@@ -0,0 +1,40 @@
+import asyncio
+import time
+from collections.abc import Iterable
+from typing import Any
+
+import numpy as np
+from PIL import Image
+
+DEFAULT_FPS = 30
+
+_offscreen_canvases = dict[int, Any]()  # id(matrix) -> canvas to draw the next frame on
+
+
+def show_frame(matrix: Any, frame: np.ndarray) -> None:
+    """Display a full (height, width, 3) uint8 frame, double-buffered.
+
+    The offscreen canvas is reused from one call to the next: frames do not allocate canvases.
+    """
+    canvas = _offscreen_canvases.get(id(matrix)) or matrix.CreateFrameCanvas()
+    canvas.SetImage(Image.fromarray(frame, "RGB"), 0, 0)
+    _offscreen_canvases[id(matrix)] = matrix.SwapOnVSync(canvas)
+
+
+async def play_frames(matrix: Any, frames: Iterable[np.ndarray], fps: float = DEFAULT_FPS) -> None:
+    """Stream frames to the matrix at a fixed rate, dropping frames when running late."""
+    frame_duration = 1 / fps
+    deadline = time.monotonic()
+    last_frame = None
+    for frame in frames:
+        deadline += frame_duration
+        last_frame = frame
+        if time.monotonic() > deadline:
+            continue  # Late: skip this one, the next frame is due already
+
+        show_frame(matrix, frame)
+        last_frame = None
+        await asyncio.sleep(max(0, deadline - time.monotonic()))
+
+    if last_frame is not None:  # Always end on the last frame
+        show_frame(matrix, last_frame)
@@ -1,19 +1,33 @@
 import itertools
-from pathlib import Path
+from typing import Optional
 
+import numpy as np
+
+from src.helpers.bdf_font import draw_text, load_font
+from src.helpers.frame_scheduler import show_frame
 from src.helpers.napta_colors import NaptaColor
-from src.napta_matrix import RGBMatrix, graphics
+from src.helpers.transitions import play_transition
+from src.napta_matrix import MATRIX_SIZE, RGBMatrix
 
 
-async def fullscreen_message(
-    matrix: RGBMatrix, lines: list[str], color: tuple[int, int, int] = NaptaColor.GORSE
-) -> None:
-    offscreen_canvas = matrix.CreateFrameCanvas()
+def message_frame(lines: list[str], color: tuple[int, int, int] = NaptaColor.GORSE) -> np.ndarray:
+    frame = np.zeros((MATRIX_SIZE, MATRIX_SIZE, 3), dtype=np.uint8)
+    font = load_font("5x7.bdf")
+    for line, y in zip(lines, itertools.count(10, 8)):
+        draw_text(frame, font, 2, y, color, line)
+    return frame
 
-    font = graphics.Font()
-    font_path = Path(__file__).parent.parent.parent / "fonts" / "5x7.bdf"
-    font.LoadFont(str(font_path.resolve()))
 
-    for line, y in zip(lines, itertools.count(10, 8)):
-        graphics.DrawText(offscreen_canvas, font, 2, y, graphics.Color(*color), line)
-    offscreen_canvas = matrix.SwapOnVSync(offscreen_canvas)
+async def fullscreen_message(
+    matrix: RGBMatrix,
+    lines: list[str],
+    color: tuple[int, int, int] = NaptaColor.GORSE,
+    transition_from: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Show the message, transitioning from `transition_from` if given. Return the displayed frame."""
+    frame = message_frame(lines, color)
+    if transition_from is None:
+        show_frame(matrix, frame)
+    else:
+        await play_transition(matrix, transition_from, frame)
+    return frame
@@ -0,0 +1,78 @@
+from collections.abc import Mapping
+from typing import NamedTuple
+
+import numpy as np
+
+from src.helpers.compositor import Color, Compositor, Layer
+from src.helpers.digits import DIGIT_PATTERNS
+from src.helpers.draw import pattern_to_points
+from src.napta_matrix import MATRIX_SIZE
+
+DIGIT_WIDTH = 4
+DIGIT_HEIGHT = 7
+DIGIT_STEP = 6  # Digit width + spacing
+
+
+def _digit_bitmap(pattern: str) -> np.ndarray:
+    bitmap = np.zeros((DIGIT_HEIGHT, DIGIT_WIDTH), dtype=bool)
+    for x, y in pattern_to_points(pattern):
+        bitmap[y, x] = True
+    return bitmap
+
+
+DIGIT_BITMAPS = {char: _digit_bitmap(pattern) for char, pattern in DIGIT_PATTERNS.items()}
+
+
+class ScoreAnchor(NamedTuple):
+    center_x: int
+    y: int
+
+
+TWO_PLAYER_LAYOUT = {
+    1: ScoreAnchor(MATRIX_SIZE // 4, 6),
+    2: ScoreAnchor(MATRIX_SIZE * 3 // 4, 6),
+}
+FOUR_PLAYER_LAYOUT = {
+    **TWO_PLAYER_LAYOUT,
+    3: ScoreAnchor(MATRIX_SIZE // 4, MATRIX_SIZE - 14),
+    4: ScoreAnchor(MATRIX_SIZE * 3 // 4, MATRIX_SIZE - 14),
+}
+
+
+class Scoreboard:
+    """Digit scores drawn from precomputed bitmaps on the HUD layer, only the digit cells that changed are redrawn."""
+
+    def __init__(
+        self,
+        compositor: Compositor,
+        colors: Mapping[int, Color],
+        layout: Mapping[int, ScoreAnchor],
+    ) -> None:
+        self.compositor = compositor
+        self.colors = colors
+        self.layout = layout
+        self._cells = {player: dict[int, str]() for player in layout}  # cell origin x -> drawn char
+
+    def _layout_cells(self, player: int, score: int) -> dict[int, str]:
+        text = str(score)
+        origin_x = self.layout[player].center_x - (DIGIT_STEP // 2) * len(text)
+        return {origin_x + DIGIT_STEP * i: char for i, char in enumerate(text)}
+
+    def set_score(self, player: int, score: int) -> None:
+        old_cells = self._cells[player]
+        new_cells = self._layout_cells(player, score)
+        changed = [x for x in old_cells.keys() | new_cells.keys() if old_cells.get(x) != new_cells.get(x)]
+        if not changed:
+            return
+
+        # Single write covering the changed cells (and the unchanged ones in between)
+        min_x, max_x = min(changed), max(changed) + DIGIT_WIDTH
+        mask = np.zeros((DIGIT_HEIGHT, max_x - min_x), dtype=bool)
+        for x, char in new_cells.items():
+            if min_x <= x < max_x:
+                mask[:, x - min_x : x - min_x + DIGIT_WIDTH] = DIGIT_BITMAPS[char]
+        colors = np.empty((*mask.shape, 3), dtype=np.uint8)
+        colors[:] = self.colors[player]
+
+        self.compositor.draw_array(Layer.HUD, min_x, self.layout[player].y, colors, mask)
+        self._cells[player] = new_cells
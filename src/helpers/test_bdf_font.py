@@ -0,0 +1,33 @@
+import warnings
+
+import numpy as np
+from RGBMatrixEmulator import graphics  # pyright: ignore[reportMissingTypeStubs]
+
+from src.helpers.bdf_font import FONTS_DIR, draw_text, load_font
+
+
+class _Canvas:
+    width, height = 256, 48
+
+    def __init__(self) -> None:
+        self.frame = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+
+    def SetPixel(self, x: int, y: int, red: int, green: int, blue: int) -> None:
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.frame[y, x] = red, green, blue
+
+
+# Every glyph of the repo's fonts lands where the graphics of the emulator draw it
+for path in sorted(FONTS_DIR.glob("*.bdf")):
+    font = load_font(path.name)
+    emulator_font = graphics.Font()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")  # The pokemon fonts have no replacement character
+        emulator_font.LoadFont(str(path))
+    chars = "".join(sorted(char for char in font.glyphs if char.isprintable() and font.glyphs[char].advance))
+    for start in range(0, len(chars), 8):
+        text = chars[start : start + 8]
+        expected, drawn = _Canvas(), _Canvas()
+        width = graphics.DrawText(expected, emulator_font, 3, 32, graphics.Color(255, 128, 0), text)
+        assert draw_text(drawn.frame, font, 3, 32, (255, 128, 0), text) == width
+        assert (drawn.frame == expected.frame).all(), f"{path.name}: {text!r} drawn differently"
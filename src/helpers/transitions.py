@@ -0,0 +1,101 @@
+from collections.abc import Callable, Iterator
+from functools import lru_cache
+from typing import Any, Literal
+
+import numpy as np
+
+from src.helpers.frame_scheduler import DEFAULT_FPS, play_frames
+
+TRANSITION_DURATION = 0.4
+DISSOLVE_SEED = 42
+
+Side = Literal["left", "right", "up", "down"]
+Transition = Callable[[np.ndarray, np.ndarray, np.ndarray], Iterator[np.ndarray]]
+
+
+@lru_cache(maxsize=32)
+def easing_curve(n_steps: int) -> np.ndarray:
+    """Ease-in-out (smoothstep) progress of each step, ending at 1."""
+    t = np.linspace(0, 1, n_steps + 1)[1:]
+    curve = t * t * (3 - 2 * t)
+    curve.flags.writeable = False
+    return curve
+
+
+@lru_cache(maxsize=4)
+def _dissolve_thresholds(height: int, width: int) -> np.ndarray:
+    """Progress at which each pixel switches, in (0, 1]: a fixed random order, the same for every dissolve."""
+    order = np.random.default_rng(DISSOLVE_SEED).permutation(height * width)
+    thresholds = ((order + 1) / (height * width)).reshape(height, width)
+    thresholds.flags.writeable = False
+    return thresholds
+
+
+def crossfade(before: np.ndarray, after: np.ndarray, progress: np.ndarray) -> Iterator[np.ndarray]:
+    """`before + (after - before) * weight / 256` in int32: |delta * weight| <= 255 * 256 does not overflow."""
+    start = before.astype(np.int32)
+    delta = after.astype(np.int32) - start
+    frame = np.empty_like(before)
+    for weight in np.round(progress * 256).astype(np.int32):
+        # Between `before` and `after` for weights in [0, 256], so within uint8: the cast does not wrap
+        np.add(start, (delta * weight) >> 8, out=frame, casting="unsafe")
+        yield frame
+
+
+def dissolve(before: np.ndarray, after: np.ndarray, progress: np.ndarray) -> Iterator[np.ndarray]:
+    thresholds = _dissolve_thresholds(*before.shape[:2])
+    frame = before.copy()
+    for p in progress:
+        np.copyto(frame, after, where=(thresholds <= p)[..., None])
+        yield frame
+
+
+def wipe(before: np.ndarray, after: np.ndarray, progress: np.ndarray, side: Side = "left") -> Iterator[np.ndarray]:
+    """`after` is revealed from `side`."""
+    height, width = before.shape[:2]
+    frame = before.copy()
+    for p in progress:
+        if side in ("left", "right"):
+            n = int(round(p * width))
+            cols = np.s_[:, :n] if side == "left" else np.s_[:, width - n :]
+            frame[cols] = after[cols]
+        else:
+            n = int(round(p * height))
+            rows = np.s_[:n] if side == "up" else np.s_[height - n :]
+            frame[rows] = after[rows]
+        yield frame
+
+
+def slide(before: np.ndarray, after: np.ndarray, progress: np.ndarray, side: Side = "right") -> Iterator[np.ndarray]:
+    """`after` comes in from `side`, pushing `before` out. Frames are views in the stacked pair: no copy."""
+    axis = 1 if side in ("left", "right") else 0
+    size = before.shape[axis]
+    comes_after = side in ("right", "down")
+    stacked = np.concatenate((before, after) if comes_after else (after, before), axis=axis)
+    for p in progress:
+        n = int(round(p * size))
+        offset = n if comes_after else size - n
+        yield stacked[:, offset : offset + size] if axis == 1 else stacked[offset : offset + size]
+
+
+TRANSITIONS: dict[str, Transition] = {
+    "crossfade": crossfade,
+    "dissolve": dissolve,
+    "wipe": wipe,
+    "slide": slide,
+}
+
+
+async def play_transition(
+    matrix: Any,
+    before: np.ndarray,
+    after: np.ndarray,
+    transition: Transition = crossfade,
+    duration: float = TRANSITION_DURATION,
+    fps: float = DEFAULT_FPS,
+) -> None:
+    """Stream a transition between two (height, width, 3) uint8 frames, ending on `after`."""
+    if np.array_equal(before, after):
+        return
+    progress = easing_curve(max(1, round(duration * fps)))
+    await play_frames(matrix, transition(before, after, progress), fps=fps)
@@ -3,13 +3,18 @@ import logging
 import os
 from collections.abc import Callable, Coroutine
 from functools import lru_cache, wraps
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, cast
 
+import numpy as np
+from PIL import Image
 from typing_extensions import Concatenate, ParamSpec
 
+from src.helpers.bdf_font import BdfFont, draw_text, load_font
+from src.helpers.color_pipeline import COLOR_PIPELINE
 from src.helpers.napta_colors import NaptaColor
 
 MATRIX_SIZE = 64
+FLUSH_FPS = 60  # Rate at which drawing on the matrix itself reaches the panel
 
 
 def is_raspberry() -> bool:
@@ -18,13 +23,14 @@ def is_raspberry() -> bool:
 
 
 if is_raspberry() and not TYPE_CHECKING:
-    from rgbmatrix import RGBMatrix, RGBMatrixOptions, graphics
+    from rgbmatrix import RGBMatrix, RGBMatrixOptions
+    from rgbmatrix import graphics as _graphics
 else:
     from RGBMatrixEmulator import (
         RGBMatrix,
         RGBMatrixOptions,
-        graphics,
     )  # pyright: ignore[reportMissingTypeStubs]
+    from RGBMatrixEmulator import graphics as _graphics  # pyright: ignore[reportMissingTypeStubs]
 
 
 _P = ParamSpec("_P")
@@ -42,6 +48,161 @@ def _get_matrix() -> RGBMatrix:
     return RGBMatrix(options=options)
 
 
+class _PipelineCanvas:
+    """Canvas proxy drawing in `frame`, before colour correction, and showing it corrected all at once.
+
+    Everything drawn on it, `graphics` included, goes to `frame`: transitions can start from it. `flush` corrects the
+    frame with the colour pipeline, one LUT indexing for the whole frame, and sends it to the canvas underneath.
+    """
+
+    def __init__(self, target: Any) -> None:
+        self._target = target
+        self.frame = np.zeros((MATRIX_SIZE, MATRIX_SIZE, 3), dtype=np.uint8)
+        self.dirty = False  # Drawn on since the last flush
+
+    def SetPixel(self, x: int, y: int, r: int, g: int, b: int) -> None:
+        if 0 <= x < MATRIX_SIZE and 0 <= y < MATRIX_SIZE:
+            self.frame[y, x] = (r, g, b)
+            self.dirty = True
+
+    def Fill(self, r: int, g: int, b: int) -> None:
+        self.frame[:] = (r, g, b)
+        self.dirty = True
+
+    def Clear(self) -> None:
+        self.frame[:] = 0
+        self.dirty = True
+
+    def SetImage(self, image: Any, offset_x: int = 0, offset_y: int = 0, *args: Any) -> None:
+        pixels = np.asarray(image if image.mode == "RGB" else image.convert("RGB"))
+        height, width = pixels.shape[:2]
+        x0, y0 = max(offset_x, 0), max(offset_y, 0)
+        x1, y1 = min(offset_x + width, MATRIX_SIZE), min(offset_y + height, MATRIX_SIZE)
+        if x0 < x1 and y0 < y1:
+            self.frame[y0:y1, x0:x1] = pixels[y0 - offset_y : y1 - offset_y, x0 - offset_x : x1 - offset_x]
+            self.dirty = True
+
+    def flush(self) -> None:
+        """Show the frame, corrected, on the canvas underneath."""
+        self._target.SetImage(Image.fromarray(COLOR_PIPELINE.apply(self.frame), "RGB"), 0, 0)
+        self.dirty = False
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._target, name)
+
+
+class _PipelineMatrix(_PipelineCanvas):
+    def __init__(self, target: Any) -> None:
+        super().__init__(target)
+        self._canvases = dict[int, _PipelineCanvas]()  # Keep proxies stable across swaps: scripts compare canvases
+        self._flushed_version = -1
+
+    def _wrap(self, canvas: Any) -> _PipelineCanvas:
+        if id(canvas) not in self._canvases:
+            self._canvases[id(canvas)] = _PipelineCanvas(canvas)
+        return self._canvases[id(canvas)]
+
+    def CreateFrameCanvas(self) -> _PipelineCanvas:
+        return self._wrap(self._target.CreateFrameCanvas())
+
+    def SwapOnVSync(self, canvas: Any, *args: Any) -> _PipelineCanvas:
+        if isinstance(canvas, _PipelineCanvas):
+            canvas.flush()
+            self.frame = canvas.frame  # Drawing on the matrix now draws on the displayed canvas
+            self.dirty = False
+            self._flushed_version = COLOR_PIPELINE.version
+        return self._wrap(self._target.SwapOnVSync(_unwrap(canvas), *args))
+
+    def flush(self) -> None:
+        self._flushed_version = COLOR_PIPELINE.version
+        super().flush()
+
+    async def keep_flushed(self) -> None:
+        """Flush what scripts draw on the matrix itself, and the displayed frame again when the colours change."""
+        while True:
+            if self.dirty or self._flushed_version != COLOR_PIPELINE.version:
+                self.flush()
+            await asyncio.sleep(1 / FLUSH_FPS)
+
+
+@lru_cache(maxsize=1)
+def _get_pipeline_matrix() -> _PipelineMatrix:
+    return _PipelineMatrix(_get_matrix())
+
+
+def _unwrap(canvas: Any) -> Any:
+    return canvas._target if isinstance(canvas, _PipelineCanvas) else canvas
+
+
+class _Font:
+    """`graphics.Font`, also read with `bdf_font` to draw text in the frames of canvases."""
+
+    def __init__(self) -> None:
+        self._font = _graphics.Font()
+        self.bdf_font = BdfFont({}, 0, 0)
+
+    def LoadFont(self, path: str) -> None:
+        self._font.LoadFont(path)
+        self.bdf_font = load_font(path)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._font, name)
+
+
+class graphics:
+    """`graphics` module drawing in the frames of the canvases given to scripts, like the rest of their drawing."""
+
+    Color = _graphics.Color
+    Font = _Font
+
+    @staticmethod
+    def DrawText(canvas: Any, font: _Font, x: int, y: int, color: Any, text: str) -> int:
+        if not isinstance(canvas, _PipelineCanvas):
+            return _graphics.DrawText(canvas, font._font, x, y, color, text)
+        canvas.dirty = True
+        return draw_text(canvas.frame, font.bdf_font, x, y, (color.red, color.green, color.blue), text)
+
+    @staticmethod
+    def DrawLine(canvas: Any, x1: int, y1: int, x2: int, y2: int, color: Any) -> None:
+        """Bresenham's line, like `graphics.DrawLine`."""
+        dx, step_x = abs(x2 - x1), 1 if x1 < x2 else -1
+        dy, step_y = -abs(y2 - y1), 1 if y1 < y2 else -1
+        error = dx + dy
+        while True:
+            canvas.SetPixel(x1, y1, color.red, color.green, color.blue)
+            if x1 == x2 and y1 == y2:
+                return
+            twice_error = 2 * error
+            if twice_error >= dy:
+                error += dy
+                x1 += step_x
+            if twice_error <= dx:
+                error += dx
+                y1 += step_y
+
+    @staticmethod
+    def DrawCircle(canvas: Any, x: int, y: int, r: int, color: Any) -> None:
+        """Midpoint circle, like `graphics.DrawCircle`."""
+        dx, dy, error = r, 0, 1 - r
+        while dy <= dx:
+            for px, py in ((dx, dy), (dy, dx), (-dx, dy), (-dy, dx), (-dx, -dy), (-dy, -dx), (dx, -dy), (dy, -dx)):
+                canvas.SetPixel(x + px, y + py, color.red, color.green, color.blue)
+            dy += 1
+            if error < 0:
+                error += 2 * dy + 1
+            else:
+                dx -= 1
+                error += 2 * (dy - dx + 1)
+
+
+async def fade_out() -> None:
+    """Fade out what the last script left on the panel."""
+    from src.helpers.transitions import play_transition
+
+    pipeline_matrix = _get_pipeline_matrix()
+    await play_transition(pipeline_matrix, pipeline_matrix.frame.copy(), np.zeros_like(pipeline_matrix.frame))
+
+
 MATRIX_SCRIPTS = dict[str, Callable[..., Coroutine[Any, Any, None]]]()
 
 
@@ -50,8 +211,10 @@ def matrix_script(
 ) -> Callable[_P, Coroutine[Any, Any, None]]:
     @wraps(function)
     async def wrapper(*args: _P.args, **kwargs: _P.kwargs) -> None:
-        matrix = _get_matrix()
-        matrix.Clear()
+        pipeline_matrix = _get_pipeline_matrix()
+        pipeline_matrix.Clear()
+        matrix = cast(RGBMatrix, pipeline_matrix)
+        flusher = asyncio.create_task(pipeline_matrix.keep_flushed())
         try:
             await function(matrix, *args, **kwargs)
         except Exception:
@@ -74,12 +237,17 @@ def matrix_script(
                 color=NaptaColor.BITTERSWEET,
             )
             await asyncio.sleep(5)
+            flusher.cancel()  # The screensaver has its own
             await asyncio.create_task(display_screensaver())
             raise
+        finally:
+            flusher.cancel()
+            if pipeline_matrix.dirty:
+                pipeline_matrix.flush()
 
     MATRIX_SCRIPTS[function.__name__] = wrapper
 
     return wrapper
 
 
-__all__ = ["RGBMatrix", "RGBMatrixOptions", "graphics", "matrix_script"]
+__all__ = ["RGBMatrix", "RGBMatrixOptions", "fade_out", "graphics", "matrix_script"]
@@ -1,74 +1,33 @@
 # Rules from https://rosettacode.org/wiki/2048
 
-import enum
 import random
-from typing import NamedTuple, Optional, Union
+from typing import Optional
 
-from typing_extensions import Self
+import numpy as np
 
+from src.play_2048 import bitboard, vectorized
+from src.play_2048.board import Board, Dir, Move
 
-class Dir(enum.Enum):
-    UP = enum.auto()
-    DOWN = enum.auto()
-    RIGHT = enum.auto()
-    LEFT = enum.auto()
 
+class GameOver(ValueError):
+    """The tile spawned after a move left the board stuck. `moves` are the tiles that move moved."""
 
-class Board:
-    def __init__(self, data: Optional[list[list[int]]] = None) -> None:
-        self._data = data or [
-            [0, 0, 0, 0],
-            [0, 0, 0, 0],
-            [0, 0, 0, 0],
-            [0, 0, 0, 0],
-        ]
-
-    @classmethod
-    def move_coords_to_row_col(cls, dir: Dir, non_moving_index: int, moving_to_index: int, /) -> tuple[int, int]:
-        if dir is Dir.UP:
-            return (moving_to_index, non_moving_index)
-        if dir is Dir.DOWN:
-            return (3 - moving_to_index, non_moving_index)
-        if dir is Dir.LEFT:
-            return (non_moving_index, moving_to_index)
-        if dir is Dir.RIGHT:
-            return (non_moving_index, 3 - moving_to_index)
-
-    def __getitem__(self, tup: Union[tuple[int, int], tuple[Dir, int, int]], /) -> int:
-        row, col = tup if len(tup) == 2 else self.move_coords_to_row_col(*tup)
-        return self._data[row][col]
-
-    def __setitem__(self, tup: Union[tuple[int, int], tuple[Dir, int, int]], value: int, /) -> None:
-        row, col = tup if len(tup) == 2 else self.move_coords_to_row_col(*tup)
-        self._data[row][col] = value
-
-    def get_empty_slots(self) -> list[tuple[int, int]]:
-        return [(y, x) for (y, row) in enumerate(self._data) for (x, val) in enumerate(row) if val == 0]
-
-    def copy(self) -> Self:
-        return type(self)(self._data)
-
-
-class Move(NamedTuple):
-    origin_yx: tuple[int, int]
-    origin_tile: int
-    dest_xy: tuple[int, int]
-    dest_tile: int
-    dist: int
-    is_fusion: bool
+    def __init__(self, moves: list[Move]) -> None:
+        super().__init__("STEP BRO IM STUCK")
+        self.moves = moves
 
 
 def _spawn(board: Board) -> tuple[int, int, int]:
     empty_slots = board.get_empty_slots()
     assert empty_slots  # If _spawn was called, we just moved, so at least one case should be empty
 
-    new_pos = random.choice(empty_slots)
-    new_tile = 4 if random.random() <= 0.1 else 2
+    new_pos = board.rng.choice(empty_slots)
+    new_tile = 4 if board.rng.random() <= 0.1 else 2
     board[new_pos] = new_tile
 
     if len(empty_slots) == 1:
         # We just filled the last case: check the game is not struck!
-        if not any(compute_move(dir, board.copy()) for dir in Dir):
+        if _is_game_over(board):
             raise ValueError("STEP BRO IM STUCK")
 
     return (*new_pos, new_tile)
@@ -135,37 +94,49 @@ def _find_moves(
     ]
 
 
-def new_game() -> Board:
-    board = Board()
+def _is_game_over(board: Board) -> bool:
+    if board.size == 4:
+        return bitboard.is_game_over(bitboard.to_bitboard(board))
+    return vectorized.is_game_over(np.array(board._data))
+
+
+def new_game(size: int = 4, seed: Optional[int] = None) -> Board:
+    """New board with its first tile. Games with the same seed (and moves) spawn the same tiles."""
+    board = Board(size=size, rng=random.Random(seed))
     _spawn(board)
     return board
 
 
+def move_board(dir: Dir, board: Board) -> Optional[list[Move]]:
+    """Move the board without spawning a tile: the moved tiles, None if the move is not legal.
+
+    4x4 boards are moved on a bitboard, other sizes with the vectorized engine.
+    """
+    if board.size == 4:
+        bits = bitboard.to_bitboard(board)
+        moved_bits = bitboard.move(bits, dir)
+        if moved_bits == bits:
+            return None
+        board_moves = bitboard.move_records(bits, dir)
+        board._data = bitboard.from_bitboard(moved_bits)._data
+    else:
+        moved_grid, board_moves = vectorized.move_grid(np.array(board._data), dir)
+        if not board_moves:
+            return None
+        board._data = moved_grid.tolist()
+    return board_moves
+
+
 def compute_move(dir: Dir, board: Board) -> Optional[tuple[list[Move], tuple[int, int, int]]]:
-    board_moves: list[Move] = []
-
-    for nmi in range(4):  # non-moving index (column if moving up/down, row if moving left/right)
-        values = tuple(board[dir, nmi, ix] for ix in range(4))
-        shifted_values = _shift(*values)
-
-        if shifted_values != values:
-            row_moves = _find_moves(shifted_values, values)
-            assert row_moves, "shifted but no moves??"
-            board_moves.extend(
-                Move(
-                    origin_yx=Board.move_coords_to_row_col(dir, nmi, orig),
-                    origin_tile=values[orig],
-                    dest_xy=Board.move_coords_to_row_col(dir, nmi, dest),
-                    dest_tile=shifted_values[dest],
-                    dist=orig - dest,
-                    is_fusion=is_fusion,
-                )
-                for orig, dest, is_fusion in row_moves
-            )
-
-            for ix, value in enumerate(shifted_values):
-                board[dir, nmi, ix] = value
-
-    if board_moves:
+    """Move the board and spawn a tile: (moved tiles, new tile row, col and value), None if the move is not legal.
+
+    Raises `GameOver` if the new tile leaves the board stuck.
+    """
+    board_moves = move_board(dir, board)
+    if board_moves is None:
+        return None
+    try:
         new_tile = _spawn(board)
-        return (board_moves, new_tile)
+    except ValueError:
+        raise GameOver(board_moves) from None
+    return (board_moves, new_tile)
@@ -0,0 +1,126 @@
+from collections.abc import Iterator
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+from PIL import Image
+
+from src.helpers.draw import pattern_to_color_by_point
+from src.helpers.transitions import easing_curve
+from src.play_2048.algorithm import Board, Move
+from src.play_2048.tiles import TILE_PATTERNS
+
+BOARD_SIZE = 64
+TILE_SIZE = 14  # On the 4x4 board, see `board_layout` for the other sizes
+TILE_START = [1, 17, 33, 49]
+MOVE_DURATION = 0.15  # Seconds, whatever the distance
+MOVE_FPS = 60
+
+
+def _tile_bitmap(tile: int) -> np.ndarray:
+    pattern = TILE_PATTERNS[tile]
+    bitmap = np.zeros((TILE_SIZE, TILE_SIZE, 3), dtype=np.uint8)
+    for (x, y), color in pattern_to_color_by_point(pattern.pattern, pattern.color_map).items():
+        bitmap[y, x] = np.clip(color, 0, 255)  # Like PIL drawing: some patterns use 256
+    return bitmap
+
+
+TILE_BITMAPS = {tile: _tile_bitmap(tile) for tile in TILE_PATTERNS}
+
+
+class Layout(NamedTuple):
+    """Where the tiles of a board size are drawn."""
+
+    tile_size: int
+    tile_start: list[int]  # Along both axes
+    bitmaps: dict[int, np.ndarray]
+
+    def bitmap(self, tile: int) -> np.ndarray:
+        """Tiles past the last pattern (only reached on larger boards) look like it."""
+        return self.bitmaps.get(tile, self.bitmaps[max(TILE_PATTERNS)])
+
+
+@lru_cache
+def board_layout(size: int = 4) -> Layout:
+    """Layout of a size x size board: 1 pixel margins around the tiles while they are at least 12 pixels apart.
+
+    Other tile sizes than the patterns' are box-downscaled, keeping the colours of each tile.
+    """
+    if size == 4:
+        return Layout(TILE_SIZE, TILE_START, TILE_BITMAPS)
+
+    pitch = BOARD_SIZE // size
+    tile_size = pitch - 2 if pitch >= 12 else pitch
+    offset = (BOARD_SIZE - pitch * size) // 2 + (pitch - tile_size) // 2
+    bitmaps = {
+        tile: np.asarray(Image.fromarray(bitmap).resize((tile_size, tile_size), Image.Resampling.BOX))
+        for tile, bitmap in TILE_BITMAPS.items()
+    }
+    return Layout(tile_size, [offset + pitch * index for index in range(size)], bitmaps)
+
+
+def blit_tiles(frame: np.ndarray, tiles: np.ndarray, xs: np.ndarray, ys: np.ndarray) -> None:
+    """Draw (n, tile size, tile size, 3) tiles with their top-left corners at xs, ys, in one array assignment.
+
+    Tiles drawn later are on top.
+    """
+    tile_range = np.arange(tiles.shape[1])
+    rows = ys[:, None, None] + tile_range[None, :, None]
+    cols = xs[:, None, None] + tile_range[None, None, :]
+    frame[rows, cols] = tiles
+
+
+def board_frame(board: Board) -> np.ndarray:
+    layout = board_layout(board.size)
+    frame = np.zeros((BOARD_SIZE, BOARD_SIZE, 3), dtype=np.uint8)
+    tiles = np.stack([layout.bitmap(tile) for row in board._data for tile in row])
+    starts = np.array(layout.tile_start)
+    blit_tiles(frame, tiles, np.tile(starts, board.size), np.repeat(starts, board.size))
+    return frame
+
+
+class Sprite(NamedTuple):
+    tile: int
+    start_xy: tuple[int, int]
+    end_xy: tuple[int, int]
+
+
+def move_sprites(moves: list[Move], size: int = 4) -> list[Sprite]:
+    """Moving tiles as sprites, fusing ones last so they slide over the tile they merge with."""
+    tile_start = board_layout(size).tile_start
+    return [
+        Sprite(
+            move.origin_tile,
+            (tile_start[move.origin_yx[1]], tile_start[move.origin_yx[0]]),
+            (tile_start[move.dest_xy[1]], tile_start[move.dest_xy[0]]),
+        )
+        for move in sorted(moves, key=lambda move: move.is_fusion)
+    ]
+
+
+def animate_moves(
+    before: np.ndarray, moves: list[Move], duration: float = MOVE_DURATION, fps: float = MOVE_FPS, size: int = 4
+) -> Iterator[np.ndarray]:
+    """Frames of the tiles sliding from their origin to their destination over `before`, the displayed board.
+
+    Positions of every sprite at every step are computed upfront, each frame is then the static board plus all the
+    sprites drawn in a single assignment. The last frame has the sprites at their destination (before fusion).
+    """
+    layout = board_layout(size)
+    sprites = move_sprites(moves, size)
+    tiles = np.stack([layout.bitmap(sprite.tile) for sprite in sprites])
+    starts = np.array([sprite.start_xy for sprite in sprites])
+    ends = np.array([sprite.end_xy for sprite in sprites])
+
+    progress = easing_curve(max(1, round(duration * fps)))
+    positions = np.rint(starts + (ends - starts) * progress[:, None, None]).astype(np.intp)  # (step, sprite, xy)
+
+    # Board without the moving tiles
+    base = before.copy()
+    blit_tiles(base, np.broadcast_to(layout.bitmap(0), tiles.shape), starts[:, 0], starts[:, 1])
+
+    frame = np.empty_like(base)
+    for step_positions in positions:
+        frame[:] = base
+        blit_tiles(frame, tiles, step_positions[:, 0], step_positions[:, 1])
+        yield frame
@@ -0,0 +1,151 @@
+# Play seeded 2048 games headless and report throughput and results as JSON:
+# python -m src.play_2048.benchmark --strategy expectimax --games 20
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, NamedTuple, Optional
+
+from src.play_2048.algorithm import Dir, GameOver, compute_move, new_game
+from src.play_2048.bitboard import empty_cells, legal_moves, move, to_bitboard
+from src.play_2048.expectimax import MOVE_BUDGET_S, best_move, warm_up
+from src.play_2048.replay import encode_log, finish_log, record_move, start_log
+
+MAX_TILE_THRESHOLDS = (256, 512, 1024, 2048, 4096, 8192)
+SCORE_PERCENTILES = (10, 25, 50, 75, 90)
+
+
+def _random_strategy(board: int, budget: float) -> Optional[Dir]:
+    dirs = legal_moves(board)
+    return random.choice(dirs) if dirs else None
+
+
+def _greedy_strategy(board: int, budget: float) -> Optional[Dir]:
+    """The legal move leaving the most empty cells, i.e. merging the most tiles."""
+    dirs = legal_moves(board)
+    return max(dirs, key=lambda dir: len(empty_cells(move(board, dir)))) if dirs else None
+
+
+def _expectimax_strategy(board: int, budget: float) -> Optional[Dir]:
+    return best_move(board, budget)
+
+
+STRATEGIES: dict[str, Callable[[int, float], Optional[Dir]]] = {
+    "random": _random_strategy,
+    "greedy": _greedy_strategy,
+    "expectimax": _expectimax_strategy,
+}
+
+
+class GameResult(NamedTuple):
+    seed: int
+    score: int
+    max_tile: int
+    moves: int
+    duration: float  # Seconds, strategy and `compute_move` included
+
+
+def play_game(strategy: str, seed: int, budget: float = MOVE_BUDGET_S, log_dir: Optional[Path] = None) -> GameResult:
+    """Play a whole game with `compute_move`, as the panel does. Same strategy and seed, same game.
+
+    With a `log_dir`, the game is saved there as `<strategy>-<seed>.2048`, see `replay`.
+    """
+    choose_move = STRATEGIES[strategy]
+    random.seed(seed)  # For the random strategy
+    start = time.perf_counter()
+
+    board = new_game(seed=seed)
+    log = start_log(board, seed)
+    score = moves = 0
+    last_dir = None
+    while (dir := choose_move(to_bitboard(board), budget)) is not None:
+        moves += 1
+        try:
+            result = compute_move(dir, board)
+        except GameOver as game_over:  # The spawned tile filled the board and the game is stuck
+            score += sum(board_move.dest_tile for board_move in game_over.moves if board_move.is_fusion)
+            last_dir = dir
+            break
+        assert result, "Strategies only play legal moves"
+        board_moves, new_tile = result
+        score += sum(board_move.dest_tile for board_move in board_moves if board_move.is_fusion)
+        record_move(log, dir, new_tile)
+
+    duration = time.perf_counter() - start
+    if log_dir:
+        (log_dir / f"{strategy}-{seed}.2048").write_bytes(encode_log(finish_log(log, board, last_dir)))
+    max_tile = max(max(row) for row in board._data)
+    return GameResult(seed, score, max_tile, moves, duration)
+
+
+def summarize(results: list[GameResult], wall_time: float) -> dict[str, Any]:
+    moves = sum(result.moves for result in results)
+    scores = [result.score for result in results]
+    score_percentiles = (
+        statistics.quantiles(scores, n=100, method="inclusive") if len(scores) > 1 else [float(scores[0])] * 99
+    )
+    return {
+        "games": len(results),
+        "moves": moves,
+        "wall_time_s": wall_time,
+        "moves_per_s": moves / wall_time,
+        "moves_per_s_per_worker": moves / sum(result.duration for result in results),
+        "score": {
+            "min": min(scores),
+            "mean": statistics.fmean(scores),
+            "max": max(scores),
+            **{f"p{percentile}": score_percentiles[percentile - 1] for percentile in SCORE_PERCENTILES},
+        },
+        "max_tile_rates": {
+            str(tile): sum(result.max_tile >= tile for result in results) / len(results) for tile in MAX_TILE_THRESHOLDS
+        },
+        "max_tiles": {
+            str(tile): sum(result.max_tile == tile for result in results)
+            for tile in sorted({result.max_tile for result in results})
+        },
+    }
+
+
+def run(
+    strategy: str,
+    games: int,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    budget: float = MOVE_BUDGET_S,
+    log_dir: Optional[Path] = None,
+) -> dict:
+    """Play `games` games (seeds `seed`, `seed + 1`...) across a process pool and summarize them."""
+    seeds = range(seed, seed + games)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=warm_up) as pool:
+        results = list(pool.map(play_game, [strategy] * games, seeds, [budget] * games, [log_dir] * games))
+    return {
+        "strategy": strategy,
+        "seed": seed,
+        "budget_s": budget if strategy == "expectimax" else None,
+        **summarize(results, time.perf_counter() - start),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark 2048 strategies on seeded headless games")
+    parser.add_argument("--strategy", choices=STRATEGIES, default="greedy")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first game, the next ones count up")
+    parser.add_argument("--workers", type=int, default=None, help="Processes (default: one per CPU)")
+    parser.add_argument("--budget", type=float, default=MOVE_BUDGET_S, help="Expectimax seconds per move")
+    parser.add_argument("--output", type=argparse.FileType("w"), default=sys.stdout)
+    parser.add_argument("--logs", type=Path, default=None, help="Directory to save the games to (logs/ to replay them)")
+    args = parser.parse_args()
+
+    if args.logs:
+        args.logs.mkdir(parents=True, exist_ok=True)
+    report = run(args.strategy, args.games, args.seed, args.workers, args.budget, args.logs)
+    json.dump(report, args.output, indent=2)
+    args.output.write("\n")
@@ -0,0 +1,178 @@
+"""2048 on a 64-bit integer: 4 bits per cell holding the tile exponent (0 for empty, 1 for 2, 2 for 4...).
+
+Cell (row, col) is the nibble `4 * row + col`, so each row is a 16-bit number. Every possible row is moved at once with
+numpy, when the tables are first needed: a left or right move is then 4 table lookups, up and down moves are the same
+on the transposed board.
+"""
+
+from functools import cache, lru_cache
+from typing import NamedTuple
+
+import numpy as np
+
+from src.play_2048.board import Board, Dir, Move
+
+MAX_EXPONENT = 15  # 32768, the largest tile a nibble holds: two of them do not merge
+ROW_MASK = 0xFFFF
+
+
+class LineMove(NamedTuple):
+    """A tile moving along a line, indices counted from the edge the tiles move to."""
+
+    origin: int
+    dest: int
+    origin_exponent: int
+    dest_exponent: int
+    is_fusion: bool
+
+
+def _move_line(exponents: tuple[int, ...]) -> tuple[tuple[int, ...], tuple[LineMove, ...]]:
+    """Move a line toward index 0: (new exponents, moved tiles)."""
+    result = list[int]()
+    placed = list[tuple[int, int, int, bool]]()  # origin, dest, origin exponent, is fusion
+    can_merge = False
+    for origin, exponent in enumerate(exponents):
+        if not exponent:
+            continue
+        if can_merge and result[-1] == exponent and exponent < MAX_EXPONENT:
+            result[-1] += 1
+            placed.append((origin, len(result) - 1, exponent, True))
+            can_merge = False
+        else:
+            result.append(exponent)
+            placed.append((origin, len(result) - 1, exponent, False))
+            can_merge = True
+
+    new_exponents = (*result, *(0,) * (len(exponents) - len(result)))
+    moves = tuple(
+        LineMove(origin, dest, exponent, new_exponents[dest], is_fusion)
+        for origin, dest, exponent, is_fusion in placed
+        if origin != dest
+    )
+    return new_exponents, moves
+
+
+def _row_to_exponents(row: int) -> tuple[int, ...]:
+    return tuple((row >> (4 * col)) & 0xF for col in range(4))
+
+
+def reverse_row(row: int) -> int:
+    return ((row & 0xF) << 12) | ((row & 0xF0) << 4) | ((row >> 4) & 0xF0) | (row >> 12)
+
+
+class _Tables(NamedTuple):
+    left: list[int]
+    right: list[int]
+
+
+def _pack_left(exponents: np.ndarray) -> np.ndarray:
+    """Exponents of each line with the empty cells moved to the end, in order."""
+    return np.take_along_axis(exponents, np.argsort(exponents == 0, axis=1, kind="stable"), axis=1)
+
+
+def _move_lines(exponents: np.ndarray) -> np.ndarray:
+    """`_move_line` on a (lines, 4) array of exponents."""
+    exponents = _pack_left(exponents)
+    for col in range(3):
+        first, second = exponents[:, col], exponents[:, col + 1]
+        merging = (first == second) & (first != 0) & (first < MAX_EXPONENT)
+        first[merging] += 1
+        second[merging] = 0
+    return _pack_left(exponents)
+
+
+@lru_cache(maxsize=1)
+def _tables() -> _Tables:
+    exponents = (np.arange(ROW_MASK + 1)[:, None] >> (4 * np.arange(4))) & 0xF
+    shifts = 4 * np.arange(4)
+    left = (_move_lines(exponents) << shifts).sum(axis=1)
+    right = (_move_lines(exponents[:, ::-1])[:, ::-1] << shifts).sum(axis=1)
+    return _Tables(left.tolist(), right.tolist())
+
+
+@cache
+def _line_moves(row: int) -> tuple[LineMove, ...]:
+    """Moved tiles when moving the row toward column 0."""
+    return _move_line(_row_to_exponents(row))[1]
+
+
+def transpose(board: int) -> int:
+    """Swap rows and columns with masks and shifts: nibble (row, col) goes to (col, row)."""
+    a1 = board & 0xF0F00F0FF0F00F0F
+    a2 = board & 0x0000F0F00000F0F0
+    a3 = board & 0x0F0F00000F0F0000
+    a = a1 | (a2 << 12) | (a3 >> 12)
+    b1 = a & 0xFF00FF0000FF00FF
+    b2 = a & 0x00FF00FF00000000
+    b3 = a & 0x00000000FF00FF00
+    return b1 | (b2 >> 24) | (b3 << 24)
+
+
+def _move_rows(board: int, table: list[int]) -> int:
+    return (
+        table[board & ROW_MASK]
+        | table[(board >> 16) & ROW_MASK] << 16
+        | table[(board >> 32) & ROW_MASK] << 32
+        | table[(board >> 48) & ROW_MASK] << 48
+    )
+
+
+def move(board: int, dir: Dir) -> int:
+    """Board after moving, without spawning a tile. Unchanged if the move is not legal."""
+    tables = _tables()
+    if dir is Dir.LEFT:
+        return _move_rows(board, tables.left)
+    if dir is Dir.RIGHT:
+        return _move_rows(board, tables.right)
+    if dir is Dir.UP:
+        return transpose(_move_rows(transpose(board), tables.left))
+    return transpose(_move_rows(transpose(board), tables.right))
+
+
+def legal_moves(board: int) -> list[Dir]:
+    return [dir for dir in Dir if move(board, dir) != board]
+
+
+def is_game_over(board: int) -> bool:
+    return all(move(board, dir) == board for dir in Dir)
+
+
+def move_records(board: int, dir: Dir) -> list[Move]:
+    """The tiles moved by a move, as `compute_move` reports them for the animation."""
+    lines = transpose(board) if dir in (Dir.UP, Dir.DOWN) else board
+    records = list[Move]()
+    for line_index in range(4):
+        line = (lines >> (16 * line_index)) & ROW_MASK
+        if dir in (Dir.RIGHT, Dir.DOWN):
+            line = reverse_row(line)  # Toward index 0
+        records.extend(
+            Move(
+                origin_yx=Board.move_coords_to_row_col(dir, line_index, line_move.origin),
+                origin_tile=1 << line_move.origin_exponent,
+                dest_xy=Board.move_coords_to_row_col(dir, line_index, line_move.dest),
+                dest_tile=1 << line_move.dest_exponent,
+                dist=line_move.origin - line_move.dest,
+                is_fusion=line_move.is_fusion,
+            )
+            for line_move in _line_moves(line)
+        )
+    return records
+
+
+def empty_cells(board: int) -> list[int]:
+    """Nibble index (4 * row + col) of the empty cells."""
+    return [cell for cell in range(16) if not (board >> (4 * cell)) & 0xF]
+
+
+def to_bitboard(board: Board) -> int:
+    return sum(
+        (board[row, col].bit_length() - 1 if board[row, col] else 0) << (4 * (4 * row + col))
+        for row in range(4)
+        for col in range(4)
+    )
+
+
+def from_bitboard(bits: int) -> Board:
+    return Board(
+        [[1 << exponent if exponent else 0 for exponent in _row_to_exponents(bits >> (16 * row))] for row in range(4)]
+    )
@@ -0,0 +1,62 @@
+import enum
+import random
+from typing import NamedTuple, Optional, Union
+
+from typing_extensions import Self
+
+
+class Dir(enum.Enum):
+    UP = enum.auto()
+    DOWN = enum.auto()
+    RIGHT = enum.auto()
+    LEFT = enum.auto()
+
+
+class Board:
+    def __init__(
+        self, data: Optional[list[list[int]]] = None, size: int = 4, rng: Optional[random.Random] = None
+    ) -> None:
+        self._data = data or [[0] * size for _ in range(size)]
+        self.rng = rng or random.Random()  # Spawns new tiles
+
+    @property
+    def size(self) -> int:
+        return len(self._data)
+
+    @classmethod
+    def move_coords_to_row_col(
+        cls, dir: Dir, non_moving_index: int, moving_to_index: int, /, size: int = 4
+    ) -> tuple[int, int]:
+        if dir is Dir.UP:
+            return (moving_to_index, non_moving_index)
+        if dir is Dir.DOWN:
+            return (size - 1 - moving_to_index, non_moving_index)
+        if dir is Dir.LEFT:
+            return (non_moving_index, moving_to_index)
+        if dir is Dir.RIGHT:
+            return (non_moving_index, size - 1 - moving_to_index)
+
+    def __getitem__(self, tup: Union[tuple[int, int], tuple[Dir, int, int]], /) -> int:
+        row, col = tup if len(tup) == 2 else self.move_coords_to_row_col(*tup, self.size)
+        return self._data[row][col]
+
+    def __setitem__(self, tup: Union[tuple[int, int], tuple[Dir, int, int]], value: int, /) -> None:
+        row, col = tup if len(tup) == 2 else self.move_coords_to_row_col(*tup, self.size)
+        self._data[row][col] = value
+
+    def get_empty_slots(self) -> list[tuple[int, int]]:
+        return [(y, x) for (y, row) in enumerate(self._data) for (x, val) in enumerate(row) if val == 0]
+
+    def copy(self) -> Self:
+        rng = random.Random()
+        rng.setstate(self.rng.getstate())
+        return type(self)([list(row) for row in self._data], rng=rng)
+
+
+class Move(NamedTuple):
+    origin_yx: tuple[int, int]
+    origin_tile: int
+    dest_xy: tuple[int, int]
+    dest_tile: int
+    dist: int
+    is_fusion: bool
@@ -0,0 +1,148 @@
+"""Expectimax search for 2048 on bitboards, with heuristic row tables and a transposition table.
+
+Move nodes take the best of the legal moves, chance nodes average over every spawn (2 with probability 0.9, 4 with
+0.1) in every empty cell. Branches less likely than `PROBABILITY_CUTOFF` are scored by the heuristic directly, and the
+search deepens until its time budget is spent.
+"""
+
+import time
+from functools import lru_cache
+from typing import Optional
+
+from src.play_2048.algorithm import Dir
+from src.play_2048.bitboard import ROW_MASK, empty_cells, legal_moves, move, transpose
+
+MOVE_BUDGET_S = 0.2
+MAX_DEPTH = 8
+PROBABILITY_CUTOFF = 1e-4
+SPAWN_PROBABILITIES = ((1, 0.9), (2, 0.1))  # Exponent of the spawned tile, probability
+_DEADLINE_CHECK_NODES = 256
+
+# Heuristic weights, per row and column
+LOST_PENALTY = 200_000.0
+EMPTY_WEIGHT = 270.0
+MERGES_WEIGHT = 700.0
+MONOTONICITY_POWER = 4.0
+MONOTONICITY_WEIGHT = 47.0
+SUM_POWER = 3.5
+SUM_WEIGHT = 11.0
+
+
+def _row_heuristic(exponents: list[int]) -> float:
+    empty = exponents.count(0)
+    tiles_sum = sum(exponent**SUM_POWER for exponent in exponents)
+
+    # Equal tiles next to each other (ignoring empty cells between them)
+    merges = 0
+    previous, run = 0, 0
+    for exponent in exponents:
+        if not exponent:
+            continue
+        if exponent == previous:
+            run += 1
+            continue
+        if run:
+            merges += run + 1
+        previous, run = exponent, 0
+    if run:
+        merges += run + 1
+
+    # Rows should be sorted one way or the other
+    monotonicity_left = monotonicity_right = 0.0
+    for before, after in zip(exponents, exponents[1:]):
+        if before > after:
+            monotonicity_left += before**MONOTONICITY_POWER - after**MONOTONICITY_POWER
+        else:
+            monotonicity_right += after**MONOTONICITY_POWER - before**MONOTONICITY_POWER
+
+    return (
+        LOST_PENALTY
+        + EMPTY_WEIGHT * empty
+        + MERGES_WEIGHT * merges
+        - MONOTONICITY_WEIGHT * min(monotonicity_left, monotonicity_right)
+        - SUM_WEIGHT * tiles_sum
+    )
+
+
+@lru_cache(maxsize=1)
+def _heuristic_table() -> list[float]:
+    return [_row_heuristic([(row >> (4 * col)) & 0xF for col in range(4)]) for row in range(ROW_MASK + 1)]
+
+
+def heuristic(board: int) -> float:
+    """Sum of the row heuristic over the rows and columns of the board."""
+    table = _heuristic_table()
+    columns = transpose(board)
+    return (
+        table[board & ROW_MASK]
+        + table[(board >> 16) & ROW_MASK]
+        + table[(board >> 32) & ROW_MASK]
+        + table[(board >> 48) & ROW_MASK]
+        + table[columns & ROW_MASK]
+        + table[(columns >> 16) & ROW_MASK]
+        + table[(columns >> 32) & ROW_MASK]
+        + table[(columns >> 48) & ROW_MASK]
+    )
+
+
+class _Timeout(Exception):
+    pass
+
+
+class _Search:
+    def __init__(self, deadline: float) -> None:
+        self.deadline = deadline
+        self.nodes = 0
+        self.transpositions = dict[int, tuple[int, float]]()  # Board -> depth searched, score
+
+    def move_node(self, board: int, depth: int, probability: float) -> float:
+        self.nodes += 1
+        if self.nodes % _DEADLINE_CHECK_NODES == 0 and time.monotonic() > self.deadline:
+            raise _Timeout
+
+        best = 0.0  # Lost
+        for dir in Dir:
+            if (moved := move(board, dir)) != board:
+                best = max(best, self.chance_node(moved, depth - 1, probability))
+        return best
+
+    def chance_node(self, board: int, depth: int, probability: float) -> float:
+        if depth <= 0 or probability < PROBABILITY_CUTOFF:
+            return heuristic(board)
+
+        cached = self.transpositions.get(board)
+        if cached and cached[0] >= depth:
+            return cached[1]
+
+        cells = empty_cells(board)
+        score = 0.0
+        for exponent, spawn_probability in SPAWN_PROBABILITIES:
+            child_probability = probability * spawn_probability / len(cells)
+            for cell in cells:
+                score += spawn_probability * self.move_node(board | exponent << (4 * cell), depth, child_probability)
+        score /= len(cells)
+
+        self.transpositions[board] = (depth, score)
+        return score
+
+
+def best_move(board: int, budget: float = MOVE_BUDGET_S, max_depth: int = MAX_DEPTH) -> Optional[Dir]:
+    """Best move within the time budget (None if the game is over), from the deepest search completed."""
+    dirs = legal_moves(board)
+    if len(dirs) <= 1:
+        return dirs[0] if dirs else None
+
+    search = _Search(time.monotonic() + budget)
+    best = max(dirs, key=lambda dir: heuristic(move(board, dir)))
+    for depth in range(1, max_depth + 1):
+        try:
+            scores = {dir: search.chance_node(move(board, dir), depth, 1.0) for dir in dirs}
+        except _Timeout:
+            break
+        best = max(scores, key=scores.__getitem__)
+    return best
+
+
+def warm_up() -> None:
+    """Build the move and heuristic tables, e.g. when a worker process starts."""
+    heuristic(move(0, Dir.LEFT))
@@ -0,0 +1,172 @@
+# Replay recorded 2048 games headless, checking their final board with --verify:
+# python -m src.play_2048.replay --verify logs/*.2048
+
+"""Compact binary logs of 2048 games.
+
+A log is a header, the final board (one byte per cell: the tile exponent), the moves packed 2 bits each and one byte per
+spawned tile (cell index, and the high bit set for a 4). The spawned tiles are logged rather than replayed from the
+seed, so logs stay valid whatever the engine does with its random generator.
+"""
+
+import argparse
+import struct
+import sys
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from src.play_2048.algorithm import Board, Dir, Move, move_board
+
+MAGIC = b"2048"
+VERSION = 1
+_HEADER = struct.Struct("<4sBBQI")  # Magic, version, board size, seed, number of moves
+_DIRS = list(Dir)
+_FOUR_BIT = 0x80
+MAX_SIZE = 11  # Spawned cell indices fit in 7 bits
+LOGS_DIR = Path(__file__).parent.parent.parent / "logs"  # Where the panel replays games from
+
+
+class Spawn(NamedTuple):
+    row: int
+    col: int
+    tile: int
+
+
+class GameLog(NamedTuple):
+    size: int
+    seed: int
+    spawns: list[Spawn]  # The first tile, then one per move
+    dirs: list[Dir]
+    final_board: list[list[int]]
+
+
+class ReplayError(ValueError):
+    pass
+
+
+def start_log(board: Board, seed: int) -> GameLog:
+    """Empty log of a new game, with its first tile."""
+    ((row, col),) = [(row, col) for row in range(board.size) for col in range(board.size) if board[row, col]]
+    return GameLog(board.size, seed, [Spawn(row, col, board[row, col])], [], [])
+
+
+def record_move(log: GameLog, dir: Dir, new_tile: tuple[int, int, int]) -> None:
+    log.dirs.append(dir)
+    log.spawns.append(Spawn(*new_tile))
+
+
+def finish_log(log: GameLog, board: Board, last_dir: Optional[Dir] = None) -> GameLog:
+    """Log with the final board. Give `last_dir` if `compute_move` raised on it: its new tile is found on the board."""
+    if last_dir:
+        log.dirs.append(last_dir)
+        replayed = start_board(log)
+        for _ in replay(log, replayed):  # Every move but the last one, whose tile is not logged
+            pass
+        move_board(last_dir, replayed)
+        ((row, col),) = replayed.get_empty_slots()
+        log.spawns.append(Spawn(row, col, board[row, col]))
+    return log._replace(final_board=[list(row) for row in board._data])
+
+
+def _exponent(tile: int) -> int:
+    return tile.bit_length() - 1 if tile else 0
+
+
+def encode_log(log: GameLog) -> bytes:
+    if log.size > MAX_SIZE:
+        raise ValueError(f"Cannot log {log.size}x{log.size} boards, at most {MAX_SIZE}x{MAX_SIZE}")
+
+    dir_codes = np.zeros(-(-len(log.dirs) // 4) * 4, dtype=np.uint8)
+    dir_codes[: len(log.dirs)] = [_DIRS.index(dir) for dir in log.dirs]
+    packed_dirs = (dir_codes.reshape(-1, 4) << np.array([0, 2, 4, 6], dtype=np.uint8)).sum(axis=1, dtype=np.uint8)
+    spawns = bytes(row * log.size + col | (_FOUR_BIT if tile == 4 else 0) for row, col, tile in log.spawns)
+    final_board = bytes(_exponent(tile) for row in log.final_board for tile in row)
+    header = _HEADER.pack(MAGIC, VERSION, log.size, log.seed, len(log.dirs))
+    return header + final_board + packed_dirs.tobytes() + spawns
+
+
+def decode_log(data: bytes) -> GameLog:
+    magic, version, size, seed, n_moves = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ReplayError(f"Not a version {VERSION} 2048 log")
+
+    offset = _HEADER.size
+    final_board = [
+        [1 << exponent if exponent else 0 for exponent in data[offset + row * size : offset + (row + 1) * size]]
+        for row in range(size)
+    ]
+    offset += size * size
+
+    n_packed = -(-n_moves // 4)
+    packed_dirs = np.frombuffer(data, dtype=np.uint8, count=n_packed, offset=offset)
+    dir_codes = (packed_dirs[:, None] >> np.array([0, 2, 4, 6], dtype=np.uint8)) & 3
+    dirs = [_DIRS[code] for code in dir_codes.ravel()[:n_moves].tolist()]
+    offset += n_packed
+
+    spawns = list[Spawn]()
+    for spawn in data[offset : offset + n_moves + 1]:
+        row, col = divmod(spawn & ~_FOUR_BIT, size)
+        spawns.append(Spawn(row, col, 4 if spawn & _FOUR_BIT else 2))
+    if len(spawns) != n_moves + 1:
+        raise ReplayError("Truncated log")
+    return GameLog(size, seed, spawns, dirs, final_board)
+
+
+def newest_log(directory: Path = LOGS_DIR) -> Optional[Path]:
+    """Last game logged in `directory`, None if there is none."""
+    return max(directory.glob("*.2048"), key=lambda path: path.stat().st_mtime, default=None)
+
+
+def start_board(log: GameLog) -> Board:
+    board = Board(size=log.size)
+    board[log.spawns[0].row, log.spawns[0].col] = log.spawns[0].tile
+    return board
+
+
+def replay(log: GameLog, board: Optional[Board] = None) -> Iterator[tuple[Board, list[Move], Spawn]]:
+    """Play the logged moves and spawns, yielding the board (updated in place) after each move."""
+    board = board or start_board(log)
+    for index, (dir, spawn) in enumerate(zip(log.dirs, log.spawns[1:])):
+        moves = move_board(dir, board)
+        if moves is None:
+            raise ReplayError(f"Move {index} ({dir.name}) is not legal")
+        if board[spawn.row, spawn.col]:
+            raise ReplayError(f"Move {index} spawns a tile on a tile")
+        board[spawn.row, spawn.col] = spawn.tile
+        yield board, moves, spawn
+
+
+def verify(log: GameLog) -> int:
+    """Replay the log and check its final board, returning the number of moves replayed."""
+    board = start_board(log)
+    moves = sum(1 for _ in replay(log, board))
+    if board._data != log.final_board:
+        raise ReplayError(f"Final board {board._data} instead of {log.final_board}")
+    return moves
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay 2048 game logs headless, at full speed")
+    parser.add_argument("logs", type=Path, nargs="+")
+    parser.add_argument("--verify", action="store_true", help="Check the final board of each game")
+    args = parser.parse_args()
+
+    moves = failures = 0
+    start = time.perf_counter()
+    for path in args.logs:
+        try:
+            log = decode_log(path.read_bytes())
+            if args.verify:
+                moves += verify(log)
+            else:
+                moves += sum(1 for _ in replay(log))
+        except ReplayError as error:
+            failures += 1
+            print(f"{path}: {error}", file=sys.stderr)
+    elapsed = time.perf_counter() - start
+
+    print(f"{len(args.logs) - failures}/{len(args.logs)} games replayed, {moves / elapsed:,.0f} moves/s")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,90 @@
+import itertools
+import random
+
+from src.play_2048.algorithm import Board, Dir, GameOver, Move, _find_moves, _shift, compute_move
+from src.play_2048.bitboard import (
+    _move_line,
+    from_bitboard,
+    is_game_over,
+    legal_moves,
+    move,
+    move_records,
+    reverse_row,
+    to_bitboard,
+    transpose,
+)
+
+
+def _test_line(exponents: tuple[int, ...]) -> None:
+    values = tuple(1 << exponent if exponent else 0 for exponent in exponents)
+    new_exponents, line_moves = _move_line(exponents)
+    expected = _shift(*values)
+    assert tuple(1 << exponent if exponent else 0 for exponent in new_exponents) == expected, f"{values} -> {expected}"
+    moves = {(line_move.origin, line_move.dest, line_move.is_fusion) for line_move in line_moves}
+    assert moves == set(_find_moves(expected, values)), f"_find_moves{values} differs"
+    # The tables, built with numpy, move the line the same way
+    row = sum(exponent << (4 * col) for col, exponent in enumerate(exponents))
+    moved_row = sum(exponent << (4 * col) for col, exponent in enumerate(new_exponents))
+    assert move(row, Dir.LEFT) == moved_row
+    assert move(reverse_row(row), Dir.RIGHT) == reverse_row(moved_row)
+
+
+def _reference_move(dir: Dir, board: Board) -> list[Move]:
+    """Row by row move, with `_shift` and `_find_moves` (without spawning)."""
+    board_moves = list[Move]()
+    for nmi in range(4):
+        values = tuple(board[dir, nmi, ix] for ix in range(4))
+        shifted_values = _shift(*values)
+        board_moves.extend(
+            Move(
+                origin_yx=Board.move_coords_to_row_col(dir, nmi, orig),
+                origin_tile=values[orig],
+                dest_xy=Board.move_coords_to_row_col(dir, nmi, dest),
+                dest_tile=shifted_values[dest],
+                dist=orig - dest,
+                is_fusion=is_fusion,
+            )
+            for orig, dest, is_fusion in _find_moves(shifted_values, values)
+        )
+        for ix, value in enumerate(shifted_values):
+            board[dir, nmi, ix] = value
+    return board_moves
+
+
+# Every line of small tiles, and random lines of any tile
+for _exponents in itertools.product(range(4), repeat=4):
+    _test_line(_exponents)
+_rng = random.Random(0)
+for _ in range(2000):
+    _test_line(tuple(_rng.choice((0, 0, _rng.randrange(1, 15))) for _ in range(4)))
+
+# Moves on random boards match the row by row reference
+for _ in range(300):
+    _board = Board([[_rng.choice((0, 2, 2, 4, 8, 16, 1024)) for _ in range(4)] for _ in range(4)])
+    _bits = to_bitboard(_board)
+    assert from_bitboard(_bits)._data == _board._data
+    assert transpose(transpose(_bits)) == _bits
+    assert from_bitboard(transpose(_bits))._data == [list(col) for col in zip(*_board._data)]
+    for _dir in Dir:
+        _expected_board = _board.copy()
+        _expected_moves = _reference_move(_dir, _expected_board)
+        assert from_bitboard(move(_bits, _dir))._data == _expected_board._data
+        assert set(move_records(_bits, _dir)) == set(_expected_moves)
+        assert (_dir in legal_moves(_bits)) == bool(_expected_moves)
+
+# Copies do not share cells
+_board = Board([[2, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]])
+compute_move(Dir.RIGHT, _board.copy())
+assert _board._data[0] == [2, 0, 0, 0]
+
+assert is_game_over(to_bitboard(Board([[2, 4, 2, 4], [4, 2, 4, 2], [2, 4, 2, 4], [4, 2, 4, 2]])))
+assert not is_game_over(to_bitboard(Board([[2, 4, 2, 4], [4, 2, 4, 2], [2, 4, 2, 4], [4, 2, 4, 4]])))
+assert move(0xF << 0 | 0xF << 4, Dir.LEFT) == 0xF << 0 | 0xF << 4  # 32768 tiles do not merge
+
+# The move whose new tile leaves the board stuck still reports its tiles, for their score
+_board = Board([[2, 2, 8, 16], [32, 64, 128, 256], [512, 1024, 32, 64], [128, 256, 512, 1024]])
+try:
+    compute_move(Dir.LEFT, _board)
+    raise AssertionError("The new tile fills the board, with no move left")
+except GameOver as _game_over:
+    assert [(_move.dest_tile, _move.is_fusion) for _move in _game_over.moves if _move.is_fusion] == [(4, True)]
@@ -0,0 +1,53 @@
+import random
+
+from src.play_2048.algorithm import Dir, compute_move, new_game
+from src.play_2048.replay import (
+    GameLog,
+    ReplayError,
+    decode_log,
+    encode_log,
+    finish_log,
+    record_move,
+    start_log,
+    verify,
+)
+
+
+def _play_random_game(seed: int, size: int = 4) -> GameLog:
+    board = new_game(size, seed)
+    log = start_log(board, seed)
+    rng = random.Random(seed)
+    while True:
+        dir = rng.choice(list(Dir))
+        try:
+            result = compute_move(dir, board)
+        except ValueError:  # Game over
+            return finish_log(log, board, dir)
+        if result:
+            record_move(log, dir, result[1])
+
+
+# Seeded games are reproducible
+assert _play_random_game(1) == _play_random_game(1)
+assert _play_random_game(1) != _play_random_game(2)
+
+# Logs round trip, 2 bits per move and a byte per tile
+for seed, size in ((1, 4), (2, 4), (3, 5)):
+    log = _play_random_game(seed, size)
+    data = encode_log(log)
+    assert decode_log(data) == log
+    assert len(data) < 20 + size * size + len(log.dirs) * 10 / 8 + 2
+    assert verify(decode_log(data)) == len(log.dirs)
+
+# Altered logs are detected
+log = _play_random_game(1)
+try:
+    verify(log._replace(final_board=[[0] * 4] * 4))
+    raise AssertionError("Wrong final board not detected")
+except ReplayError:
+    pass
+try:
+    verify(log._replace(dirs=[Dir.UP if dir is Dir.DOWN else Dir.DOWN for dir in log.dirs]))
+    raise AssertionError("Wrong moves not detected")
+except ReplayError:
+    pass
@@ -0,0 +1,72 @@
+import random
+
+import numpy as np
+
+from src.play_2048.algorithm import Board, Dir, Move, _find_moves, _shift, compute_move, new_game
+from src.play_2048.bitboard import from_bitboard, move, move_records, to_bitboard
+from src.play_2048.vectorized import is_game_over, move_grid
+
+
+def _reference_move(dir: Dir, board: Board) -> tuple[list[list[int]], list[Move]]:
+    """Line by line move of a board of any size, with `_shift` and `_find_moves` (without spawning)."""
+    moved = board.copy()
+    board_moves = list[Move]()
+    for nmi in range(board.size):
+        values = tuple(board[dir, nmi, ix] for ix in range(board.size))
+        shifted_values = _shift(*values)
+        for ix, value in enumerate(shifted_values):
+            moved[dir, nmi, ix] = value
+        board_moves.extend(
+            Move(
+                origin_yx=Board.move_coords_to_row_col(dir, nmi, orig, board.size),
+                origin_tile=values[orig],
+                dest_xy=Board.move_coords_to_row_col(dir, nmi, dest, board.size),
+                dest_tile=shifted_values[dest],
+                dist=orig - dest,
+                is_fusion=is_fusion,
+            )
+            for orig, dest, is_fusion in _find_moves(shifted_values, values)
+        )
+    return moved._data, board_moves
+
+
+_rng = random.Random(0)
+
+# Same boards and records as the bitboard on 4x4 boards
+for _ in range(300):
+    board = Board([[_rng.choice([0, 0, 2, 2, 4, 8, 16]) for _ in range(4)] for _ in range(4)])
+    for dir in Dir:
+        grid, moves = move_grid(np.array(board._data), dir)
+        assert grid.tolist() == from_bitboard(move(to_bitboard(board), dir))._data, f"{board._data} {dir}"
+        assert moves == move_records(to_bitboard(board), dir), f"{board._data} {dir}"
+
+# Same as the line by line reference on larger boards (moves in any order)
+for size in (5, 8):
+    for _ in range(50):
+        board = Board([[_rng.choice([0, 0, 2, 2, 4, 8]) for _ in range(size)] for _ in range(size)])
+        for dir in Dir:
+            grid, moves = move_grid(np.array(board._data), dir)
+            expected_grid, expected_moves = _reference_move(dir, board)
+            assert grid.tolist() == expected_grid, f"{board._data} {dir}"
+            assert set(moves) == set(expected_moves), f"{board._data} {dir}"
+
+# Runs of equal tiles merge pairwise from the edge
+grid, moves = move_grid(np.array([[2, 2, 2, 2, 2], *[[0] * 5] * 4]), Dir.LEFT)
+assert grid[0].tolist() == [4, 4, 2, 0, 0]
+assert [(move.dest_xy, move.is_fusion) for move in moves] == [
+    ((0, 0), True),
+    ((0, 1), False),
+    ((0, 1), True),
+    ((0, 2), False),
+]
+
+# Game over when full without equal neighbours
+assert is_game_over(np.array([[2, 4, 2, 4, 2], [4, 2, 4, 2, 4]] * 2 + [[2, 4, 2, 4, 2]]))
+assert not is_game_over(np.array([[2, 4, 2, 4, 2], [4, 2, 4, 2, 4]] * 2 + [[2, 4, 2, 4, 4]]))
+assert not is_game_over(np.array([[2, 4, 2, 4, 2], [4, 2, 4, 2, 4]] * 2 + [[2, 4, 2, 4, 0]]))
+
+# compute_move works on any size
+board = new_game(5)
+while not compute_move(_rng.choice(list(Dir)), board):
+    pass
+assert board.size == 5 and sum(value != 0 for row in board._data for value in row) >= 2
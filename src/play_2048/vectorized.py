@@ -0,0 +1,96 @@
+"""2048 on any square board size, every line of a move processed at once with NumPy.
+
+The grid is viewed as lines moving toward index 0. Tiles are compacted to the front of their line by a stable argsort
+of the empty mask, then runs of equal tiles merge pairwise from the front: the 2nd, 4th... tile of a run is absorbed by
+the tile before it. Each tile then lands on the number of tiles kept before it.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from src.play_2048.board import Board, Dir, Move
+
+
+def _lines(grid: np.ndarray, dir: Dir) -> np.ndarray:
+    """View of the grid where line `i`, index `j` is `Board.move_coords_to_row_col(dir, i, j, size)`."""
+    if dir is Dir.LEFT:
+        return grid
+    if dir is Dir.RIGHT:
+        return grid[:, ::-1]
+    if dir is Dir.UP:
+        return grid.T
+    return grid[::-1].T
+
+
+def _grid(lines: np.ndarray, dir: Dir) -> np.ndarray:
+    """Inverse of `_lines`."""
+    if dir is Dir.LEFT:
+        return lines
+    if dir is Dir.RIGHT:
+        return lines[:, ::-1]
+    if dir is Dir.UP:
+        return lines.T
+    return lines.T[::-1]
+
+
+class SlidLines(NamedTuple):
+    """Lines moved toward index 0. Arrays are indexed by (line, rank of the tile in the line)."""
+
+    origins: np.ndarray
+    dests: np.ndarray
+    tiles: np.ndarray
+    absorbed: np.ndarray  # Fusions: tiles merged into the previous one
+    result: np.ndarray  # Indexed by (line, index), like the input
+
+
+def slide_lines(lines: np.ndarray) -> SlidLines:
+    rank = np.arange(lines.shape[1])
+    origins = np.argsort(lines == 0, axis=1, kind="stable")
+    tiles = np.take_along_axis(lines, origins, axis=1)
+
+    run_starts = np.ones(lines.shape, dtype=bool)
+    run_starts[:, 1:] = tiles[:, 1:] != tiles[:, :-1]
+    run_start_ranks = np.maximum.accumulate(np.where(run_starts, rank, 0), axis=1)
+    absorbed = ((rank - run_start_ranks) % 2 == 1) & (tiles != 0)
+    dests = np.cumsum(~absorbed, axis=1) - 1
+
+    values = tiles.copy()
+    values[:, :-1] <<= absorbed[:, 1:]  # Tiles absorbing the next one double
+    kept = ~absorbed
+    result = np.zeros_like(lines)
+    result[np.nonzero(kept)[0], dests[kept]] = values[kept]
+    return SlidLines(origins, dests, tiles, absorbed, result)
+
+
+def move_grid(grid: np.ndarray, dir: Dir) -> tuple[np.ndarray, list[Move]]:
+    """Grid after moving (without spawning a tile) and the moved tiles, as `compute_move` reports them."""
+    size = len(grid)
+    slid = slide_lines(_lines(grid, dir))
+    line_indices, ranks = np.nonzero((slid.tiles != 0) & (slid.origins != slid.dests))
+    origins = slid.origins[line_indices, ranks]
+    dests = slid.dests[line_indices, ranks]
+    moves = [
+        Move(
+            origin_yx=Board.move_coords_to_row_col(dir, line_index, origin, size),
+            origin_tile=origin_tile,
+            dest_xy=Board.move_coords_to_row_col(dir, line_index, dest, size),
+            dest_tile=dest_tile,
+            dist=origin - dest,
+            is_fusion=is_fusion,
+        )
+        for line_index, origin, dest, origin_tile, dest_tile, is_fusion in zip(
+            line_indices.tolist(),
+            origins.tolist(),
+            dests.tolist(),
+            slid.tiles[line_indices, ranks].tolist(),
+            slid.result[line_indices, dests].tolist(),
+            slid.absorbed[line_indices, ranks].tolist(),
+        )
+    ]
+    return _grid(slid.result, dir), moves
+
+
+def is_game_over(grid: np.ndarray) -> bool:
+    """No empty cell and no equal neighbours."""
+    return bool(grid.all() and not (grid[:, 1:] == grid[:, :-1]).any() and not (grid[1:] == grid[:-1]).any())
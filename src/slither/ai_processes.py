@@ -0,0 +1,221 @@
+"""Slither AIs hosted in worker processes, so they think in parallel on all cores.
+
+Every tick, the board is published once in shared memory: a tick counter, the snake cells in engine order and the grid
+of what is on each cell. The workers build their snapshot from it, and only the tick and the directions go through
+pipes.
+
+With deadlines, the rules of the frame are: a decision not made within the AI's budget is dropped, the snake keeps its
+direction and the miss is counted. A worker still busy with an earlier tick skips the new one, also as misses.
+"""
+
+import logging
+import multiprocessing
+import random
+import time
+from collections.abc import Sequence
+from multiprocessing.connection import Connection, wait
+from multiprocessing.process import BaseProcess
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, NamedTuple, Optional, cast
+
+import numpy as np
+
+from src.ai_players.base_ai import Dir, GameState, Snapshot
+from src.ai_players.loader import AILoader
+from src.slither.engine import APPLE, BOARD_SIZE, SlitherEngine
+
+DECISION_BUDGET_MS = 30  # Half a frame at 15 FPS
+_WRITING = -1  # Tick while the board is being published
+
+
+class Decision(NamedTuple):
+    dir: Dir
+    boost: bool
+    duration: float  # Seconds
+
+
+class SharedBoard:
+    """Board of a tick in shared memory, written by the game and read by the AI processes."""
+
+    def __init__(self, names: Sequence[str], board_size: int = BOARD_SIZE, shm_name: Optional[str] = None) -> None:
+        self.names = tuple(names)
+        self.board_size = board_size
+        self._indices = {name: index for index, name in enumerate(self.names)}
+        n, cells = len(self.names), board_size * board_size
+        size = 16 + 8 * n + 2 * n * cells + cells
+        self.shm = SharedMemory(shm_name, create=shm_name is None, size=size if shm_name is None else 0)
+
+        buffer = self.shm.buf
+        self._header: np.ndarray = np.ndarray(2, np.int64, buffer)  # Tick, number of snakes
+        self._slots: np.ndarray = np.ndarray(n, np.int32, buffer, 16)  # Index in `names` of each snake, in engine order
+        self._lengths: np.ndarray = np.ndarray(n, np.int32, buffer, 16 + 4 * n)
+        self._cells: np.ndarray = np.ndarray((n, cells), np.uint16, buffer, 16 + 8 * n)  # Packed, from head to tail
+        self._owners: np.ndarray = np.ndarray(cells, np.uint8, buffer, 16 + 8 * n + 2 * n * cells)
+
+    def publish(self, engine: SlitherEngine, tick: int) -> None:
+        self._header[0] = _WRITING
+        for slot, (name, snake) in enumerate(engine.snakes.items()):
+            self._slots[slot] = self._indices[name]
+            self._lengths[slot] = len(snake)
+            self._cells[slot, : len(snake)] = snake.cells()
+        self._header[1] = len(engine.snakes)
+        self._owners[:] = engine.owners.ravel()
+        self._header[0] = tick
+
+    def read(self, tick: int) -> Optional[Snapshot]:
+        """Snapshot of the tick, or None if the board already moved on."""
+        if self._header[0] != tick:
+            return None
+        snakes: dict[str, Sequence[tuple[int, int]]] = {}
+        for slot in range(int(self._header[1])):
+            ys, xs = np.divmod(self._cells[slot, : self._lengths[slot]], self.board_size)
+            snakes[self.names[self._slots[slot]]] = tuple(zip(xs.tolist(), ys.tolist()))
+        apple_ys, apple_xs = np.divmod(np.flatnonzero(self._owners == APPLE), self.board_size)
+        snapshot = Snapshot.build(snakes, zip(apple_xs.tolist(), apple_ys.tolist()), self.board_size)
+        return snapshot if self._header[0] == tick else None
+
+    def close(self) -> None:
+        del self._header, self._slots, self._lengths, self._cells, self._owners  # Views keep the buffer exported
+        self.shm.close()
+
+
+def _host(
+    entries: Sequence[dict[str, Any]],
+    names: Sequence[str],
+    board_size: int,
+    shm_name: str,
+    seed: Optional[str],
+    conn: Connection,
+) -> None:
+    """Worker process: decide for its AIs on every tick asked, until asked None."""
+    random.seed(seed)  # For the AIs using the global generator
+    ais = {entry["name"]: AILoader.load_ai(entry) for entry in entries}
+    board = SharedBoard(names, board_size, shm_name)
+    conn.send(None)  # Ready
+    while (request := conn.recv()) is not None:
+        tick, can_boost = request
+        decisions, errors = dict[str, Decision](), dict[str, str]()
+        snapshot = board.read(tick)
+        if snapshot is None:  # The board already moved on, too late to decide
+            conn.send((tick, decisions, errors))
+            continue
+        for name, boostable in can_boost.items():
+            start = time.perf_counter()
+            try:
+                game_state = GameState.from_snapshot(snapshot, name)
+                dir = ais[name].get_next_move(game_state)
+                boost = boostable and ais[name].should_boost(game_state)
+                decisions[name] = Decision(dir, boost, time.perf_counter() - start)
+            except Exception as error:
+                errors[name] = str(error)
+        conn.send((tick, decisions, errors))
+    board.close()
+
+
+class _Host(NamedTuple):
+    process: BaseProcess
+    conn: Connection
+    names: tuple[str, ...]
+
+
+class AIPool:
+    """AIs of `entries` (see `AI_CONFIG`) spread over `processes` worker processes, one per AI by default.
+
+    `start` publishes the board of a tick and asks the workers to decide, `collect` gathers the decisions. Without
+    deadlines, `collect` waits for every decision: matches stay reproducible, whatever the load of the host.
+    """
+
+    def __init__(
+        self,
+        entries: Sequence[dict[str, Any]],
+        board_size: int = BOARD_SIZE,
+        processes: Optional[int] = None,
+        deadlines: bool = True,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.names = [entry["name"] for entry in entries]
+        self.budgets = {entry["name"]: entry.get("budget_ms", DECISION_BUDGET_MS) / 1000 for entry in entries}
+        self.deadlines = deadlines
+        self.decisions = dict.fromkeys(self.names, 0)
+        self.misses = dict.fromkeys(self.names, 0)
+        self.errors = dict.fromkeys(self.names, 0)
+        self.board = SharedBoard(self.names, board_size)
+
+        processes = min(processes or len(entries), len(entries))
+        context = multiprocessing.get_context("spawn")  # Not forked from the threads of the server
+        self._hosts = list[_Host]()
+        for index in range(processes):
+            host_entries = entries[index::processes]
+            conn, child_conn = context.Pipe()
+            host_seed = None if seed is None else f"{seed}-{index}"
+            args = (host_entries, self.names, board_size, self.board.shm.name, host_seed, child_conn)
+            process = context.Process(target=_host, args=args, name=f"ai-host-{index}", daemon=True)
+            process.start()
+            self._hosts.append(_Host(process, conn, tuple(entry["name"] for entry in host_entries)))
+        for host in self._hosts:
+            host.conn.recv()  # Ready, the first tick is not missed loading the AIs
+        self._pending = set[Connection]()  # Workers busy deciding
+        self._asked = set[str]()  # AIs asked to decide on the current tick
+        self._tick = _WRITING
+
+    def start(self, engine: SlitherEngine, tick: int) -> None:
+        """Publish the board of `tick` and have the AIs of the snakes alive decide on it."""
+        self.board.publish(engine, tick)
+        self._tick = tick
+        self._asked.clear()
+        for host in self._hosts:
+            can_boost = {name: engine.can_boost(name) for name in host.names if name in engine.snakes}
+            if not can_boost:
+                continue
+            if host.conn in self._pending:  # Still deciding on an earlier tick
+                for name in can_boost:
+                    self.misses[name] += 1
+                continue
+            host.conn.send((tick, can_boost))
+            self._pending.add(host.conn)
+            self._asked.update(can_boost)
+
+    def collect(self) -> dict[str, Decision]:
+        """Decisions on the tick started, within budget with deadlines."""
+        budget = max((self.budgets[name] for name in self._asked), default=0.0)
+        deadline = time.perf_counter() + budget
+        decisions = dict[str, Decision]()
+        while self._pending:
+            timeout = max(0.0, deadline - time.perf_counter()) if self.deadlines else None
+            ready = cast(list[Connection], wait(list(self._pending), timeout))
+            if not ready:
+                break
+            for conn in ready:
+                self._pending.remove(conn)
+                tick, host_decisions, errors = conn.recv()
+                if tick != self._tick:
+                    continue  # Late, already counted as missed
+                for name, error in errors.items():
+                    logging.warning(f"Error with AI {name}: {error}")
+                    self.errors[name] += 1
+                    self._asked.remove(name)
+                for name, decision in host_decisions.items():
+                    self._asked.remove(name)
+                    if self.deadlines and decision.duration > self.budgets[name]:
+                        self.misses[name] += 1
+                    else:
+                        self.decisions[name] += 1
+                        decisions[name] = decision
+
+        for name in self._asked:  # Not answered in time
+            self.misses[name] += 1
+        self._asked.clear()
+        return decisions
+
+    def close(self) -> None:
+        for host in self._hosts:
+            try:
+                host.conn.send(None)
+            except OSError:
+                pass  # Already gone
+        for host in self._hosts:
+            host.process.join(timeout=1)
+            if host.process.is_alive():
+                host.process.kill()  # Stuck in a decision
+        self.board.close()
+        self.board.shm.unlink()
@@ -0,0 +1,223 @@
+"""Slither game rules, shared by the player and AI scripts.
+
+Cells are packed as `y * board_size + x`. Each snake is a fixed-capacity ring buffer of packed cells, and the board is
+a uint8 grid of what is on each cell (`EMPTY`, `APPLE` or a snake id), updated on every head pushed and tail popped:
+collision, apple and spawn checks are a single array read, however many and long the snakes are.
+"""
+
+import random
+from collections.abc import Callable, Collection, Iterator
+from typing import Optional
+
+import numpy as np
+
+from src.ai_players.base_ai import Dir, Snapshot
+
+BOARD_SIZE = 64
+INITIAL_SNAKE_LEN = 4
+SPAWN_SAFE_ZONE = 5
+APPLES_COUNT = 30
+DEAD_TO_APPLE_RATE = 0.5
+BOOST_TIME = 10
+BOOST_RATIO = 3
+
+EMPTY = 0
+APPLE = 255  # Snake ids go from 1 to 254
+
+_STEPS = {Dir.UP: (0, -1), Dir.DOWN: (0, 1), Dir.RIGHT: (1, 0), Dir.LEFT: (-1, 0)}
+
+
+class Snake:
+    """Ring buffer of packed cells, from head to tail."""
+
+    def __init__(self, id: int, capacity: int) -> None:
+        self.id = id
+        self._cells = np.zeros(capacity, dtype=np.uint16)
+        self._head_index = 0
+        self._length = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def head(self) -> int:
+        return int(self._cells[self._head_index])
+
+    @property
+    def tail(self) -> int:
+        return int(self._cells[(self._head_index + self._length - 1) % len(self._cells)])
+
+    def push_head(self, cell: int) -> None:
+        self._head_index = (self._head_index - 1) % len(self._cells)
+        self._cells[self._head_index] = cell
+        self._length += 1
+
+    def pop_tail(self) -> int:
+        tail = self.tail
+        self._length -= 1
+        return tail
+
+    def cells(self) -> np.ndarray:
+        """Packed cells, from head to tail."""
+        return self._cells[(self._head_index + np.arange(self._length)) % len(self._cells)]
+
+
+class SlitherEngine:
+    """Snakes, apples and boosts on a `board_size` square board.
+
+    `draw_cell(point, content)` is called for every cell that changed, with what is now on it: `EMPTY`, `APPLE` or a
+    snake id (see `names`).
+    """
+
+    def __init__(
+        self,
+        draw_cell: Callable[[tuple[int, int], int], None],
+        board_size: int = BOARD_SIZE,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self.draw_cell = draw_cell
+        self.board_size = board_size
+        self.rng = rng or random.Random()
+        self.owners = np.zeros((board_size, board_size), dtype=np.uint8)  # What is on each (y, x) cell
+        self._owners = self.owners.reshape(-1)  # By packed cell
+        self._digesting = np.zeros(board_size * board_size, dtype=bool)  # Eaten apples, the tail grows past them
+        self.snakes = dict[str, Snake]()
+        self.dirs = dict[str, Dir]()
+        self.boosts = dict[str, int]()  # Snake name -> boost frames left
+        self.scores = dict[str, int]()  # Apples digested
+        self.names = dict[int, str]()  # Snake id -> name
+        self.apples_count = 0
+
+    def point(self, cell: int) -> tuple[int, int]:
+        y, x = divmod(cell, self.board_size)
+        return (x, y)
+
+    def _set(self, cell: int, content: int) -> None:
+        previous = self._owners[cell]
+        if previous == APPLE:
+            self.apples_count -= 1
+        if content == APPLE:
+            self.apples_count += 1
+        self._owners[cell] = content
+        self.draw_cell(self.point(cell), content)
+
+    def spawn_snake(self, name: str) -> None:
+        """Spawn the snake heading right, at the end of a horizontal segment free of snakes."""
+        span = INITIAL_SNAKE_LEN + SPAWN_SAFE_ZONE
+        while True:
+            x = self.rng.randrange(0, self.board_size - 1 - span)
+            y = self.rng.randrange(0, self.board_size - 1)
+            segment = self.owners[y, x : x + span]
+            if not ((segment != EMPTY) & (segment != APPLE)).any():
+                break
+
+        id = next(id for id in range(1, APPLE) if id not in self.names)
+        snake = Snake(id, self.board_size * self.board_size)
+        self.names[id] = name
+        self.snakes[name] = snake
+        self.dirs[name] = Dir.RIGHT
+        self.scores.setdefault(name, 0)
+
+        start = y * self.board_size + x
+        for cell in range(start, start + span):
+            if self._owners[cell] == APPLE:
+                self._set(cell, EMPTY)
+        for cell in range(start + SPAWN_SAFE_ZONE, start + span):  # Tail to head
+            snake.push_head(cell)
+            self._set(cell, id)
+
+    def spawn_apples(self, count: int = APPLES_COUNT) -> None:
+        """Add apples on random empty cells, up to `count`."""
+        while self.apples_count < count:
+            cell = self.rng.randrange(self.board_size * self.board_size)
+            if self._owners[cell] == EMPTY:
+                self._set(cell, APPLE)
+
+    def can_boost(self, name: str) -> bool:
+        snake = self.snakes.get(name)
+        return snake is not None and name not in self.boosts and len(snake) > BOOST_TIME + INITIAL_SNAKE_LEN
+
+    def boost(self, name: str) -> None:
+        if self.can_boost(name):
+            self.boosts[name] = BOOST_TIME
+
+    def pop_tails(self, names: Collection[str]) -> None:
+        for name in names:
+            snake = self.snakes.get(name)
+            if not snake:
+                continue
+
+            tail = snake.tail
+            if self._digesting[tail]:  # Grow
+                self._digesting[tail] = False
+                self.scores[name] += 1
+            else:
+                snake.pop_tail()
+                self._set(tail, EMPTY)
+
+    def compute_heads(self, names: Collection[str]) -> None:
+        dead_snakes = list[str]()
+
+        for name in names:
+            snake = self.snakes.get(name)
+            if not snake:
+                continue
+
+            head_y, head_x = divmod(snake.head, self.board_size)
+            step_x, step_y = _STEPS[self.dirs[name]]
+            x, y = head_x + step_x, head_y + step_y
+            if not (0 <= x < self.board_size and 0 <= y < self.board_size):
+                dead_snakes.append(name)
+                continue
+
+            new_head = y * self.board_size + x
+            content = self._owners[new_head]
+            if content == APPLE:
+                self._digesting[new_head] = True
+            elif content != EMPTY:
+                dead_snakes.append(name)
+                continue
+
+            snake.push_head(new_head)
+            self._set(new_head, snake.id)
+
+        for name in dead_snakes:
+            self.kill(name)
+
+    def kill(self, name: str) -> None:
+        """Remove the snake, leaving apples on some of its cells."""
+        snake = self.snakes.pop(name)
+        for cell in snake.cells().tolist():
+            self._digesting[cell] = False
+            self._set(cell, APPLE if self.rng.random() < DEAD_TO_APPLE_RATE else EMPTY)
+        del self.names[snake.id]
+        del self.dirs[name]
+        self.boosts.pop(name, None)
+
+    def step(self) -> None:
+        """One frame: every snake moves, boosted ones move `BOOST_RATIO` times, and eaten apples are replaced."""
+        self.pop_tails(list(self.snakes))
+        self.compute_heads(list(self.snakes))
+
+        # Boost: pop 1 for tail than heads 1 time on 2
+        if self.boosts:
+            for _ in range(BOOST_RATIO - 1):
+                self.pop_tails(list(self.boosts))
+                self.compute_heads(list(self.boosts))
+            self.pop_tails([name for name, boost in self.boosts.items() if boost % 2])
+            self.boosts = {name: boost - 1 for name, boost in self.boosts.items() if boost > 1}
+
+        self.spawn_apples()
+
+    def snapshot(self) -> Snapshot:
+        """Read-only state of the game for the AIs."""
+        apple_ys, apple_xs = np.divmod(np.flatnonzero(self._owners == APPLE), self.board_size)
+        return Snapshot.build(
+            {name: tuple(self._points(snake.cells())) for name, snake in self.snakes.items()},
+            zip(apple_xs.tolist(), apple_ys.tolist()),
+            self.board_size,
+        )
+
+    def _points(self, cells: np.ndarray) -> Iterator[tuple[int, int]]:
+        ys, xs = np.divmod(cells, self.board_size)
+        return zip(xs.tolist(), ys.tolist())
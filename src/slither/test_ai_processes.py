@@ -0,0 +1,58 @@
+import random
+
+from src.ai_players.base_ai import GameState
+from src.ai_players.loader import AILoader
+from src.slither.ai_processes import AIPool, SharedBoard
+from src.slither.engine import SlitherEngine
+
+ENTRIES = [
+    {"name": "A", "module": "src.ai_players.greedy_ai", "class": "GreedyAI"},
+    {"name": "B", "module": "src.ai_players.defensive_ai", "class": "DefensiveAI"},
+]
+
+
+def _new_engine() -> SlitherEngine:
+    engine = SlitherEngine(lambda point, content: None, rng=random.Random(3))
+    for entry in ENTRIES:
+        engine.spawn_snake(entry["name"])
+    engine.spawn_apples()
+    return engine
+
+
+# The board in shared memory gives the snapshot of the engine
+engine = _new_engine()
+board = SharedBoard([entry["name"] for entry in ENTRIES])
+for tick in range(20):
+    board.publish(engine, tick)
+    snapshot, expected = board.read(tick), engine.snapshot()
+    assert snapshot is not None and list(snapshot.snakes.items()) == list(expected.snakes.items())
+    assert snapshot.apples == expected.apples and (snapshot.obstacles == expected.obstacles).all()
+    engine.step()
+assert board.read(0) is None  # Moved on
+board.close()
+board.shm.unlink()
+
+# AIs in processes play the same game as in the game process
+engine, pool_engine = _new_engine(), _new_engine()
+ais = {entry["name"]: AILoader.load_ai(entry) for entry in ENTRIES}
+pool = AIPool(ENTRIES, processes=1, deadlines=False)
+for tick in range(30):
+    snapshot = engine.snapshot()
+    for name in snapshot.snakes:
+        engine.dirs[name] = ais[name].get_next_move(GameState.from_snapshot(snapshot, name))
+    pool.start(pool_engine, tick)
+    for name, decision in pool.collect().items():
+        pool_engine.dirs[name] = decision.dir
+    engine.step()
+    pool_engine.step()
+    assert (engine.owners == pool_engine.owners).all()
+assert sum(pool.decisions.values()) > 0 and not any(pool.misses.values())
+pool.close()
+
+# Decisions over budget are dropped
+pool = AIPool([{**entry, "budget_ms": 0} for entry in ENTRIES])
+for tick in range(3):
+    pool.start(pool_engine, tick)
+    assert pool.collect() == {}
+assert pool.misses == {"A": 3, "B": 3} and not any(pool.decisions.values())
+pool.close()
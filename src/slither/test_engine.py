@@ -0,0 +1,87 @@
+import random
+from collections import deque
+
+import numpy as np
+
+from src.ai_players.base_ai import Dir, GameState
+from src.slither.engine import APPLE, APPLES_COUNT, EMPTY, INITIAL_SNAKE_LEN, SlitherEngine, Snake
+
+
+def _check_grid(engine: SlitherEngine) -> None:
+    expected = np.zeros_like(engine.owners)
+    for snake in engine.snakes.values():
+        ys, xs = np.divmod(snake.cells(), engine.board_size)
+        expected[ys, xs] = snake.id
+    is_apple = (engine.owners == APPLE) & (expected == EMPTY)
+    assert (is_apple | (engine.owners == expected)).all(), "Owner grid out of sync with the snakes"
+    assert engine.apples_count == (engine.owners == APPLE).sum()
+
+
+# Ring buffer wraps around
+snake = Snake(1, capacity=4)
+for cell in range(10):
+    snake.push_head(cell)
+    if len(snake) > 3:
+        assert snake.pop_tail() == cell - 3
+assert snake.cells().tolist() == [9, 8, 7] and snake.head == 9 and snake.tail == 7
+
+# Drawn cells mirror the grid
+drawn = np.zeros((64, 64), dtype=np.uint8)
+
+
+def _draw_cell(point: tuple[int, int], content: int) -> None:
+    drawn[point[1], point[0]] = content
+
+
+engine = SlitherEngine(_draw_cell, rng=random.Random(0))
+for name in ("A", "B", "C"):
+    engine.spawn_snake(name)
+engine.spawn_apples()
+assert engine.apples_count == APPLES_COUNT
+assert all(len(snake) == INITIAL_SNAKE_LEN for snake in engine.snakes.values())
+
+# Random games keep the grid in sync
+rng = random.Random(0)
+for frame in range(2000):
+    for name in engine.snakes:
+        if rng.random() < 0.1:
+            engine.dirs[name] = rng.choice(list(Dir))
+        if rng.random() < 0.05:
+            engine.boost(name)
+    engine.step()
+    for name in ("A", "B", "C"):
+        if name not in engine.snakes:
+            engine.spawn_snake(name)
+    if frame % 50 == 0:
+        _check_grid(engine)
+assert (drawn == engine.owners).all()
+
+# Hitting a wall or a snake kills
+engine = SlitherEngine(lambda point, content: None, rng=random.Random(1))
+engine.spawn_snake("A")
+engine.dirs["A"] = Dir.LEFT  # Into its own body
+engine.step()
+assert "A" not in engine.snakes and not (engine.owners == 1).any()
+assert set(np.unique(engine.owners)) <= {EMPTY, APPLE}
+
+# Snapshots match the engine, and the GameState built from snakes and apples
+engine = SlitherEngine(lambda point, content: None, rng=random.Random(2))
+for name in ("A", "B"):
+    engine.spawn_snake(name)
+engine.spawn_apples()
+snapshot = engine.snapshot()
+assert snapshot.names == ("A", "B") and snapshot.lengths.tolist() == [INITIAL_SNAKE_LEN] * 2
+heads = [engine.point(snake.head) for snake in engine.snakes.values()]
+assert [tuple(head) for head in snapshot.heads.tolist()] == heads
+assert (snapshot.obstacles == ((engine.owners != EMPTY) & (engine.owners != APPLE))).all()
+assert len(snapshot.apple_array) == APPLES_COUNT and set(map(tuple, snapshot.apple_array.tolist())) == snapshot.apples
+
+game_state = GameState.from_snapshot(snapshot, "A")
+legacy_snakes = {name: deque(points) for name, points in snapshot.snakes.items()}
+legacy_state = GameState(legacy_snakes, set(snapshot.apples), 64, "A")
+for state in (game_state, legacy_state):
+    assert state.get_my_head() == snapshot.snakes["A"][0]
+    assert state.get_all_snake_positions() == snapshot.snake_positions
+    assert not state.is_position_safe(snapshot.snakes["B"][-1]) and not state.is_position_safe((64, 0))
+    assert state.is_position_safe(next(iter(snapshot.apples)))
+assert (legacy_state.snapshot.obstacles == snapshot.obstacles).all()
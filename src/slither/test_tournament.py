@@ -0,0 +1,21 @@
+from src.display_slither_ai import AI_CONFIG
+from src.slither.tournament import INITIAL_ELO, SnakeResult, play_match, update_elo
+
+
+def _outcome(results: list[SnakeResult]) -> list[tuple[str, bool, int, int]]:
+    return [(result.ai, result.alive, result.frames, result.apples) for result in results]
+
+
+# Seeded matches are reproducible
+results = play_match(AI_CONFIG, seed=1, max_frames=200)
+assert _outcome(results) == _outcome(play_match(AI_CONFIG, seed=1, max_frames=200))
+assert len(results) == len(AI_CONFIG) and all(result.decisions == result.frames for result in results)
+assert all(result.alive == (result.frames == max(result.frames for result in results)) for result in results)
+
+# Elo goes from the loser to the winner, and the same AI does not play itself
+ratings = dict[str, float]()
+winner = SnakeResult("Winner", True, 100, 5, 100, 0.0, 0.0, 0)
+loser = SnakeResult("Loser", False, 50, 5, 50, 0.0, 0.0, 0)
+update_elo(ratings, [winner, loser, loser])
+assert ratings["Winner"] > INITIAL_ELO > ratings["Loser"]
+assert abs(sum(ratings.values()) - 2 * INITIAL_ELO) < 1e-9
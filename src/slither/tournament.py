@@ -0,0 +1,230 @@
+# Run seeded slither matches between AIs headless and report their results and Elo ratings as JSON:
+# python -m src.slither.tournament --matches 200 --ratings ratings.json
+
+import argparse
+import json
+import random
+import sys
+import time
+from collections import defaultdict
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, NamedTuple, Optional
+
+from src.ai_players.base_ai import BaseAI, GameState
+from src.ai_players.loader import AILoader
+from src.display_slither_ai import AI_CONFIG
+from src.slither.ai_processes import AIPool, Decision
+from src.slither.engine import SlitherEngine
+
+MAX_FRAMES = 3000  # 200 seconds at 15 FPS
+INITIAL_ELO = 1500.0
+ELO_K = 32.0
+
+
+class SnakeResult(NamedTuple):
+    ai: str  # "module.Class"
+    alive: bool  # At the end of the match
+    frames: int  # Survived
+    apples: int
+    decisions: int
+    decision_time: float  # Seconds, get_next_move and should_boost
+    max_decision_time: float
+    errors: int
+
+
+def ai_key(entry: dict[str, Any]) -> str:
+    return f"{entry['module']}.{entry['class']}"
+
+
+def _decide(ais: dict[str, BaseAI], engine: SlitherEngine, errors: dict[str, int]) -> dict[str, Decision]:
+    """Decisions of the AIs of the snakes alive, one after the other."""
+    snapshot = engine.snapshot()
+    decisions = dict[str, Decision]()
+    for name in snapshot.snakes:
+        game_state = GameState.from_snapshot(snapshot, name)
+        start = time.perf_counter()
+        try:
+            dir = ais[name].get_next_move(game_state)
+            boost = engine.can_boost(name) and ais[name].should_boost(game_state)
+            decisions[name] = Decision(dir, boost, time.perf_counter() - start)
+        except Exception:
+            errors[name] += 1  # Keep the current direction, as on the panel
+    return decisions
+
+
+def play_match(
+    entries: Sequence[dict[str, Any]], seed: int, max_frames: int = MAX_FRAMES, ai_processes: int = 0
+) -> list[SnakeResult]:
+    """Play a match without respawns, until one snake is left or `max_frames`. Same entries and seed, same match.
+
+    With `ai_processes`, the AIs think in parallel in that many processes, each with its own seed.
+    """
+    random.seed(seed)  # For the AIs using the global generator
+    engine = SlitherEngine(lambda point, content: None, rng=random.Random(seed))
+    names = [entry["name"] for entry in entries]
+    for name in names:
+        engine.spawn_snake(name)
+    engine.spawn_apples()
+    if ai_processes:
+        pool = AIPool(entries, engine.board_size, ai_processes, deadlines=False, seed=seed)
+        errors = pool.errors
+    else:
+        ais = {entry["name"]: AILoader.load_ai(entry) for entry in entries}
+        errors = dict.fromkeys(names, 0)
+
+    frames = dict.fromkeys(names, 0)
+    decisions = dict.fromkeys(names, 0)
+    decision_times = dict.fromkeys(names, 0.0)
+    max_decision_times = dict.fromkeys(names, 0.0)
+
+    played = 0
+    try:
+        while played < max_frames and len(engine.snakes) > min(1, len(names) - 1):
+            alive = list(engine.snakes)
+            if ai_processes:
+                pool.start(engine, played)
+                tick_decisions = pool.collect()
+            else:
+                tick_decisions = _decide(ais, engine, errors)
+            for name, decision in tick_decisions.items():
+                engine.dirs[name] = decision.dir
+                if decision.boost:
+                    engine.boost(name)
+                decisions[name] += 1
+                decision_times[name] += decision.duration
+                max_decision_times[name] = max(max_decision_times[name], decision.duration)
+
+            engine.step()
+            played += 1
+            for name in alive:
+                frames[name] = played
+    finally:
+        if ai_processes:
+            pool.close()
+
+    return [
+        SnakeResult(
+            ai_key(entry),
+            entry["name"] in engine.snakes,
+            frames[entry["name"]],
+            engine.scores[entry["name"]],
+            decisions[entry["name"]],
+            decision_times[entry["name"]],
+            max_decision_times[entry["name"]],
+            errors[entry["name"]],
+        )
+        for entry in entries
+    ]
+
+
+def _rank(result: SnakeResult) -> tuple[bool, int, int]:
+    return (result.alive, result.frames, result.apples)
+
+
+def update_elo(ratings: dict[str, float], results: list[SnakeResult]) -> None:
+    """Multiplayer Elo: every pair of different AIs is a game won by the one surviving longer (then eating more)."""
+    deltas = defaultdict[str, float](float)
+    k = ELO_K / max(1, len(results) - 1)
+    for result in results:
+        for other in results:
+            if other.ai == result.ai:
+                continue
+            rating = ratings.setdefault(result.ai, INITIAL_ELO)
+            other_rating = ratings.setdefault(other.ai, INITIAL_ELO)
+            expected = 1 / (1 + 10 ** ((other_rating - rating) / 400))
+            outcome = 0.5 if _rank(result) == _rank(other) else float(_rank(result) > _rank(other))
+            deltas[result.ai] += k * (outcome - expected)
+    for ai, delta in deltas.items():
+        ratings[ai] += delta
+
+
+def summarize(matches: list[list[SnakeResult]], ratings: dict[str, float]) -> dict[str, dict[str, Any]]:
+    by_ai = defaultdict[str, list[SnakeResult]](list)
+    wins = defaultdict[str, int](int)
+    for results in matches:
+        for result in results:
+            by_ai[result.ai].append(result)
+        best = max(map(_rank, results))
+        winners = [result for result in results if _rank(result) == best]
+        if len(winners) == 1:
+            wins[winners[0].ai] += 1
+
+    report = dict[str, dict[str, Any]]()
+    for ai, results in sorted(by_ai.items(), key=lambda item: -ratings.get(item[0], INITIAL_ELO)):
+        decisions = sum(result.decisions for result in results)
+        report[ai] = {
+            "elo": round(ratings.get(ai, INITIAL_ELO), 1),
+            "snakes": len(results),
+            "wins": wins[ai],
+            "win_rate": wins[ai] / len(results),
+            "survival_rate": sum(result.alive for result in results) / len(results),
+            "mean_survival_frames": sum(result.frames for result in results) / len(results),
+            "mean_apples": sum(result.apples for result in results) / len(results),
+            "decision_ms_mean": 1000 * sum(result.decision_time for result in results) / max(1, decisions),
+            "decision_ms_max": 1000 * max(result.max_decision_time for result in results),
+            "errors": sum(result.errors for result in results),
+        }
+    return report
+
+
+def run(
+    entries: Sequence[dict[str, Any]],
+    matches: int,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    max_frames: int = MAX_FRAMES,
+    ratings: Optional[dict[str, float]] = None,
+    ai_processes: int = 0,
+) -> dict[str, Any]:
+    """Play `matches` matches (seeds `seed`, `seed + 1`...) across a process pool. `ratings` are updated in place."""
+    ratings = {} if ratings is None else ratings
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(
+            pool.map(
+                play_match,
+                [entries] * matches,
+                range(seed, seed + matches),
+                [max_frames] * matches,
+                [ai_processes] * matches,
+                chunksize=4,
+            )
+        )
+    wall_time = time.perf_counter() - start
+
+    for match_results in results:  # In seed order, whatever the order the matches ended in
+        update_elo(ratings, match_results)
+    frames = sum(max(result.frames for result in match_results) for match_results in results)
+    return {
+        "matches": matches,
+        "seed": seed,
+        "max_frames": max_frames,
+        "wall_time_s": wall_time,
+        "frames_per_s": frames / wall_time,
+        "ais": summarize(results, ratings),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless slither tournament between AIs")
+    parser.add_argument("--matches", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first match, the next ones count up")
+    parser.add_argument("--workers", type=int, default=None, help="Processes (default: one per CPU)")
+    parser.add_argument("--max-frames", type=int, default=MAX_FRAMES)
+    parser.add_argument(
+        "--ai-processes", type=int, default=0, help="Processes the AIs of each match think in (default: in the match's)"
+    )
+    parser.add_argument("--config", type=Path, default=None, help="JSON list of AI_CONFIG-like entries")
+    parser.add_argument("--ratings", type=Path, default=None, help="JSON file the Elo ratings are kept in across runs")
+    parser.add_argument("--output", type=argparse.FileType("w"), default=sys.stdout)
+    args = parser.parse_args()
+
+    entries = json.loads(args.config.read_text()) if args.config else AI_CONFIG
+    ratings = json.loads(args.ratings.read_text()) if args.ratings and args.ratings.exists() else {}
+    report = run(entries, args.matches, args.seed, args.workers, args.max_frames, ratings, args.ai_processes)
+    if args.ratings:
+        args.ratings.write_text(json.dumps(ratings, indent=2) + "\n")
+    json.dump(report, args.output, indent=2)
+    args.output.write("\n")